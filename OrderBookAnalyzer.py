@@ -1,15 +1,216 @@
-from collections import defaultdict
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 from datetime import datetime
+from functools import wraps
 import numpy as np
-from models import OrderBook, Order
+from models import OrderBook, OrderBookArrays, Order
+from classes.OrderBookStore import OrderBookStore
+from classes.ManipulationDetector import FAKE_WINDOW, SPOOF_WINDOW, ManipulationDetector
+from classes.VolumeProfile import StreamingVolumeProfile
+from classes.TopLevels import DEEP_BOOK_LEVELS, TopLevelTracker, strength_scores, top_k
+from classes.OrderFlowEngine import OrderFlowEngine, CancellationMonitor
+from classes.ScoringPipeline import DEFAULT_PIPELINE, ScoringPipeline
+from metrics import METRICS
+
+
+_CONTAINERS = (dict, list)
+
+
+def _copied(value):
+    """Salinan dict/list bertingkat (isi lain immutable), jauh lebih murah dari deepcopy"""
+    if type(value) is dict:
+        return {k: _copied(v) if type(v) in _CONTAINERS else v for k, v in value.items()}
+    if type(value) is list:
+        return [_copied(v) if type(v) in _CONTAINERS else v for v in value]
+    return value
+
+
+def _per_snapshot(method):
+    """
+    Cache hasil method untuk snapshot terakhir, di-reset saat history bertambah.
+    copy_results=True (default API publik): pemanggil dari luar menerima salinan,
+    jadi mengubah hasil tidak merusak cache. copy_results=False dipakai konsumen
+    internal (StockMonitor, worker ShardedAnalyzer) yang hanya membaca hasil: objek
+    cache dikembalikan langsung tanpa biaya salinan dan wajib diperlakukan read-only.
+    Panggilan bertingkat di dalam analyzer selalu memakai objek cache langsung.
+    """
+    stage = f"OrderBookAnalyzer.{method.__name__}"
+    
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Hanya cache perhitungan atas history, bukan OrderBook dari luar
+        if any(isinstance(a, OrderBook) for a in args) or isinstance(kwargs.get("ob"), OrderBook):
+            return method(self, *args, **kwargs)
+        
+        token = (id(self.history), self.history.seq, self.lot_size, self.min_order_value, id(self.scoring))
+        if token != self._cache_token:
+            self._cache.clear()
+            self._cache_token = token
+        
+        key = (method.__name__, args, tuple(sorted(kwargs.items())) if kwargs else ())
+        if key in self._cache:
+            self.cache_hits += 1
+            if METRICS.enabled:
+                METRICS.incr("orderbook_cache_hits")
+            result = self._cache[key]
+        else:
+            self.cache_misses += 1
+            self._cache_depth += 1
+            try:
+                if METRICS.enabled:
+                    METRICS.incr("orderbook_cache_misses")
+                    with METRICS.timer(stage):
+                        result = self._cache[key] = method(self, *args, **kwargs)
+                else:
+                    result = self._cache[key] = method(self, *args, **kwargs)
+            finally:
+                self._cache_depth -= 1
+        return _copied(result) if self.copy_results and self._cache_depth == 0 else result
+    return wrapper
 
 
 class OrderBookAnalyzer:
-    def __init__(self, history: List[OrderBook]):
-        self.history = history
+    def __init__(self, history: Union[List[OrderBook], OrderBookStore, np.ndarray],
+                 capacity: Optional[int] = None, depth: Optional[int] = None,
+                 scoring: Optional[ScoringPipeline] = None, copy_results: bool = True):
+        if isinstance(history, OrderBookStore):
+            self.history = history
+        elif isinstance(history, np.ndarray) and history.dtype.names:
+            # Record hasil SnapshotArchive.query / OrderBookStore.to_records, tanpa copy
+            self.history = OrderBookStore.from_records(history)
+        else:
+            self.history = OrderBookStore.from_list(history, capacity=capacity, depth=depth)
         self.lot_size = 1
         self.min_order_value = 50000000  # Minimal 50 juta rupiah untuk order signifikan
+        self.scoring = scoring or DEFAULT_PIPELINE
+        self.detector: Optional[ManipulationDetector] = None
+        self._detector_seq = 0
+        self.profile = StreamingVolumeProfile(window=20)
+        self._profile_seq = 0
+        self.top_levels = {"bid": TopLevelTracker("bid"), "ask": TopLevelTracker("ask")}
+        self._top_levels_seq = {"bid": 0, "ask": 0}
+        # Dibuat saat ada subscriber pertama
+        self.order_flow: Optional[OrderFlowEngine] = None
+        self._flow_seq = 0
+        self.cancellation: Optional[CancellationMonitor] = None
+        
+        self._cache: Dict = {}
+        self._cache_token = None
+        self._cache_depth = 0  # > 0 saat di dalam method ber-cache (hasil tidak perlu disalin)
+        # False: hasil cache dikembalikan langsung (lebih cepat), pemanggil wajib read-only;
+        # dipakai StockMonitor dan ShardedAnalyzer yang tidak pernah mengubah hasil
+        self.copy_results = copy_results
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def append(self, ob: Union[OrderBook, OrderBookArrays], timestamp: Optional[float] = None):
+        """Tambah snapshot baru ke history"""
+        self.history.append(ob, timestamp)
+        METRICS.incr("snapshots")
+        self._sync_detector()
+        self._sync_profile()
+        self._sync_order_flow()
+    
+    def cache_info(self) -> Dict:
+        """Statistik cache metrik per snapshot"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / total if total > 0 else 0.0,
+            "size": len(self._cache)
+        }
+    
+    def _lookback(self, lookback_period: int) -> int:
+        """Lookback dibatasi capacity store: snapshot yang sudah tertimpa tidak bisa dihitung"""
+        return min(lookback_period, max(self.history.capacity, 1))
+    
+    def _sync_detector(self) -> ManipulationDetector:
+        """Pastikan detector incremental sudah memproses semua snapshot di store"""
+        detector = self.detector
+        fake_window, spoof_window = self._lookback(FAKE_WINDOW), self._lookback(SPOOF_WINDOW)
+        if (detector is None or detector.lot_size != self.lot_size
+                or detector.min_order_value != self.min_order_value
+                or (detector.fake_window, detector.spoof_window) != (fake_window, spoof_window)
+                or self._detector_seq > self.history.seq):
+            detector = self.detector = ManipulationDetector(
+                fake_window=fake_window, spoof_window=spoof_window,
+                min_order_value=self.min_order_value, lot_size=self.lot_size)
+            self._detector_seq = 0
+        elif self._detector_seq == self.history.seq:
+            return detector
+        
+        # Cukup proses snapshot yang masih masuk window detector
+        missing = min(self.history.seq - self._detector_seq, len(self.history),
+                      max(detector.fake_window, detector.spoof_window))
+        for slot in self.history.slots(missing):
+            detector.append_levels(*self.history.side(int(slot), "bid"))
+        self._detector_seq = self.history.seq
+        return detector
+    
+    def _sync_profile(self) -> StreamingVolumeProfile:
+        """Masukkan snapshot yang belum diproses ke volume profile streaming"""
+        history = self.history
+        if self._profile_seq > history.seq:
+            self.profile = StreamingVolumeProfile(window=self.profile.window, max_age=self.profile.max_age)
+            self._profile_seq = 0
+        
+        missing = min(history.seq - self._profile_seq, len(history))
+        if missing == 1:
+            slot = history.latest_slot()
+            self.profile.push(history.timestamp[slot], history.volume[slot], history.last_price[slot],
+                              int(history.bid_lot_total[slot]), int(history.ask_lot_total[slot]))
+        elif missing > 1:
+            slots = history.slots(missing)
+            self.profile.extend(history.timestamp[slots], history.volume[slots], history.last_price[slots],
+                                history.bid_lot_total[slots], history.ask_lot_total[slots])
+        self._profile_seq = history.seq
+        return self.profile
+    
+    def _sync_order_flow(self) -> Optional[OrderFlowEngine]:
+        """Diff snapshot yang belum diproses menjadi event order flow (jika ada subscriber)"""
+        engine = self.order_flow
+        if engine is None:
+            return None
+        history = self.history
+        if self._flow_seq > history.seq:
+            # Store diganti: snapshot terakhir jadi baseline baru
+            self._flow_seq = 0
+            if len(history):
+                slot = history.latest_slot()
+                engine.reset(history.side(slot, "bid"), history.side(slot, "ask"), history.last_price[slot])
+                self._flow_seq = history.seq
+        
+        missing = min(history.seq - self._flow_seq, len(history))
+        for slot in history.slots(missing).tolist():
+            engine.push_levels(history.side(slot, "bid"), history.side(slot, "ask"),
+                               float(history.timestamp[slot]), int(history.last_price[slot]))
+        self._flow_seq = history.seq
+        return engine
+    
+    def subscribe_order_flow(self, callback, side: Optional[int] = None,
+                             kinds: Optional[Tuple[int, ...]] = None) -> OrderFlowEngine:
+        """
+        Daftarkan callback(events) untuk event level per tick (lihat OrderFlowEngine).
+        Snapshot terakhir saat engine dibuat menjadi baseline.
+        """
+        if self.order_flow is None:
+            self.order_flow = OrderFlowEngine()
+            self._flow_seq = self.history.seq
+            if len(self.history):
+                slot = self.history.latest_slot()
+                self.order_flow.reset(self.history.side(slot, "bid"), self.history.side(slot, "ask"),
+                                      self.history.last_price[slot])
+        if callback is not None:
+            self.order_flow.subscribe(callback, side=side, kinds=kinds)
+        return self.order_flow
+    
+    def cancellations(self) -> Dict:
+        """Lot bid/ask yang di-cancel sejak monitor dibuat (window 15 tick)"""
+        if self.cancellation is None:
+            engine = self.subscribe_order_flow(None)
+            self.cancellation = CancellationMonitor(engine, min_order_value=self.min_order_value,
+                                                    lot_size=self.lot_size)
+        return self.cancellation.summary()
         
     def total_lot(self, orders: List[Order]) -> int:
         """Total lot dari list order"""
@@ -19,33 +220,57 @@ class OrderBookAnalyzer:
         """Total nilai rupiah dari list order"""
         return sum(o.lot * self.lot_size * o.price for o in orders)
     
-    def bid_strength(self, ob: OrderBook) -> float:
+    def _totals(self, ob: Optional[OrderBook] = None) -> Tuple[int, int, float, float]:
+        """(bid_lot, ask_lot, bid_value, ask_value) untuk ob, atau snapshot terakhir di store"""
+        if ob is not None:
+            return (self.total_lot(ob.bid), self.total_lot(ob.ask),
+                    self.total_value(ob.bid), self.total_value(ob.ask))
+        
+        slot = self.history.latest_slot()
+        return (int(self.history.bid_lot_total[slot]),
+                int(self.history.ask_lot_total[slot]),
+                int(self.history.bid_value_total[slot]) * self.lot_size,
+                int(self.history.ask_value_total[slot]) * self.lot_size)
+    
+    def _best_prices(self, ob: Optional[OrderBook] = None) -> Tuple[Optional[int], Optional[int]]:
+        """(best_bid, best_ask), None jika side kosong"""
+        if ob is not None:
+            return (ob.bid[0].price if ob.bid else None,
+                    ob.ask[0].price if ob.ask else None)
+        
+        slot = self.history.latest_slot()
+        best_bid = int(self.history.bid_price[slot, 0]) if self.history.bid_count[slot] else None
+        best_ask = int(self.history.ask_price[slot, 0]) if self.history.ask_count[slot] else None
+        return best_bid, best_ask
+    
+    def bid_strength(self, ob: Optional[OrderBook] = None) -> float:
         """Strength berdasarkan jumlah lot"""
-        bid = self.total_lot(ob.bid)
-        ask = self.total_lot(ob.ask)
+        bid, ask, _, _ = self._totals(ob)
         return bid / (bid + ask) if bid + ask > 0 else 0.0
     
-    def bid_ask_ratio(self, ob: OrderBook) -> float:
+    def bid_ask_ratio(self, ob: Optional[OrderBook] = None) -> float:
         """Ratio berdasarkan lot"""
-        ask = self.total_lot(ob.ask)
-        return self.total_lot(ob.bid) / ask if ask > 0 else float("inf")
+        bid, ask, _, _ = self._totals(ob)
+        return bid / ask if ask > 0 else float("inf")
     
-    def bid_value_ratio(self, ob: OrderBook) -> float:
+    def bid_value_ratio(self, ob: Optional[OrderBook] = None) -> float:
         """Ratio berdasarkan nilai rupiah"""
-        ask_value = self.total_value(ob.ask)
-        return self.total_value(ob.bid) / ask_value if ask_value > 0 else float("inf")
+        _, _, bid_value, ask_value = self._totals(ob)
+        return bid_value / ask_value if ask_value > 0 else float("inf")
     
-    def spread(self, ob: OrderBook) -> int:
+    def spread(self, ob: Optional[OrderBook] = None) -> int:
         """Spread dalam rupiah"""
-        if not ob.ask or not ob.bid:
+        best_bid, best_ask = self._best_prices(ob)
+        if best_ask is None or best_bid is None:
             return 0
-        return ob.ask[0].price - ob.bid[0].price
+        return best_ask - best_bid
     
-    def spread_percentage(self, ob: OrderBook) -> float:
+    def spread_percentage(self, ob: Optional[OrderBook] = None) -> float:
         """Spread dalam persentase"""
-        if not ob.ask or not ob.bid or ob.bid[0].price == 0:
+        best_bid, best_ask = self._best_prices(ob)
+        if best_ask is None or best_bid is None or best_bid == 0:
             return 0.0
-        return (self.spread(ob) / ob.bid[0].price) * 100
+        return ((best_ask - best_bid) / best_bid) * 100
     
     def strength_score(self, order: Order) -> int:
         """Skor strength dengan bobot yang disesuaikan"""
@@ -56,31 +281,37 @@ class OrderBookAnalyzer:
         order_value = order.lot * self.lot_size * order.price
         return order_value >= self.min_order_value
     
+    def _window_bids(self, lookback_period: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Array bid (price, lot, freq, valid) untuk n snapshot terakhir"""
+        slots = self.history.slots(lookback_period)
+        valid = np.arange(self.history.depth) < self.history.bid_count[slots][:, None]
+        return (self.history.bid_price[slots], self.history.bid_lot[slots],
+                self.history.bid_freq[slots], valid)
+    
+    @_per_snapshot
     def detect_fake_bid(self, lookback_period: int = 10) -> Dict:
         """
         Deteksi fake bid dengan kriteria:
         1. Order besar muncul tapi tidak sustain
         2. Sering dihapus atau dimodifikasi
         """
+        detector = self._sync_detector()
+        if self._lookback(lookback_period) == detector.fake_window:
+            return detector.fake_bid()
+        
         if len(self.history) < lookback_period:
             lookback_period = len(self.history)
         
-        fake_candidates = []
-        recent_history = self.history[-lookback_period:]
+        prices, lots, freqs, valid = self._window_bids(lookback_period)
         
-        # Track order persistence
-        order_persistence = defaultdict(list)
+        # Minimal 500 lot dengan freq rendah
+        candidates = prices[valid & (lots >= 500) & (freqs <= 2)]
         
-        for i, ob in enumerate(recent_history):
-            for bid in ob.bid:
-                if bid.lot >= 500 and bid.freq <= 2:  # Minimal 500 lot dengan freq rendah
-                    order_persistence[bid.price].append(i)
-        
-        # Analyze persistence
-        fake_prices = []
-        for price, appearances in order_persistence.items():
-            if len(appearances) <= 2:  # Muncul <= 2 kali dari lookback period
-                fake_prices.append(price)
+        # Muncul <= 2 kali dari lookback period, urut sesuai kemunculan pertama
+        unique, first_index, counts = np.unique(candidates, return_index=True, return_counts=True)
+        fake = counts <= 2
+        order = np.argsort(first_index[fake], kind="stable")
+        fake_prices = [int(p) for p in unique[fake][order]]
         
         return {
             "detected": len(fake_prices) > 0,
@@ -88,6 +319,7 @@ class OrderBookAnalyzer:
             "count": len(fake_prices)
         }
     
+    @_per_snapshot
     def detect_spoofing(self, lookback_period: int = 15) -> Dict:
         """
         Deteksi spoofing dengan pattern:
@@ -95,35 +327,39 @@ class OrderBookAnalyzer:
         2. Kemudian di-cancel atau dihapus
         3. Pattern berulang di level yang berbeda
         """
+        detector = self._sync_detector()
+        if self._lookback(lookback_period) == detector.spoof_window:
+            return detector.spoofing()
+        
         if len(self.history) < lookback_period:
             lookback_period = len(self.history)
         
-        recent_history = self.history[-lookback_period:]
+        prices, lots, _, valid = self._window_bids(lookback_period)
         spoofing_patterns = []
         
         # Track large orders and their behavior
-        large_orders_timeline = defaultdict(list)
+        large = valid & (lots >= 1000) & (lots * self.lot_size * prices >= self.min_order_value)
+        rows, cols = np.nonzero(large)
+        large_prices = prices[rows, cols]
         
-        for idx, ob in enumerate(recent_history):
-            for bid in ob.bid:
-                if bid.lot >= 1000 and self.is_significant_order(bid):
-                    large_orders_timeline[bid.price].append(idx)
+        unique, first_index, inverse, counts = np.unique(
+            large_prices, return_index=True, return_inverse=True, return_counts=True)
         
         # Check for spoofing patterns (order muncul lalu hilang berulang)
-        for price, appearances in large_orders_timeline.items():
-            if len(appearances) >= 3:
-                # Check if there's a pattern of appearing and disappearing
-                gaps = []
-                for i in range(1, len(appearances)):
-                    gaps.append(appearances[i] - appearances[i-1])
+        for k in np.argsort(first_index, kind="stable"):
+            if counts[k] < 3:
+                continue
                 
-                # Jika jarak muncul-hilang konsisten, kemungkinan spoofing
-                if len(gaps) >= 2 and max(gaps) - min(gaps) <= 2:
-                    spoofing_patterns.append({
-                        "price": price,
-                        "appearances": appearances,
-                        "pattern": "regular_cancellation"
-                    })
+            appearances = rows[inverse == k]
+            gaps = np.diff(appearances)
+            
+            # Jika jarak muncul-hilang konsisten, kemungkinan spoofing
+            if len(gaps) >= 2 and gaps.max() - gaps.min() <= 2:
+                spoofing_patterns.append({
+                    "price": int(unique[k]),
+                    "appearances": [int(a) for a in appearances],
+                    "pattern": "regular_cancellation"
+                })
         
         return {
             "detected": len(spoofing_patterns) > 0,
@@ -131,85 +367,87 @@ class OrderBookAnalyzer:
             "count": len(spoofing_patterns)
         }
     
-    def get_market_depth(self, ob: OrderBook, depth: int = 5) -> Dict:
+    @_per_snapshot
+    def get_market_depth(self, ob: Optional[OrderBook] = None, depth: int = 5) -> Dict:
         """Get market depth sampai n level"""
-        bid_depth = ob.bid[:depth] if len(ob.bid) >= depth else ob.bid
-        ask_depth = ob.ask[:depth] if len(ob.ask) >= depth else ob.ask
+        if ob is not None:
+            bid_levels = [(b.price, b.lot, b.freq) for b in ob.bid[:depth]]
+            ask_levels = [(a.price, a.lot, a.freq) for a in ob.ask[:depth]]
+        else:
+            slot = self.history.latest_slot()
+            bid_levels = [tuple(int(x) for x in level)
+                          for level in zip(*(arr[:depth] for arr in self.history.side(slot, "bid")))]
+            ask_levels = [tuple(int(x) for x in level)
+                          for level in zip(*(arr[:depth] for arr in self.history.side(slot, "ask")))]
         
         return {
             "bid_depth": [
                 {
-                    "price": b.price,
-                    "lot": b.lot,
-                    "freq": b.freq,
-                    "value": b.lot * self.lot_size * b.price
-                } for b in bid_depth
+                    "price": price,
+                    "lot": lot,
+                    "freq": freq,
+                    "value": lot * self.lot_size * price
+                } for price, lot, freq in bid_levels
             ],
             "ask_depth": [
                 {
-                    "price": a.price,
-                    "lot": a.lot,
-                    "freq": a.freq,
-                    "value": a.lot * self.lot_size * a.price
-                } for a in ask_depth
+                    "price": price,
+                    "lot": lot,
+                    "freq": freq,
+                    "value": lot * self.lot_size * price
+                } for price, lot, freq in ask_levels
             ]
         }
     
-    def strongest_demand(self, depth: int = 3) -> Dict:
-        """Strongest demand area (support zone)"""
-        ob = self.history[-1]
-        top_bids = sorted(ob.bid, key=self.strength_score, reverse=True)[:depth]
+    def _strongest(self, side: str, depth: int) -> Dict:
+        """Top n level berdasarkan strength_score pada snapshot terakhir"""
+        prices, lots, freqs = self.history.side(self.history.latest_slot(), side)
+        
+        # Book dalam: tracker hanya memproses level yang berubah sejak snapshot terakhir
+        tracker = self.top_levels[side]
+        if len(prices) > DEEP_BOOK_LEVELS and self._top_levels_seq[side] != self.history.seq:
+            tracker.update(prices, lots, freqs)
+            self._top_levels_seq[side] = self.history.seq
+        
+        if self._top_levels_seq[side] == self.history.seq and tracker.sorted:
+            top_orders = [Order(price=p, freq=f, lot=l) for p, l, f in tracker.top(depth)]
+        else:
+            top = top_k(strength_scores(lots, freqs), depth)
+            top_orders = [Order(price=int(prices[i]), freq=int(freqs[i]), lot=int(lots[i])) for i in top]
         
-        total_lot = sum(b.lot for b in top_bids)
-        total_value = sum(b.lot * self.lot_size * b.price for b in top_bids)
-        avg_price = sum(b.price * b.lot for b in top_bids) / total_lot if total_lot > 0 else 0
+        total_lot = sum(o.lot for o in top_orders)
+        total_value = sum(o.lot * self.lot_size * o.price for o in top_orders)
+        avg_price = sum(o.price * o.lot for o in top_orders) / total_lot if total_lot > 0 else 0
         
         return {
-            "prices": [b.price for b in top_bids],
+            "prices": [o.price for o in top_orders],
             "total_lot": total_lot,
             "total_value": total_value,
             "avg_price": avg_price,
             "orders": [
                 {
-                    "price": b.price,
-                    "lot": b.lot,
-                    "freq": b.freq,
-                    "score": self.strength_score(b)
-                } for b in top_bids
+                    "price": o.price,
+                    "lot": o.lot,
+                    "freq": o.freq,
+                    "score": self.strength_score(o)
+                } for o in top_orders
             ]
         }
     
+    @_per_snapshot
+    def strongest_demand(self, depth: int = 3) -> Dict:
+        """Strongest demand area (support zone)"""
+        return self._strongest("bid", depth)
+    
+    @_per_snapshot
     def strongest_supply(self, depth: int = 3) -> Dict:
         """Strongest supply area (resistance zone)"""
-        ob = self.history[-1]
-        top_asks = sorted(ob.ask, key=self.strength_score, reverse=True)[:depth]
-        
-        total_lot = sum(a.lot for a in top_asks)
-        total_value = sum(a.lot * self.lot_size * a.price for a in top_asks)
-        avg_price = sum(a.price * a.lot for a in top_asks) / total_lot if total_lot > 0 else 0
+        return self._strongest("ask", depth)
         
-        return {
-            "prices": [a.price for a in top_asks],
-            "total_lot": total_lot,
-            "total_value": total_value,
-            "avg_price": avg_price,
-            "orders": [
-                {
-                    "price": a.price,
-                    "lot": a.lot,
-                    "freq": a.freq,
-                    "score": self.strength_score(a)
-                } for a in top_asks
-            ]
-        }
-    
-    def calculate_imbalance(self, ob: OrderBook) -> Dict:
+    @_per_snapshot
+    def calculate_imbalance(self, ob: Optional[OrderBook] = None) -> Dict:
         """Calculate order book imbalance"""
-        bid_lot = self.total_lot(ob.bid)
-        ask_lot = self.total_lot(ob.ask)
-        
-        bid_value = self.total_value(ob.bid)
-        ask_value = self.total_value(ob.ask)
+        bid_lot, ask_lot, bid_value, ask_value = self._totals(ob)
         
         total_lot = bid_lot + ask_lot
         total_value = bid_value + ask_value
@@ -223,127 +461,79 @@ class OrderBookAnalyzer:
             "ask_value": ask_value
         }
     
+    @_per_snapshot
     def volume_profile(self, lookback: int = 20) -> Dict:
         """Analyze volume profile over lookback period"""
         if len(self.history) < lookback:
             lookback = len(self.history)
         
-        volume_data = []
-        for ob in self.history[-lookback:]:
-            volume_data.append({
-                "timestamp": ob.timestamp,
-                "volume": ob.volume,
-                "bid_strength": self.bid_strength(ob),
-                "imbalance": self.calculate_imbalance(ob)["lot_imbalance"]
-            })
+        # Window streaming berisi tepat `lookback` snapshot terakhir: tanpa scan ulang
+        profile = self._sync_profile()
+        if lookback == len(profile):
+            return {
+                "lookback_period": lookback,
+                "avg_volume": np.float64(profile.avg_volume()),
+                "volume_trend": profile.volume_trend(),
+                "data": profile.rows()
+            }
+        
+        slots = self.history.slots(lookback)
+        bid_lot = self.history.bid_lot_total[slots]
+        ask_lot = self.history.ask_lot_total[slots]
+        total_lot = bid_lot + ask_lot
+        safe_total = np.where(total_lot > 0, total_lot, 1)
+        strength = np.where(total_lot > 0, bid_lot / safe_total, 0.0)
+        imbalance = np.where(total_lot > 0, (bid_lot - ask_lot) / safe_total, 0.0)
+        volumes = self.history.volume[slots]
+        
+        volume_data = [
+            {
+                "timestamp": float(ts),
+                "volume": int(vol),
+                "bid_strength": float(bs),
+                "imbalance": float(imb)
+            } for ts, vol, bs, imb in zip(self.history.timestamp[slots], volumes, strength, imbalance)
+        ]
         
         return {
             "lookback_period": lookback,
-            "avg_volume": np.mean([v["volume"] for v in volume_data]),
-            "volume_trend": "increasing" if volume_data[-1]["volume"] > volume_data[0]["volume"] else "decreasing",
+            "avg_volume": np.mean(volumes),
+            "volume_trend": "increasing" if volumes[-1] > volumes[0] else "decreasing",
             "data": volume_data
         }
     
-    def bullish_score(self) -> Dict:
-        """Calculate comprehensive bullish score"""
-        if not self.history:
+    def vwap(self) -> Optional[float]:
+        """VWAP sesi dari histogram volume per harga"""
+        return self._sync_profile().vwap()
+    
+    def price_histogram(self) -> Dict[int, int]:
+        """Volume per level harga sepanjang sesi"""
+        return self._sync_profile().price_levels()
+    
+    def volume_panel(self) -> Dict:
+        """VWAP, POC dan rata-rata window untuk panel live, O(1)"""
+        return self._sync_profile().panel()
+    
+    def bullish_score(self, stages: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Calculate comprehensive bullish score lewat self.scoring (lihat ScoringPipeline).
+        `stages`: nama stage yang dihitung, mis. CHEAP_STAGES untuk screening
+        tanpa detector manipulasi; default semua stage.
+        """
+        # Key cache harus hashable: list/sequence lain dinormalisasi ke tuple
+        return self._bullish_score(tuple(stages) if stages is not None else None)
+    
+    @_per_snapshot
+    def _bullish_score(self, stages: Optional[Tuple[str, ...]]) -> Dict:
+        if not len(self.history):
             return {"score": 0, "components": {}}
         
-        ob = self.history[-1]
-        score = 0
-        max_score = 100
-        components = {}
-        
-        # 1. Bid Strength (0-25 points)
-        strength = self.bid_strength(ob)
-        if strength > 0.7:
-            score += 25
-            components["bid_strength"] = 25
-        elif strength > 0.6:
-            score += 20
-            components["bid_strength"] = 20
-        elif strength > 0.5:
-            score += 15
-            components["bid_strength"] = 15
-        else:
-            components["bid_strength"] = 0
-        
-        # 2. Bid-Ask Ratio (0-20 points)
-        ratio = self.bid_ask_ratio(ob)
-        if ratio > 2.0:
-            score += 20
-            components["bid_ask_ratio"] = 20
-        elif ratio > 1.5:
-            score += 15
-            components["bid_ask_ratio"] = 15
-        elif ratio > 1.0:
-            score += 10
-            components["bid_ask_ratio"] = 10
-        else:
-            components["bid_ask_ratio"] = 0
-        
-        # 3. Spread (0-15 points)
-        spread_pct = self.spread_percentage(ob)
-        if spread_pct <= 0.5:
-            score += 15
-            components["spread"] = 15
-        elif spread_pct <= 1.0:
-            score += 10
-            components["spread"] = 10
-        elif spread_pct <= 1.5:
-            score += 5
-            components["spread"] = 5
-        else:
-            components["spread"] = 0
-        
-        # 4. Volume Strength (0-10 points)
-        if ob.volume > 500_000:
-            score += 10
-            components["volume"] = 10
-        elif ob.volume > 100_000:
-            score += 5
-            components["volume"] = 5
-        else:
-            components["volume"] = 0
-        
-        # 5. Market Depth Imbalance (0-10 points)
-        imbalance = self.calculate_imbalance(ob)["lot_imbalance"]
-        if imbalance > 0.2:
-            score += 10
-            components["imbalance"] = 10
-        elif imbalance > 0.1:
-            score += 5
-            components["imbalance"] = 5
-        else:
-            components["imbalance"] = 0
-        
-        # 6. No Manipulation (0-20 points)
-        fake_bid = self.detect_fake_bid()
-        spoofing = self.detect_spoofing()
-        
-        if not fake_bid["detected"]:
-            score += 10
-            components["no_fake_bid"] = 10
-        else:
-            components["no_fake_bid"] = 0
-            
-        if not spoofing["detected"]:
-            score += 10
-            components["no_spoofing"] = 10
-        else:
-            components["no_spoofing"] = 0
-        
-        return {
-            "score": score,
-            "percentage": (score / max_score) * 100,
-            "components": components,
-            "fake_bid_detected": fake_bid["detected"],
-            "spoofing_detected": spoofing["detected"]
-        }
+        return self.scoring.score(self, stages)
     
+    @_per_snapshot
     def signal(self) -> Dict:
         """Generate comprehensive trading signal"""
-        if not self.history:
+        if not len(self.history):
             return {"signal": "NO_DATA", "confidence": 0}
         
         score_result = self.bullish_score()
@@ -380,8 +570,7 @@ class OrderBookAnalyzer:
                 confidence = max(0, 100 - score)
         
         # Add market context
-        ob = self.history[-1]
-        market_depth = self.get_market_depth(ob, 3)
+        market_depth = self.get_market_depth(depth=3)
         demand = self.strongest_demand(2)
         supply = self.strongest_supply(2)
         
@@ -393,8 +582,8 @@ class OrderBookAnalyzer:
             "support_zone": demand,
             "resistance_zone": supply,
             "spread": {
-                "absolute": self.spread(ob),
-                "percentage": self.spread_percentage(ob)
+                "absolute": self.spread(),
+                "percentage": self.spread_percentage()
             },
             "recommendation": self._generate_recommendation(signal, demand, supply)
         }
@@ -427,30 +616,31 @@ class OrderBookAnalyzer:
     
     def get_summary(self) -> Dict:
         """Get complete order book analysis summary"""
-        if not self.history:
+        if not len(self.history):
             return {"error": "No historical data available"}
         
-        current_ob = self.history[-1]
+        best_bid, best_ask = self._best_prices()
+        bid_lot, ask_lot, bid_value, ask_value = self._totals()
         signal_result = self.signal()
         
         return {
             "timestamp": datetime.now().isoformat(),
             "current_price_levels": {
-                "best_bid": current_ob.bid[0].price if current_ob.bid else 0,
-                "best_ask": current_ob.ask[0].price if current_ob.ask else 0,
-                "mid_price": (current_ob.bid[0].price + current_ob.ask[0].price) / 2 
-                             if current_ob.bid and current_ob.ask else 0
+                "best_bid": best_bid if best_bid is not None else 0,
+                "best_ask": best_ask if best_ask is not None else 0,
+                "mid_price": (best_bid + best_ask) / 2
+                             if best_bid is not None and best_ask is not None else 0
             },
             "order_book_metrics": {
-                "bid_strength": self.bid_strength(current_ob),
-                "bid_ask_ratio": self.bid_ask_ratio(current_ob),
-                "bid_value_ratio": self.bid_value_ratio(current_ob),
-                "spread": self.spread(current_ob),
-                "spread_percentage": self.spread_percentage(current_ob),
-                "total_bid_lot": self.total_lot(current_ob.bid),
-                "total_ask_lot": self.total_lot(current_ob.ask),
-                "total_bid_value": self.total_value(current_ob.bid),
-                "total_ask_value": self.total_value(current_ob.ask)
+                "bid_strength": self.bid_strength(),
+                "bid_ask_ratio": self.bid_ask_ratio(),
+                "bid_value_ratio": self.bid_value_ratio(),
+                "spread": self.spread(),
+                "spread_percentage": self.spread_percentage(),
+                "total_bid_lot": bid_lot,
+                "total_ask_lot": ask_lot,
+                "total_bid_value": bid_value,
+                "total_ask_value": ask_value
             },
             "market_manipulation": {
                 "fake_bid": self.detect_fake_bid(),
@@ -460,8 +650,8 @@ class OrderBookAnalyzer:
                 "strongest_demand": self.strongest_demand(3),
                 "strongest_supply": self.strongest_supply(3)
             },
-            "market_depth": self.get_market_depth(current_ob, 5),
-            "imbalance": self.calculate_imbalance(current_ob),
+            "market_depth": self.get_market_depth(depth=5),
+            "imbalance": self.calculate_imbalance(),
             "volume_analysis": self.volume_profile(20),
             "trading_signal": signal_result
         }
\ No newline at end of file
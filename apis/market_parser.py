@@ -0,0 +1,69 @@
+"""
+Decoder response daftar saham Stockbit (get_market_mover, get_emitten_trending)
+menjadi volume per symbol untuk screening.
+
+Layout yang dicoba (list bisa langsung di "data" atau di salah satu field-nya):
+    {"data": {"mover_list": [{"stock_detail": {"code": "BBCA"}, "volume": {"raw": 1234500}}, ...]}}
+    {"data": [{"symbol": "BBCA", "volume": "1234500"}, ...]}
+Item tanpa field volume tetap tercatat dengan volume NaN.
+"""
+import math
+from typing import Dict, Iterable, List, Union
+
+from apis.orderbook_parser import _first, _loads, _number
+
+SYMBOL_KEYS = ('symbol', 'code', 'stock_code', 'company_code')
+NESTED_KEYS = ('stock_detail', 'company', 'stock')
+VOLUME_KEYS = ('volume', 'total_volume', 'vol')
+RAW_KEYS = ('raw', 'value')
+
+
+def _items(payload) -> List[Dict]:
+    data = payload.get('data', payload) if isinstance(payload, dict) else payload
+    if isinstance(data, list):
+        return [item for item in data if isinstance(item, dict)]
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                return value
+    return []
+
+
+def _symbol(item: Dict):
+    symbol = _first(item, SYMBOL_KEYS)
+    if symbol is None:
+        for key in NESTED_KEYS:
+            if isinstance(item.get(key), dict):
+                symbol = _first(item[key], SYMBOL_KEYS)
+                if symbol is not None:
+                    break
+    return str(symbol).upper() if symbol is not None else None
+
+
+def _volume(item: Dict) -> float:
+    value = _first(item, VOLUME_KEYS)
+    if isinstance(value, dict):
+        value = _first(value, RAW_KEYS)
+    try:
+        return float(_number(value)) if value is not None else float('nan')
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def parse_market_volumes(payloads: Union[Dict, bytes, str, Iterable]) -> Dict[str, float]:
+    """{symbol: volume} dari satu atau beberapa response; volume terbesar yang dipakai"""
+    if isinstance(payloads, (dict, bytes, str)):
+        payloads = [payloads]
+    volumes: Dict[str, float] = {}
+    for payload in payloads:
+        if isinstance(payload, (bytes, str)):
+            payload = _loads(payload)
+        for item in _items(payload):
+            symbol = _symbol(item)
+            if symbol is None:
+                continue
+            volume = _volume(item)
+            previous = volumes.get(symbol)
+            if previous is None or math.isnan(previous) or volume > previous:
+                volumes[symbol] = volume
+    return volumes
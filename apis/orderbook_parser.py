@@ -0,0 +1,131 @@
+"""
+Decoder response orderbook Stockbit (get_orderbook_companies) ke models.
+
+Layout yang diharapkan (field alternatif ikut dicoba):
+    {"data": {"lastprice": 9000, "volume": 1234500,
+              "bid":   [{"price": "8975", "volume": "120000", "que_num": "35"}, ...],
+              "offer": [{"price": "9000", "volume": "80000",  "que_num": "12"}, ...]}}
+
+Volume per level dari API dalam lembar saham, dikonversi ke lot (100 lembar).
+Response tanpa field bid maupun offer (mis. body error) ditolak dengan ValueError.
+"""
+import json
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models import Order, OrderBook, OrderBookArrays
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+SHARES_PER_LOT = 100
+
+BID_KEYS = ('bid', 'bids')
+ASK_KEYS = ('offer', 'ask', 'asks')
+PRICE_KEYS = ('price',)
+LOT_KEYS = ('volume', 'lot')
+FREQ_KEYS = ('que_num', 'freq', 'frequency')
+LAST_PRICE_KEYS = ('lastprice', 'last_price', 'close')
+VOLUME_KEYS = ('volume', 'total_volume')
+TIMESTAMP_KEYS = ('timestamp', 'time')
+
+
+def _first(record: Dict, keys: Tuple[str, ...], default=None):
+    for key in keys:
+        if key in record and record[key] is not None:
+            return record[key]
+    return default
+
+
+def _number(value) -> int:
+    if isinstance(value, str):
+        value = value.replace(',', '')
+    return int(float(value or 0))
+
+
+def _root(payload: Dict) -> Dict:
+    data = payload.get('data', payload) if isinstance(payload, dict) else None
+    data = data if isinstance(data, dict) else {}
+    if _first(data, BID_KEYS) is None and _first(data, ASK_KEYS) is None:
+        raise ValueError("Response orderbook tanpa field bid/offer")
+    return data
+
+
+def _timestamp(data: Dict, timestamp: Optional[float]) -> float:
+    if timestamp is not None:
+        return timestamp
+    value = _first(data, TIMESTAMP_KEYS)
+    return float(value) if isinstance(value, (int, float)) else time.time()
+
+
+def parse_orderbook(payload: Union[Dict, bytes, str], timestamp: Optional[float] = None,
+                    shares_per_lot: int = SHARES_PER_LOT) -> OrderBook:
+    """Ubah response orderbook jadi OrderBook (dengan objek Order per level)"""
+    if isinstance(payload, (bytes, str)):
+        payload = _loads(payload)
+    data = _root(payload)
+
+    def side(keys: Tuple[str, ...]) -> List[Order]:
+        return [
+            Order(
+                price=_number(_first(level, PRICE_KEYS, 0)),
+                freq=_number(_first(level, FREQ_KEYS, 0)),
+                lot=_number(_first(level, LOT_KEYS, 0)) // shares_per_lot
+            ) for level in _first(data, keys, [])
+        ]
+
+    return OrderBook(
+        bid=side(BID_KEYS),
+        ask=side(ASK_KEYS),
+        last_price=_number(_first(data, LAST_PRICE_KEYS, 0)),
+        volume=_number(_first(data, VOLUME_KEYS, 0)),
+        timestamp=_timestamp(data, timestamp)
+    )
+
+
+def _side_arrays(levels: List[Dict], shares_per_lot: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if not levels:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    first = levels[0]
+    price_key = next((k for k in PRICE_KEYS if k in first), PRICE_KEYS[0])
+    lot_key = next((k for k in LOT_KEYS if k in first), LOT_KEYS[0])
+    freq_key = next((k for k in FREQ_KEYS if k in first), FREQ_KEYS[0])
+
+    return (_column(levels, price_key),
+            _column(levels, lot_key) // shares_per_lot,
+            _column(levels, freq_key))
+
+
+def _column(levels: List[Dict], key: str) -> np.ndarray:
+    """Satu kolom level jadi array int64; string angka di-parse langsung oleh NumPy"""
+    values = [level.get(key) or 0 for level in levels]
+    try:
+        return np.array(values, dtype=np.int64)
+    except (ValueError, TypeError):
+        return np.array([_number(v) for v in values], dtype=np.int64)
+
+
+def decode_orderbook_arrays(payload: Union[Dict, bytes, str], timestamp: Optional[float] = None,
+                            shares_per_lot: int = SHARES_PER_LOT) -> OrderBookArrays:
+    """Fast path: decode langsung ke array NumPy tanpa membuat objek Order"""
+    if isinstance(payload, (bytes, str)):
+        payload = _loads(payload)
+    data = _root(payload)
+
+    bid_price, bid_lot, bid_freq = _side_arrays(_first(data, BID_KEYS, []), shares_per_lot)
+    ask_price, ask_lot, ask_freq = _side_arrays(_first(data, ASK_KEYS, []), shares_per_lot)
+
+    return OrderBookArrays(
+        bid_price=bid_price, bid_lot=bid_lot, bid_freq=bid_freq,
+        ask_price=ask_price, ask_lot=ask_lot, ask_freq=ask_freq,
+        last_price=_number(_first(data, LAST_PRICE_KEYS, 0)),
+        volume=_number(_first(data, VOLUME_KEYS, 0)),
+        timestamp=_timestamp(data, timestamp)
+    )
@@ -0,0 +1,152 @@
+"""
+Benchmark hot path OrderBookAnalyzer di atas stream order book sintetis.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_orderbook_analyzer --out bench.json
+    python -m benchmarks.bench_orderbook_analyzer --compare bench.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.SyntheticOrderBookGenerator import SyntheticOrderBookGenerator
+
+METHODS = ['get_summary', 'signal', 'bullish_score', 'detect_fake_bid', 'detect_spoofing', 'volume_profile']
+
+
+def build(symbols: int, history: int, depth: int, seed: int, copy_results: bool = False):
+    """
+    Analyzer + generator per symbol dengan history yang sudah terisi.
+    Default copy_results=False seperti analyzer live di StockMonitor.
+    """
+    generators = [SyntheticOrderBookGenerator(seed=seed + i, depth=depth) for i in range(symbols)]
+    analyzers = [OrderBookAnalyzer(list(gen.stream(history)), capacity=max(history, 1), depth=depth,
+                                   copy_results=copy_results)
+                 for gen in generators]
+    return analyzers, generators
+
+
+def latency_stats(samples_ns: List[int]) -> Dict:
+    samples = np.array(samples_ns, dtype=np.float64) / 1000
+    return {
+        'mean': float(samples.mean()),
+        'p50': float(np.percentile(samples, 50)),
+        'p90': float(np.percentile(samples, 90)),
+        'p99': float(np.percentile(samples, 99)),
+        'max': float(samples.max())
+    }
+
+
+def bench_method(method: str, symbols: int, history: int, depth: int, ticks: int, seed: int,
+                 copy_results: bool = False) -> Dict:
+    """Satu tick = append snapshot baru lalu panggil method, untuk tiap symbol"""
+    analyzers, generators = build(symbols, history, depth, seed, copy_results)
+    append_ns = []
+    method_ns = []
+
+    started = time.perf_counter()
+    for _ in range(ticks):
+        for analyzer, gen in zip(analyzers, generators):
+            ob = gen.next()
+            t0 = time.perf_counter_ns()
+            analyzer.append(ob)
+            t1 = time.perf_counter_ns()
+            getattr(analyzer, method)()
+            t2 = time.perf_counter_ns()
+            append_ns.append(t1 - t0)
+            method_ns.append(t2 - t1)
+    elapsed = time.perf_counter() - started
+
+    # Peak memory diukur terpisah karena tracemalloc memperlambat eksekusi
+    tracemalloc.start()
+    analyzers, generators = build(symbols, history, depth, seed, copy_results)
+    for analyzer, gen in zip(analyzers, generators):
+        analyzer.append(gen.next())
+        getattr(analyzer, method)()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    calls = len(method_ns)
+    return {
+        'method': method,
+        'symbols': symbols,
+        'history': history,
+        'depth': depth,
+        'calls': calls,
+        'throughput_per_s': calls / (sum(method_ns) / 1e9) if sum(method_ns) else float('inf'),
+        'ticks_per_s': calls / elapsed if elapsed > 0 else float('inf'),
+        'latency_us': latency_stats(method_ns),
+        'append_latency_us': latency_stats(append_ns),
+        'peak_memory_kb': peak / 1024
+    }
+
+
+def compare(baseline: Dict, current: Dict):
+    """Cetak rasio p50 terhadap baseline (> 1 berarti lebih lambat)"""
+    key = lambda r: (r['method'], r['symbols'], r['history'], r['depth'])
+    base = {key(r): r for r in baseline['results']}
+    print(f"{'method':<18}{'symbols':>8}{'history':>9}{'p50 us':>12}{'base us':>12}{'ratio':>8}")
+    for r in current['results']:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        ratio = r['latency_us']['p50'] / b['latency_us']['p50'] if b['latency_us']['p50'] else float('inf')
+        print(f"{r['method']:<18}{r['symbols']:>8}{r['history']:>9}"
+              f"{r['latency_us']['p50']:>12.1f}{b['latency_us']['p50']:>12.1f}{ratio:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark OrderBookAnalyzer')
+    parser.add_argument('--history', type=int, nargs='+', default=[20, 500, 2000])
+    parser.add_argument('--symbols', type=int, nargs='+', default=[1, 20])
+    parser.add_argument('--depth', type=int, default=10)
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--methods', nargs='+', default=METHODS, choices=METHODS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--copy-results', action='store_true',
+                        help='Ukur dengan salinan hasil per panggilan (default API publik)')
+    parser.add_argument('--out', help='Simpan hasil sebagai JSON')
+    parser.add_argument('--compare', help='JSON hasil sebelumnya untuk dibandingkan')
+    args = parser.parse_args()
+
+    results = []
+    for history in args.history:
+        for symbols in args.symbols:
+            for method in args.methods:
+                result = bench_method(method, symbols, history, args.depth, args.ticks, args.seed,
+                                      args.copy_results)
+                results.append(result)
+                print(f"{method:<18} symbols={symbols:<5} history={history:<6} "
+                      f"p50={result['latency_us']['p50']:.1f}us p99={result['latency_us']['p99']:.1f}us "
+                      f"{result['throughput_per_s']:.0f}/s peak={result['peak_memory_kb']:.0f}KB")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'args': vars(args)
+        },
+        'results': results
+    }
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
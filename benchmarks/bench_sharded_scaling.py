@@ -0,0 +1,130 @@
+"""
+Benchmark skala ShardedAnalyzer: throughput (symbol per detik) terhadap jumlah
+worker, dengan snapshot order book sintetis baru per symbol tiap siklus.
+workers=0 berarti analisis inline di proses ini (sama dengan StockMonitor tanpa
+--workers) sebagai baseline.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_sharded_scaling
+    python -m benchmarks.bench_sharded_scaling --workers 0 1 2 4 8 --symbols 900 --out scaling.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.ShardedAnalyzer import ShardedAnalyzer, _record
+from classes.StockPotentialAnalyzer import StockPotentialAnalyzer
+from classes.SyntheticOrderBookGenerator import SyntheticOrderBookGenerator
+from models import OrderBook, OrderBookArrays
+
+
+def to_arrays(ob: OrderBook) -> OrderBookArrays:
+    """Snapshot dalam bentuk yang dikirim StockMonitor ke worker"""
+    bid = np.array([(o.price, o.lot, o.freq) for o in ob.bid], dtype=np.int64).reshape(-1, 3)
+    ask = np.array([(o.price, o.lot, o.freq) for o in ob.ask], dtype=np.int64).reshape(-1, 3)
+    return OrderBookArrays(
+        bid_price=bid[:, 0], bid_lot=bid[:, 1], bid_freq=bid[:, 2],
+        ask_price=ask[:, 0], ask_lot=ask[:, 1], ask_freq=ask[:, 2],
+        last_price=ob.last_price, volume=ob.volume, timestamp=ob.timestamp
+    )
+
+
+def make_cycles(symbols: List[str], cycles: int, depth: int, seed: int) -> List[Dict[str, OrderBookArrays]]:
+    """Snapshot per symbol per siklus, dibuat di muka agar tidak ikut terukur"""
+    generators = {symbol: SyntheticOrderBookGenerator(seed=seed + i, depth=depth)
+                  for i, symbol in enumerate(symbols)}
+    return [{symbol: to_arrays(gen.next()) for symbol, gen in generators.items()} for _ in range(cycles)]
+
+
+def run_inline(symbols: List[str], cycles: List[Dict[str, OrderBookArrays]]) -> List[float]:
+    analyzer = StockPotentialAnalyzer()
+    orderbooks: Dict[str, OrderBookAnalyzer] = {}
+    durations = []
+    for snapshots in cycles:
+        started = time.perf_counter()
+        records = []
+        for symbol in symbols:
+            if symbol not in orderbooks:
+                orderbooks[symbol] = OrderBookAnalyzer([], copy_results=False)
+            orderbooks[symbol].append(snapshots[symbol])
+            result = analyzer.analyze_stock(symbol, quiet=True, orderbook=orderbooks[symbol])
+            records.append(_record(symbol, result, orderbooks[symbol]))
+        ShardedAnalyzer.rank(np.stack(records))
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def run_sharded(workers: int, symbols: List[str], cycles: List[Dict[str, OrderBookArrays]]) -> List[float]:
+    durations = []
+    with ShardedAnalyzer(workers) as sharded:
+        for snapshots in cycles:
+            started = time.perf_counter()
+            sharded.analyze(symbols, snapshots)
+            durations.append(time.perf_counter() - started)
+    return durations
+
+
+def bench(workers: int, symbols: List[str], cycles: List[Dict[str, OrderBookArrays]], warmup: int) -> Dict:
+    durations = run_inline(symbols, cycles) if workers == 0 else run_sharded(workers, symbols, cycles)
+    # Siklus awal (start proses, alokasi analyzer) tidak dihitung
+    measured = np.array(durations[warmup:] or durations)
+    return {
+        'workers': workers,
+        'symbols': len(symbols),
+        'cycles': len(measured),
+        'cycle_ms_p50': float(np.percentile(measured, 50) * 1000),
+        'cycle_ms_max': float(measured.max() * 1000),
+        'symbols_per_s': len(symbols) * len(measured) / float(measured.sum())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark throughput ShardedAnalyzer vs jumlah worker')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4])
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--cycles', type=int, default=6)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--depth', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help='Simpan hasil sebagai JSON')
+    args = parser.parse_args()
+
+    symbols = [f"S{i:04d}" for i in range(args.symbols)]
+    cycles = make_cycles(symbols, args.cycles + args.warmup, args.depth, args.seed)
+
+    results = []
+    print(f"{'workers':>8}{'p50 ms':>10}{'max ms':>10}{'symbol/s':>11}{'speedup':>9}")
+    for workers in args.workers:
+        result = bench(workers, symbols, cycles, args.warmup)
+        results.append(result)
+        base = results[0]['symbols_per_s']
+        result['speedup'] = result['symbols_per_s'] / base if base else float('nan')
+        print(f"{workers:>8}{result['cycle_ms_p50']:>10.1f}{result['cycle_ms_max']:>10.1f}"
+              f"{result['symbols_per_s']:>11.0f}{result['speedup']:>9.2f}")
+
+    if args.out:
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'python': sys.version.split()[0],
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'args': vars(args)
+            },
+            'results': results
+        }
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
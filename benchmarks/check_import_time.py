@@ -0,0 +1,65 @@
+"""
+Cek budget waktu import untuk entry point CLI/worker.
+
+Jalankan dari root repo (exit code 1 jika budget terlampaui):
+    python -m benchmarks.check_import_time
+    python -m benchmarks.check_import_time --module classes.StockMonitor --budget-ms 200
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modul berat yang tidak boleh ikut termuat saat startup
+FORBIDDEN = ['pandas', 'matplotlib', 'requests']
+
+
+def measure(module: str) -> Tuple[float, List[str], Dict[str, int]]:
+    """(total ms, modul terlarang yang termuat, cumulative us per modul) dalam interpreter baru"""
+    code = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        f"import {module}\n"
+        "print((time.perf_counter() - t) * 1000)\n"
+        f"print(','.join(m for m in {FORBIDDEN!r} if m in sys.modules))\n"
+    )
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, check=True)
+    total, loaded = proc.stdout.splitlines()[:2]
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(cumulative_us)
+    return float(total), [m for m in loaded.split(',') if m], cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time budget check')
+    parser.add_argument('--module', default='main')
+    parser.add_argument('--budget-ms', type=float, default=300)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    best, loaded, cumulative = min(runs, key=lambda r: r[0])
+
+    print(f"import {args.module}: best {best:.1f} ms of {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    for name, us in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: modul berat ikut termuat saat startup: {', '.join(loaded)}")
+        failed = True
+    if best > args.budget_ms:
+        print(f"FAIL: {best:.1f} ms melebihi budget {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
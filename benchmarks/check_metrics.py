@@ -0,0 +1,69 @@
+"""
+Cek instrumentasi tanpa layanan eksternal: jalankan tick OrderBookAnalyzer
+(order book sintetis) dan siklus StockMonitor mode dummy dengan metrics mati
+lalu hidup, tampilkan overhead per tick dan dump hasilnya.
+
+Jalankan dari root repo:
+    python -m benchmarks.check_metrics
+    python -m benchmarks.check_metrics --format prom --out metrics.prom
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from metrics import METRICS
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.StockMonitor import StockMonitor
+from classes.SyntheticOrderBookGenerator import SyntheticOrderBookGenerator
+
+SYMBOLS = ['BBCA', 'BBRI', 'BMRI', 'TLKM', 'ASII', 'UNVR', 'ICBP', 'EXCL']
+
+
+def run_ticks(ticks: int, depth: int, seed: int) -> float:
+    """Detik per tick (append + get_summary)"""
+    gen = SyntheticOrderBookGenerator(seed=seed, depth=depth)
+    analyzer = OrderBookAnalyzer(list(gen.stream(20)), capacity=100, depth=depth)
+    started = time.perf_counter()
+    for _ in range(ticks):
+        analyzer.append(gen.next())
+        analyzer.get_summary()
+    return (time.perf_counter() - started) / ticks
+
+
+def run_cycles(cycles: int):
+    monitor = StockMonitor(SYMBOLS, output='none')
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(cycles):
+            monitor.run_single_analysis()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Metrics overhead/dump check')
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=20)
+    parser.add_argument('--cycles', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=('json', 'prom'), default='json')
+    parser.add_argument('--out', default=None)
+    args = parser.parse_args()
+
+    METRICS.enable(False)
+    disabled = run_ticks(args.ticks, args.depth, args.seed)
+
+    METRICS.reset()
+    METRICS.enable()
+    enabled = run_ticks(args.ticks, args.depth, args.seed)
+    run_cycles(args.cycles)
+
+    print(f"tick: {disabled * 1e6:.1f} us (metrics off), {enabled * 1e6:.1f} us (on), "
+          f"overhead on {(enabled / disabled - 1) * 100:+.1f}%")
+    if args.out:
+        METRICS.dump(args.out)
+        print(f"dump: {args.out}")
+    else:
+        print(METRICS.to_prometheus() if args.format == 'prom' else METRICS.to_json())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+import os
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Satu record per hasil analyze_stock, ukuran tetap
+RECORD_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('symbol', 'i4'),
+    ('signal', 'i4'),
+    ('total_score', 'f4'),
+    ('foreign_accumulation', 'f4'),
+    ('broker_imbalance', 'f4'),
+    ('orderbook_strength', 'f4'),
+    ('fake_order_penalty', 'f4'),
+    ('foreign_net', 'i8'),
+    ('local_net', 'i8'),
+    ('orderbook_imbalance', 'f4'),
+    ('current_price', 'i8'),
+    ('suspicious_level', 'i1'),
+    ('fake_bid', '?'),
+    ('fake_ask', '?'),
+])
+
+
+class AnalysisHistory:
+    """History analisis ber-ukuran tetap; record lama dipindah ke file append-only"""
+
+    def __init__(self, capacity: int = 10000, spill_path: Optional[str] = None,
+                 spill_batch: Optional[int] = None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.spill_batch = spill_batch or max(1, capacity // 10)
+        self._records = np.zeros(capacity, dtype=RECORD_DTYPE)
+        self._head = 0
+        self._size = 0
+
+        # Tabel string (symbol, signal) -> id; disimpan juga di sidecar file spill
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        if spill_path and os.path.exists(self._strings_path):
+            with open(self._strings_path, encoding='utf-8') as f:
+                for line in f:
+                    self._intern(line.rstrip('\n'), persist=False)
+
+    @property
+    def _strings_path(self) -> str:
+        return f"{self.spill_path}.strings"
+
+    def _intern(self, value: str, persist: bool = True) -> int:
+        if value not in self._string_ids:
+            self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+            if persist and self.spill_path:
+                with open(self._strings_path, 'a', encoding='utf-8') as f:
+                    f.write(value + '\n')
+        return self._string_ids[value]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _next_record(self) -> np.void:
+        """Slot record berikutnya di ring"""
+        if self._size == self.capacity:
+            # Pindahkan record terlama ke disk per batch, bukan satu per satu
+            n = min(self.spill_batch, self._size)
+            self._spill(self._records[(self._head + np.arange(n)) % self.capacity])
+            self._size -= n
+        self._size += 1
+
+        record = self._records[self._head]
+        self._head = (self._head + 1) % self.capacity
+        return record
+
+    def append(self, result: Dict):
+        """Simpan hasil StockPotentialAnalyzer.analyze_stock dalam bentuk ringkas"""
+        record = self._next_record()
+
+        components = result['score_components']
+        recommendation = result['recommendation']
+        fake_signals = result['fake_signals']
+
+        record['timestamp'] = result['timestamp'].timestamp()
+        record['symbol'] = self._intern(result['symbol'])
+        record['signal'] = self._intern(recommendation['signal'])
+        record['total_score'] = components['total_score']
+        record['foreign_accumulation'] = components['foreign_accumulation']
+        record['broker_imbalance'] = components['broker_imbalance']
+        record['orderbook_strength'] = components['orderbook_strength']
+        record['fake_order_penalty'] = components['fake_order_penalty']
+        record['foreign_net'] = result['foreign_net']
+        record['local_net'] = result['local_net']
+        record['orderbook_imbalance'] = result['orderbook_imbalance']
+        record['current_price'] = recommendation['current_price']
+        record['suspicious_level'] = fake_signals['suspicious_level']
+        record['fake_bid'] = fake_signals['fake_bid']
+        record['fake_ask'] = fake_signals['fake_ask']
+
+    def append_record(self, row: np.void):
+        """Simpan record ringkas dari worker ShardedAnalyzer (symbol/signal berupa string)"""
+        record = self._next_record()
+        for name in RECORD_DTYPE.names:
+            if name in ('symbol', 'signal'):
+                record[name] = self._intern(str(row[name]))
+            else:
+                record[name] = row[name]
+
+    def _spill(self, records: np.ndarray):
+        if self.spill_path:
+            with open(self.spill_path, 'ab') as f:
+                records.tofile(f)
+
+    def flush(self):
+        """Pindahkan semua record di memori ke disk (mis. sebelum proses berhenti)"""
+        if self.spill_path and self._size:
+            self._spill(self.records())
+            self._size = 0
+
+    def records(self) -> np.ndarray:
+        """Record di memori, urut dari yang terlama"""
+        index = (self._head - self._size + np.arange(self._size)) % self.capacity
+        return self._records[index]
+
+    def spilled(self) -> np.ndarray:
+        """Record yang sudah dipindah ke disk (memmap, dibaca lazy)"""
+        if not self.spill_path or not os.path.exists(self.spill_path) \
+                or os.path.getsize(self.spill_path) == 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.memmap(self.spill_path, dtype=RECORD_DTYPE, mode='r')
+
+    def string(self, string_id: int) -> str:
+        return self._strings[string_id]
+
+    def symbol_records(self, symbol: str, include_spilled: bool = False) -> np.ndarray:
+        """Semua record untuk satu symbol"""
+        if symbol not in self._string_ids:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        symbol_id = self._string_ids[symbol]
+
+        records = self.records()
+        if include_spilled:
+            spilled = self.spilled()
+            records = np.concatenate([spilled[spilled['symbol'] == symbol_id], records])
+        return records[records['symbol'] == symbol_id]
+
+    def to_dict(self, record: np.void) -> Dict:
+        """Ubah satu record kembali jadi dict"""
+        result = {name: record[name].item() for name in RECORD_DTYPE.names}
+        result['symbol'] = self.string(result['symbol'])
+        result['signal'] = self.string(result['signal'])
+        return result
+
+    def __iter__(self) -> Iterator[Dict]:
+        for record in self.records():
+            yield self.to_dict(record)
@@ -0,0 +1,128 @@
+import io
+import json
+from typing import Dict, List, Optional, TextIO
+
+import numpy as np
+
+LINE = '=' * 60
+
+
+def _plain(value):
+    """Nilai numpy/datetime -> tipe JSON biasa"""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class AnalysisRenderer:
+    """
+    Format hasil StockPotentialAnalyzer.analyze_stock di luar jalur analisis.
+    Hasil ditampung per siklus lalu ditulis sekali saat flush(): teks ke `stream`
+    dan/atau satu baris JSON per hasil ke `jsonl_path`.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, jsonl_path: Optional[str] = None):
+        self.stream = stream
+        self.jsonl_path = jsonl_path
+        self._text = io.StringIO()
+        self._lines: List[str] = []
+
+    @staticmethod
+    def format_sources(result: Dict, top_foreign=None, broker_summary=None, order_book=None) -> str:
+        """Bagian data mentah (broker, order book, fake order) seperti output lama analyze_stock"""
+        out = io.StringIO()
+        write = lambda line='': out.write(f"{line}\n")
+
+        write(f"\n{LINE}")
+        write(f"ANALISIS SAHAM: {result['symbol']}")
+        write(LINE)
+
+        if top_foreign is not None:
+            write("\n1. TOP BROKER ASING:")
+            write(top_foreign.head(5).to_frame().to_string())
+
+        if broker_summary is not None:
+            write("\n2. BROKER SUMMARY:")
+            write(broker_summary.table.head(10).to_frame().to_string())
+
+        if order_book is not None:
+            write("\n3. ORDER BOOK ANALYSIS:")
+            write("Top 5 Bids:")
+            write(order_book.bid.head(5).to_frame().to_string())
+            write("\nTop 5 Asks:")
+            write(order_book.ask.head(5).to_frame().to_string())
+
+        write(f"\nOrder Book Imbalance: {result['orderbook_imbalance']:.2%}")
+
+        fake_signals = result['fake_signals']
+        write("\n4. FAKE ORDER DETECTION:")
+        write(f"Fake Bid Detected: {fake_signals['fake_bid']}")
+        write(f"Fake Ask Detected: {fake_signals['fake_ask']}")
+        write(f"Suspicious Level: {fake_signals['suspicious_level']}/2")
+        for detail in fake_signals['details']:
+            write(f"  - {detail}")
+        return out.getvalue()
+
+    @staticmethod
+    def format_score(result: Dict) -> str:
+        """Rincian skor dan rekomendasi trading"""
+        out = io.StringIO()
+        write = lambda line='': out.write(f"{line}\n")
+        components = result['score_components']
+
+        write(f"\n{LINE}")
+        write("POTENTIAL SCORE CALCULATION:")
+        write(LINE)
+        write(f"Foreign Accumulation Score: {components['foreign_accumulation']:.1f}/40")
+        write(f"Broker Imbalance Score: {components['broker_imbalance']:.1f}/30")
+        write(f"Order Book Strength Score: {components['orderbook_strength']:.1f}/20")
+        write(f"Fake Order Penalty: {components['fake_order_penalty']:.1f}")
+
+        write(f"\n{LINE}")
+        write(f"TOTAL POTENTIAL SCORE: {components['total_score']:.1f}/100")
+
+        write(f"\n{LINE}")
+        write("TRADING RECOMMENDATION:")
+        write(LINE)
+        for key, value in result['recommendation'].items():
+            if key != 'score_components':
+                write(f"{key.upper()}: {value}")
+        return out.getvalue()
+
+    @classmethod
+    def format(cls, result: Dict, top_foreign=None, broker_summary=None, order_book=None) -> str:
+        return cls.format_sources(result, top_foreign, broker_summary, order_book) + cls.format_score(result)
+
+    @staticmethod
+    def to_json(result: Dict) -> str:
+        return json.dumps(_plain(result), separators=(',', ':'))
+
+    def add(self, result: Dict):
+        """Tampung satu hasil; belum ada I/O sampai flush()"""
+        if self.stream is not None:
+            self._text.write(self.format(result))
+        if self.jsonl_path:
+            self._lines.append(self.to_json(result))
+
+    def add_record(self, row: np.void):
+        """Record ringkas (mis. dari ShardedAnalyzer); hanya ke sink JSON-lines"""
+        if self.jsonl_path:
+            self._lines.append(json.dumps({name: _plain(row[name]) for name in row.dtype.names},
+                                          separators=(',', ':')))
+
+    def flush(self):
+        """Satu write per sink untuk seluruh hasil yang ditampung"""
+        if self.stream is not None and self._text.tell():
+            self.stream.write(self._text.getvalue())
+            self.stream.flush()
+            self._text = io.StringIO()
+        if self._lines:
+            with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self._lines) + '\n')
+            self._lines = []
@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from classes.ScoringPipeline import DEFAULT_PIPELINE, ScoringPipeline
+from models import OrderBook
+
+# Index field pada axis terakhir tensor order book
+PRICE, LOT, FREQ = 0, 1, 2
+
+
+class BatchOrderBookAnalyzer:
+    """Scoring order book banyak saham sekaligus dalam satu pass vectorized"""
+
+    SIGNALS = np.array(["STRONG_BUY", "BUY", "HOLD_POSITIVE", "NEUTRAL", "CAUTION", "SELL",
+                        "SPOOFING_DETECTED", "FAKE_BID_DETECTED"])
+
+    def __init__(self, scoring: Optional[ScoringPipeline] = None):
+        self.lot_size = 1
+        self.scoring = scoring or DEFAULT_PIPELINE
+
+    @staticmethod
+    def stack(books: List[OrderBook], depth: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Susun snapshot terakhir tiap saham jadi tensor (symbols x levels x {price,lot,freq})"""
+        if depth is None:
+            depth = max([max(len(ob.bid), len(ob.ask)) for ob in books] + [1])
+
+        bids = np.zeros((len(books), depth, 3), dtype=np.int64)
+        asks = np.zeros((len(books), depth, 3), dtype=np.int64)
+        volume = np.zeros(len(books), dtype=np.int64)
+
+        for i, ob in enumerate(books):
+            for side, orders in ((bids, ob.bid), (asks, ob.ask)):
+                levels = orders[:depth]
+                if levels:
+                    side[i, :len(levels)] = [(o.price, o.lot, o.freq) for o in levels]
+            volume[i] = ob.volume
+
+        return bids, asks, volume
+
+    def analyze(self, bids: np.ndarray, asks: np.ndarray, volume: np.ndarray,
+                fake_bid_detected: Optional[np.ndarray] = None,
+                spoofing_detected: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Hitung metrik, komponen bullish score dan signal untuk semua saham.
+        Level dengan price 0 dianggap padding. Tanpa flag manipulasi, deteksi
+        dihitung dari snapshot ini saja (sama dengan analyzer ber-history 1 snapshot).
+        """
+        bid_valid = bids[:, :, PRICE] > 0
+        ask_valid = asks[:, :, PRICE] > 0
+
+        bid_lot = np.where(bid_valid, bids[:, :, LOT], 0).sum(axis=1)
+        ask_lot = np.where(ask_valid, asks[:, :, LOT], 0).sum(axis=1)
+        bid_value = np.where(bid_valid, bids[:, :, LOT] * bids[:, :, PRICE], 0).sum(axis=1) * self.lot_size
+        ask_value = np.where(ask_valid, asks[:, :, LOT] * asks[:, :, PRICE], 0).sum(axis=1) * self.lot_size
+
+        total_lot = bid_lot + ask_lot
+        total_value = bid_value + ask_value
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bid_strength = np.where(total_lot > 0, bid_lot / total_lot, 0.0)
+            bid_ask_ratio = np.where(ask_lot > 0, bid_lot / ask_lot, np.inf)
+            bid_value_ratio = np.where(ask_value > 0, bid_value / ask_value, np.inf)
+            lot_imbalance = np.where(total_lot > 0, (bid_lot - ask_lot) / total_lot, 0.0)
+            value_imbalance = np.where(total_value > 0, (bid_value - ask_value) / total_value, 0.0)
+
+            best_bid = bids[:, 0, PRICE]
+            best_ask = asks[:, 0, PRICE]
+            has_both = bid_valid[:, 0] & ask_valid[:, 0]
+            spread = np.where(has_both, best_ask - best_bid, 0)
+            spread_percentage = np.where(has_both, spread / best_bid * 100, 0.0)
+
+        if fake_bid_detected is None:
+            fake_bid_detected = (bid_valid & (bids[:, :, LOT] >= 500) & (bids[:, :, FREQ] <= 2)).any(axis=1)
+        if spoofing_detected is None:
+            spoofing_detected = np.zeros(len(bids), dtype=bool)
+
+        # Ambang dan poin dari ScoringPipeline yang sama dengan bullish_score per symbol
+        components = self.scoring.score_values({
+            "bid_strength": bid_strength,
+            "bid_ask_ratio": bid_ask_ratio,
+            "spread": spread_percentage,
+            "volume": volume,
+            "imbalance": lot_imbalance,
+            "no_fake_bid": fake_bid_detected.astype(np.float64),
+            "no_spoofing": spoofing_detected.astype(np.float64)
+        })
+        score = components.pop("score")
+        # Stage berbasis history (mis. large_cancels) tidak tersedia untuk snapshot tunggal
+        max_score = sum(self.scoring.config[name].max_points for name in components)
+
+        signal, confidence = self._signal(score, fake_bid_detected, spoofing_detected)
+
+        return {
+            "bid_strength": bid_strength,
+            "bid_ask_ratio": bid_ask_ratio,
+            "bid_value_ratio": bid_value_ratio,
+            "lot_imbalance": lot_imbalance,
+            "value_imbalance": value_imbalance,
+            "spread": spread,
+            "spread_percentage": spread_percentage,
+            "components": components,
+            "score": score,
+            "percentage": (score / max_score) * 100 if max_score else np.zeros(len(score)),
+            "fake_bid_detected": fake_bid_detected,
+            "spoofing_detected": spoofing_detected,
+            "signal": signal,
+            "confidence": confidence
+        }
+
+    def _signal(self, score: np.ndarray, fake_bid: np.ndarray,
+                spoofing: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Signal dan confidence, urutan kondisi sama dengan OrderBookAnalyzer.signal"""
+        conditions = [spoofing, fake_bid, score >= 80, score >= 65, score >= 50, score >= 40, score >= 30]
+        index = np.select(conditions, [6, 7, 0, 1, 2, 3, 4], 5)
+        confidence = np.select(
+            conditions,
+            [0, 0, np.minimum(100, score + 10), score, score - 10, 40, 30],
+            np.maximum(0, 100 - score)
+        )
+        return self.SIGNALS[index], confidence
+
+    def rank(self, result: Dict[str, np.ndarray], top_n: Optional[int] = None) -> np.ndarray:
+        """Index saham urut dari score tertinggi"""
+        order = np.argsort(-result["score"], kind="stable")
+        return order if top_n is None else order[:top_n]
@@ -0,0 +1,187 @@
+"""
+Akumulasi broker flow per symbol dari record trade/broker summary.
+
+Record (dict, dari file JSON/JSON-lines atau API) salah satu dari:
+    trade   : {"symbol", "broker", "side": "BUY"|"SELL", "lot", "price"}
+    summary : {"symbol", "broker", "buy_lot", "sell_lot", "buy_value", "sell_value"}
+Field opsional "broker_type": "FOREIGN"/"F"/"ASING" atau "LOCAL"/"D"/"DOMESTIK".
+Record summary bersifat delta (ditambahkan), bukan pengganti nilai sebelumnya.
+"""
+import json
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models import RecordTable, BrokerSummary
+from classes.LazyHeap import LazyHeap
+from classes.StockbitBandarDetector import FOREIGN_BROKER_DTYPE, BROKER_SUMMARY_DTYPE
+
+SHARES_PER_LOT = 100
+
+FOREIGN_TYPES = {'FOREIGN', 'F', 'ASING'}
+
+FLOW_COLUMNS = ('buy_lot', 'sell_lot', 'buy_value', 'sell_value', 'trades')
+
+
+class _SymbolFlow:
+    """Kolom per broker untuk satu symbol, index = id broker di engine"""
+
+    def __init__(self, capacity: int):
+        for name in FLOW_COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=np.int64))
+        self.foreign_net = 0
+        self.local_net = 0
+        # Net lot per broker asing, key broker_id
+        self.heap = LazyHeap()
+
+    def grow(self, capacity: int):
+        for name in FLOW_COLUMNS:
+            column = getattr(self, name)
+            if len(column) < capacity:
+                grown = np.zeros(max(capacity, len(column) * 2), dtype=np.int64)
+                grown[:len(column)] = column
+                setattr(self, name, grown)
+
+    def net(self, broker_id: int) -> int:
+        return int(self.buy_lot[broker_id] - self.sell_lot[broker_id])
+
+
+class BrokerFlowEngine:
+    """Net buy/sell per symbol per broker, diperbarui per record (tanpa hitung ulang)"""
+
+    def __init__(self, foreign_brokers: Optional[Iterable[str]] = None):
+        self.brokers: List[str] = []
+        self.broker_ids: Dict[str, int] = {}
+        self.is_foreign = np.zeros(0, dtype=bool)
+        self._foreign_names: Set[str] = set(foreign_brokers or [])
+        self.flows: Dict[str, _SymbolFlow] = {}
+        self.records = 0
+
+    def broker_id(self, broker: str, broker_type: Optional[str] = None) -> int:
+        if broker not in self.broker_ids:
+            self.broker_ids[broker] = len(self.brokers)
+            self.brokers.append(broker)
+            self.is_foreign = np.append(self.is_foreign, False)
+            if broker_type is not None:
+                self.is_foreign[-1] = broker_type.upper() in FOREIGN_TYPES
+            else:
+                self.is_foreign[-1] = broker in self._foreign_names
+        return self.broker_ids[broker]
+
+    def _flow(self, symbol: str) -> _SymbolFlow:
+        flow = self.flows.get(symbol)
+        if flow is None:
+            flow = self.flows[symbol] = _SymbolFlow(max(8, len(self.brokers)))
+        flow.grow(len(self.brokers))
+        return flow
+
+    def ingest(self, record: Dict):
+        """Tambahkan satu record trade atau broker summary"""
+        broker_id = self.broker_id(record['broker'], record.get('broker_type'))
+        flow = self._flow(record['symbol'])
+
+        if 'side' in record:
+            lot = int(record['lot'])
+            value = lot * int(record['price']) * SHARES_PER_LOT
+            buy_lot, sell_lot = (lot, 0) if record['side'].upper() in ('BUY', 'B') else (0, lot)
+            buy_value, sell_value = (value, 0) if buy_lot else (0, value)
+            trades = 1
+        else:
+            buy_lot = int(record.get('buy_lot', 0))
+            sell_lot = int(record.get('sell_lot', 0))
+            buy_value = int(record.get('buy_value', 0))
+            sell_value = int(record.get('sell_value', 0))
+            trades = int(record.get('trades', 0))
+
+        flow.buy_lot[broker_id] += buy_lot
+        flow.sell_lot[broker_id] += sell_lot
+        flow.buy_value[broker_id] += buy_value
+        flow.sell_value[broker_id] += sell_value
+        flow.trades[broker_id] += trades
+
+        if self.is_foreign[broker_id]:
+            flow.foreign_net += buy_lot - sell_lot
+            flow.heap.push(broker_id, flow.net(broker_id))
+        else:
+            flow.local_net += buy_lot - sell_lot
+        self.records += 1
+
+    def ingest_many(self, records: Iterable[Dict]):
+        for record in records:
+            self.ingest(record)
+
+    def load_json(self, path: str):
+        """File JSON (list atau {"data": [...]}) atau JSON-lines"""
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            payload = [json.loads(line) for line in text.splitlines() if line.strip()]
+        self.ingest_many(payload['data'] if isinstance(payload, dict) else payload)
+
+    def fetch(self, client, path: str, params: Optional[Dict] = None):
+        """Ambil record dari API (mis. stub lokal) lewat StockbitClient.get"""
+        payload = client.get(path, params)
+        self.ingest_many(payload['data'] if isinstance(payload, dict) else payload)
+
+    def top_foreign(self, symbol: str, n: int = 5) -> List[Tuple[str, int]]:
+        """(broker, net lot) akumulator asing terbesar, tanpa sort penuh"""
+        flow = self.flows.get(symbol)
+        if flow is None:
+            return []
+        return [(self.brokers[broker_id], net) for broker_id, net, _ in flow.heap.top(n)]
+
+    def net(self, symbol: str) -> Tuple[int, int]:
+        """(foreign net, local net) lot"""
+        flow = self.flows.get(symbol)
+        return (flow.foreign_net, flow.local_net) if flow is not None else (0, 0)
+
+    def foreign_strength(self, symbol: str) -> float:
+        """Rata-rata net lot per broker asing yang aktif di symbol, O(1)"""
+        flow = self.flows.get(symbol)
+        if flow is None or not len(flow.heap):
+            return 0.0
+        return flow.foreign_net / len(flow.heap)
+
+    def top_foreign_table(self, symbol: str, n: int = 5) -> RecordTable:
+        """Format sama dengan StockbitBandarDetector.get_top_foreign_brokers"""
+        top = self.top_foreign(symbol, n)
+        records = np.zeros(len(top), dtype=FOREIGN_BROKER_DTYPE)
+        flow = self.flows.get(symbol)
+        for i, (broker, net) in enumerate(top):
+            broker_id = self.broker_ids[broker]
+            trend = 'ACCUMULATION' if net > 0 else 'DISTRIBUTION' if net < 0 else 'NEUTRAL'
+            records[i] = (broker, net, flow.buy_value[broker_id] + flow.sell_value[broker_id],
+                          flow.trades[broker_id], trend)
+        return RecordTable(records)
+
+    def summary(self, symbol: str) -> BrokerSummary:
+        """Format sama dengan StockbitBandarDetector.get_broker_summary"""
+        flow = self.flows.get(symbol)
+        size = min(len(self.brokers), len(flow.buy_lot)) if flow is not None else 0
+        records = np.zeros(size, dtype=BROKER_SUMMARY_DTYPE)
+        if size:
+            active = (flow.buy_lot[:size] + flow.sell_lot[:size]) > 0
+            ids = np.flatnonzero(active)
+            records = records[:len(ids)]
+            lots = flow.buy_lot[ids] + flow.sell_lot[ids]
+            values = flow.buy_value[ids] + flow.sell_value[ids]
+            records['broker'] = [self.brokers[i] for i in ids]
+            records['buy_lots'] = flow.buy_lot[ids]
+            records['sell_lots'] = flow.sell_lot[ids]
+            records['net_lots'] = flow.buy_lot[ids] - flow.sell_lot[ids]
+            records['avg_price'] = values // np.maximum(lots * SHARES_PER_LOT, 1)
+            records['broker_type'] = np.where(self.is_foreign[ids], 'FOREIGN', 'LOCAL')
+            records['net_ratio'] = records['net_lots'] / (lots + 1)
+
+        table = RecordTable(records).sort_desc('net_lots')
+        is_foreign = table['broker_type'] == 'FOREIGN'
+        foreign_net, local_net = self.net(symbol)
+        return BrokerSummary(
+            table=table,
+            foreign=table.take(is_foreign),
+            local=table.take(~is_foreign),
+            foreign_net=foreign_net,
+            local_net=local_net
+        )
@@ -0,0 +1,64 @@
+import heapq
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+
+class LazyHeap:
+    """
+    Top-n atas skor per key yang diperbarui di tempat (lazy deletion): push
+    memberi key versi baru dan entri (-skor, seri, versi, key, data) masuk heap,
+    entri basi (versi lama / key dibuang) dibuang saat query. Skor sama: seri
+    kecil dulu, lalu key yang lebih dulu di-push. Dipakai Leaderboard,
+    TopLevelTracker dan BrokerFlowEngine.
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[float, Any, int, Hashable, Any]] = []
+        self.version: Dict[Hashable, int] = {}
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self.version)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.version
+
+    def push(self, key: Hashable, score: float, tie: Any = 0, data: Any = None):
+        """Set skor terbaru key, O(log n)"""
+        # Versi unik global: key yang dibuang lalu muncul lagi tidak menghidupkan entri lama
+        self.updates += 1
+        self.version[key] = self.updates
+        heapq.heappush(self.heap, (-score, tie, self.updates, key, data))
+        if len(self.heap) > 4 * len(self.version) + 64:
+            self.compact()
+
+    def discard(self, key: Hashable):
+        self.version.pop(key, None)
+
+    def clear(self):
+        self.heap = []
+        self.version = {}
+
+    def compact(self):
+        """Buang semua entri basi sekaligus"""
+        self.heap = [entry for entry in self.heap if self.version.get(entry[3]) == entry[2]]
+        heapq.heapify(self.heap)
+
+    def rebuild(self, entries: Iterable[Tuple[float, Any, Hashable, Any]]):
+        """Ganti seluruh isi dengan entri (skor, seri, key, data), O(n)"""
+        self.clear()
+        for score, tie, key, data in entries:
+            self.updates += 1
+            self.version[key] = self.updates
+            self.heap.append((-score, tie, self.updates, key, data))
+        heapq.heapify(self.heap)
+
+    def top(self, n: int) -> List[Tuple[Hashable, float, Any]]:
+        """(key, skor, data) n terbesar tanpa sort penuh"""
+        valid = []
+        while self.heap and len(valid) < n:
+            entry = heapq.heappop(self.heap)
+            if self.version.get(entry[3]) == entry[2]:
+                valid.append(entry)
+        for entry in valid:
+            heapq.heappush(self.heap, entry)
+        return [(key, -neg_score, data) for neg_score, _, _, key, data in valid]
@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Tuple
+
+from classes.LazyHeap import LazyHeap
+
+
+class Leaderboard:
+    """
+    Ranking skor per symbol yang diperbarui di tempat lewat LazyHeap. top(n)
+    tanpa sort penuh; end_cycle() melaporkan perubahan rank top-n sejak siklus
+    sebelumnya. Skor sama: symbol yang lebih dulu di-update di atas.
+    """
+
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
+        self.labels: Dict[str, str] = {}
+        self.heap = LazyHeap()
+        self.cycles = 0
+        # Rank (1-based) top-n pada akhir siklus sebelumnya
+        self.previous_ranks: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.scores
+
+    def update(self, symbol: str, score: float, label: Optional[str] = None):
+        """Set skor terbaru symbol, O(log n)"""
+        score = float(score)
+        if label is not None:
+            self.labels[symbol] = label
+        if self.scores.get(symbol) == score and symbol in self.heap:
+            return
+        self.scores[symbol] = score
+        self.heap.push(symbol, score)
+
+    def remove(self, symbol: str):
+        self.scores.pop(symbol, None)
+        self.labels.pop(symbol, None)
+        self.heap.discard(symbol)
+
+    def retain(self, symbols):
+        """Buang symbol di luar `symbols` (mis. universe run sekali yang berubah)"""
+        keep = set(symbols)
+        for symbol in [s for s in self.scores if s not in keep]:
+            self.remove(symbol)
+        self.previous_ranks = {s: r for s, r in self.previous_ranks.items() if s in keep}
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """(symbol, skor) n terbesar"""
+        return [(symbol, score) for symbol, score, _ in self.heap.top(n)]
+
+    def order(self, symbols) -> List[str]:
+        """`symbols` yang ada di leaderboard dalam urutan top(), O(k log k) tanpa menyentuh heap"""
+        ranked = [symbol for symbol in symbols if symbol in self.scores]
+        ranked.sort(key=lambda symbol: (-self.scores[symbol], self.heap.version[symbol]))
+        return ranked
+
+    def end_cycle(self, n: int = 5) -> List[Dict]:
+        """
+        Top-n beserta perubahan rank: change > 0 naik, None jika belum ada siklus
+        sebelumnya, new=True jika sebelumnya di luar top-n.
+        """
+        rows = []
+        for rank, (symbol, score) in enumerate(self.top(n), 1):
+            previous = self.previous_ranks.get(symbol)
+            rows.append({
+                "rank": rank,
+                "symbol": symbol,
+                "score": score,
+                "label": self.labels.get(symbol),
+                "previous_rank": previous,
+                "change": previous - rank if previous is not None else None,
+                "new": self.cycles > 0 and previous is None
+            })
+        self.previous_ranks = {row["symbol"]: row["rank"] for row in rows}
+        self.cycles += 1
+        return rows
+
+    @staticmethod
+    def format_change(row: Dict) -> str:
+        if row["new"]:
+            return " (new)"
+        if row["change"]:
+            return f" ({row['change']:+d})"
+        return ""
@@ -0,0 +1,174 @@
+from collections import deque
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from models import OrderBook
+
+# Window bawaan (jumlah snapshot) sama dengan lookback default OrderBookAnalyzer
+FAKE_WINDOW = 10
+SPOOF_WINDOW = 15
+
+
+class _PriceStats:
+    """Kemunculan satu harga di dalam window beserta statistik jaraknya"""
+
+    __slots__ = ("hits", "gap_max", "gap_min", "next_gap_id", "first_gap_id")
+
+    def __init__(self):
+        self.hits = deque()      # (seq, posisi dalam kandidat snapshot)
+        self.gap_max = deque()   # monotonic deque (gap_id, gap) untuk max
+        self.gap_min = deque()   # monotonic deque (gap_id, gap) untuk min
+        self.next_gap_id = 0
+        self.first_gap_id = 0
+
+    def push_gap(self, gap: int):
+        gap_id = self.next_gap_id
+        self.next_gap_id += 1
+        while self.gap_max and self.gap_max[-1][1] <= gap:
+            self.gap_max.pop()
+        self.gap_max.append((gap_id, gap))
+        while self.gap_min and self.gap_min[-1][1] >= gap:
+            self.gap_min.pop()
+        self.gap_min.append((gap_id, gap))
+
+    def pop_gap(self):
+        if self.gap_max and self.gap_max[0][0] == self.first_gap_id:
+            self.gap_max.popleft()
+        if self.gap_min and self.gap_min[0][0] == self.first_gap_id:
+            self.gap_min.popleft()
+        self.first_gap_id += 1
+
+
+class _PriceWindow:
+    """Sliding window kemunculan harga; update O(ukuran snapshot) per tick"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.seq = 0
+        self.snapshots = deque()
+        self.prices: Dict[int, _PriceStats] = {}
+        self.rare = set()       # muncul <= 2 kali
+        self.frequent = set()   # muncul >= 3 kali
+
+    @property
+    def start(self) -> int:
+        return self.seq - len(self.snapshots)
+
+    def _recount(self, price: int, stats: _PriceStats):
+        count = len(stats.hits)
+        if count >= 3:
+            self.rare.discard(price)
+            self.frequent.add(price)
+        else:
+            self.frequent.discard(price)
+            self.rare.add(price)
+
+    def push(self, candidates: List[int]):
+        seq = self.seq
+        for pos, price in enumerate(candidates):
+            stats = self.prices.get(price)
+            if stats is None:
+                stats = self.prices[price] = _PriceStats()
+            elif stats.hits:
+                stats.push_gap(seq - stats.hits[-1][0])
+            stats.hits.append((seq, pos))
+            self._recount(price, stats)
+
+        self.snapshots.append(candidates)
+        self.seq += 1
+
+        if len(self.snapshots) > self.window:
+            self._evict()
+
+    def _evict(self):
+        for price in self.snapshots.popleft():
+            stats = self.prices[price]
+            stats.hits.popleft()
+            if stats.hits:
+                stats.pop_gap()
+                self._recount(price, stats)
+            else:
+                del self.prices[price]
+                self.rare.discard(price)
+                self.frequent.discard(price)
+
+    def ordered(self, prices) -> List[int]:
+        """Urutkan harga sesuai kemunculan pertama di window"""
+        return sorted(prices, key=lambda p: self.prices[p].hits[0])
+
+
+class ManipulationDetector:
+    """Deteksi fake bid dan spoofing secara incremental per snapshot"""
+
+    def __init__(self, fake_window: int = FAKE_WINDOW, spoof_window: int = SPOOF_WINDOW,
+                 fake_min_lot: int = 500, fake_max_freq: int = 2,
+                 spoof_min_lot: int = 1000, min_order_value: int = 50000000,
+                 lot_size: int = 1):
+        self.fake_window = fake_window
+        self.spoof_window = spoof_window
+        self.fake_min_lot = fake_min_lot
+        self.fake_max_freq = fake_max_freq
+        self.spoof_min_lot = spoof_min_lot
+        self.min_order_value = min_order_value
+        self.lot_size = lot_size
+
+        self._fake = _PriceWindow(fake_window)
+        self._spoof = _PriceWindow(spoof_window)
+
+    @property
+    def seq(self) -> int:
+        """Jumlah snapshot yang sudah diproses"""
+        return self._fake.seq
+
+    def append(self, ob: OrderBook):
+        """Proses snapshot baru"""
+        self.append_levels([b.price for b in ob.bid],
+                           [b.lot for b in ob.bid],
+                           [b.freq for b in ob.bid])
+
+    def append_levels(self, prices: Sequence[int], lots: Sequence[int], freqs: Sequence[int]):
+        """Proses snapshot baru dari array level bid (price, lot, freq)"""
+        if isinstance(prices, np.ndarray):
+            prices, lots, freqs = prices.tolist(), lots.tolist(), freqs.tolist()
+
+        fake_candidates = []
+        spoof_candidates = []
+        for price, lot, freq in zip(prices, lots, freqs):
+            if lot >= self.fake_min_lot and freq <= self.fake_max_freq:
+                fake_candidates.append(price)
+            if lot >= self.spoof_min_lot and lot * self.lot_size * price >= self.min_order_value:
+                spoof_candidates.append(price)
+
+        self._fake.push(fake_candidates)
+        self._spoof.push(spoof_candidates)
+
+    def fake_bid(self) -> Dict:
+        """Hasil detect_fake_bid untuk window saat ini"""
+        fake_prices = self._fake.ordered(self._fake.rare)
+        return {
+            "detected": len(fake_prices) > 0,
+            "fake_prices": fake_prices,
+            "count": len(fake_prices)
+        }
+
+    def spoofing(self) -> Dict:
+        """Hasil detect_spoofing untuk window saat ini"""
+        window = self._spoof
+        spoofing_patterns = []
+
+        for price in window.ordered(window.frequent):
+            stats = window.prices[price]
+            # Jika jarak muncul-hilang konsisten, kemungkinan spoofing
+            if stats.gap_max[0][1] - stats.gap_min[0][1] <= 2:
+                spoofing_patterns.append({
+                    "price": price,
+                    "appearances": [seq - window.start for seq, _ in stats.hits],
+                    "pattern": "regular_cancellation"
+                })
+
+        return {
+            "detected": len(spoofing_patterns) > 0,
+            "patterns": spoofing_patterns,
+            "count": len(spoofing_patterns)
+        }
@@ -1,14 +1,15 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import time
 import random
-from typing import Dict, List, Tuple, Optional
-import matplotlib.pyplot as plt
+from typing import Dict
 from collections import defaultdict
 import warnings
 warnings.filterwarnings('ignore')
 
+from models import RecordTable, DummyOrderBook
+from metrics import timed
+
+ORDER_LEVEL_DTYPE = np.dtype([('price', 'i8'), ('volume', 'i8'), ('type', 'U3')])
+
 
 class OrderBookAnalyzer:
     """Analisis Order Book dengan deteksi fake bid/ask"""
@@ -16,38 +17,61 @@ class OrderBookAnalyzer:
     def __init__(self):
         self.order_history = defaultdict(list)
         
-    def generate_order_book(self, symbol: str) -> pd.DataFrame:
+    def generate_order_book(self, symbol: str) -> DummyOrderBook:
         """Generate dummy order book data"""
-        bids = []
-        asks = []
+        bids = np.zeros(10, dtype=ORDER_LEVEL_DTYPE)
+        asks = np.zeros(10, dtype=ORDER_LEVEL_DTYPE)
         
         # Generate bid side
         current_price = random.randint(1000, 2000)
         for i in range(10):
             price = current_price - i * 5
             volume = random.randint(100, 1000)
-            bids.append({
-                'price': price,
-                'volume': volume,
-                'type': 'BID'
-            })
+            bids[i] = (price, volume, 'BID')
         
         # Generate ask side
         for i in range(10):
             price = current_price + i * 5
             volume = random.randint(100, 1000)
-            asks.append({
-                'price': price,
-                'volume': volume,
-                'type': 'ASK'
-            })
-        
-        df_bids = pd.DataFrame(bids)
-        df_asks = pd.DataFrame(asks)
+            asks[i] = (price, volume, 'ASK')
         
-        return pd.concat([df_bids, df_asks], ignore_index=True)
+        return DummyOrderBook(
+            bid=RecordTable(bids),
+            ask=RecordTable(asks, np.arange(len(bids), len(bids) + len(asks)))
+        )
+    
+    def live_order_book(self, live) -> DummyOrderBook:
+        """Snapshot terakhir OrderBookAnalyzer live dalam format DummyOrderBook (volume = lot)"""
+        store = live.history
+        slot = store.latest_slot()
+        sides = []
+        for side, kind, start in (("bid", "BID", 0), ("ask", "ASK", store.bid_count[slot])):
+            price, lot, _ = store.side(slot, side)
+            levels = np.zeros(len(price), dtype=ORDER_LEVEL_DTYPE)
+            levels['price'] = price
+            levels['volume'] = lot
+            levels['type'] = kind
+            sides.append(RecordTable(levels, np.arange(start, start + len(levels))))
+        return DummyOrderBook(bid=sides[0], ask=sides[1])
+    
+    def detect_live_fake_orders(self, live) -> Dict:
+        """Format detect_fake_orders dari detector OrderBookAnalyzer live (fake bid + spoofing)"""
+        fake_bid = live.detect_fake_bid()
+        spoofing = live.detect_spoofing()
+        fake_signals = {
+            'fake_bid': bool(fake_bid['detected']),
+            'fake_ask': False,
+            'suspicious_level': int(fake_bid['detected']) + int(spoofing['detected']),
+            'details': []
+        }
+        if fake_bid['detected']:
+            fake_signals['details'].append(f"Fake bid at {fake_bid['fake_prices']}")
+        if spoofing['detected']:
+            fake_signals['details'].append(f"Spoofing pattern: {spoofing['count']} price level(s)")
+        return fake_signals
     
-    def detect_fake_orders(self, order_book: pd.DataFrame, history_depth: int = 5) -> Dict:
+    @timed()
+    def detect_fake_orders(self, order_book: DummyOrderBook, history_depth: int = 5) -> Dict:
         """Deteksi fake bid/ask berdasarkan perubahan tiba-tiba"""
         fake_signals = {
             'fake_bid': False,
@@ -57,8 +81,8 @@ class OrderBookAnalyzer:
         }
         
         # Simulasi deteksi fake orders
-        bid_volumes = order_book[order_book['type'] == 'BID']['volume'].values
-        ask_volumes = order_book[order_book['type'] == 'ASK']['volume'].values
+        bid_volumes = order_book.bid['volume']
+        ask_volumes = order_book.ask['volume']
         
         # Deteksi jika ada bid besar yang tiba-tiba hilang
         if len(bid_volumes) > 0:
@@ -82,10 +106,10 @@ class OrderBookAnalyzer:
         
         return fake_signals
     
-    def calculate_order_book_imbalance(self, order_book: pd.DataFrame) -> float:
+    def calculate_order_book_imbalance(self, order_book: DummyOrderBook) -> float:
         """Hitung ketidakseimbangan order book"""
-        total_bid = order_book[order_book['type'] == 'BID']['volume'].sum()
-        total_ask = order_book[order_book['type'] == 'ASK']['volume'].sum()
+        total_bid = order_book.bid['volume'].sum()
+        total_ask = order_book.ask['volume'].sum()
         
         if total_bid + total_ask == 0:
             return 0
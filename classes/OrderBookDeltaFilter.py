@@ -0,0 +1,80 @@
+import hashlib
+from typing import Dict, Optional
+
+import numpy as np
+
+from models import OrderBookArrays
+
+
+class OrderBookDeltaFilter:
+    """Lewati snapshot yang tidak berubah dan laporkan level mana saja yang berubah"""
+
+    def __init__(self):
+        self._raw_digest: Dict[str, bytes] = {}
+        self._fingerprint: Dict[str, bytes] = {}
+        self._last: Dict[str, OrderBookArrays] = {}
+        self.processed = 0
+        self.skipped = 0
+
+    @staticmethod
+    def fingerprint(snapshot: OrderBookArrays) -> bytes:
+        """Hash level bid/ask, last price dan volume (timestamp diabaikan)"""
+        digest = hashlib.blake2b(digest_size=16)
+        for arr in (snapshot.bid_price, snapshot.bid_lot, snapshot.bid_freq,
+                    snapshot.ask_price, snapshot.ask_lot, snapshot.ask_freq):
+            digest.update(np.ascontiguousarray(arr, dtype=np.int64).tobytes())
+            digest.update(b"|")
+        digest.update(f"{snapshot.last_price}:{snapshot.volume}".encode())
+        return digest.digest()
+
+    def unchanged_raw(self, symbol: str, raw: bytes) -> bool:
+        """Cek cepat sebelum decode: response byte-for-byte sama dengan sebelumnya"""
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        if self._raw_digest.get(symbol) == digest:
+            self.skipped += 1
+            return True
+        self._raw_digest[symbol] = digest
+        return False
+
+    def diff(self, symbol: str, snapshot: OrderBookArrays) -> Optional[Dict]:
+        """None jika snapshot sama dengan sebelumnya, selain itu harga level yang berubah per side"""
+        fingerprint = self.fingerprint(snapshot)
+        if self._fingerprint.get(symbol) == fingerprint:
+            self.skipped += 1
+            return None
+
+        previous = self._last.get(symbol)
+        self._fingerprint[symbol] = fingerprint
+        self._last[symbol] = snapshot
+        self.processed += 1
+
+        if previous is None:
+            return {
+                "bid": snapshot.bid_price.tolist(),
+                "ask": snapshot.ask_price.tolist(),
+                "last_price": True,
+                "volume": True
+            }
+
+        return {
+            "bid": self._changed_prices(previous.bid_price, previous.bid_lot, previous.bid_freq,
+                                        snapshot.bid_price, snapshot.bid_lot, snapshot.bid_freq),
+            "ask": self._changed_prices(previous.ask_price, previous.ask_lot, previous.ask_freq,
+                                        snapshot.ask_price, snapshot.ask_lot, snapshot.ask_freq),
+            "last_price": previous.last_price != snapshot.last_price,
+            "volume": previous.volume != snapshot.volume
+        }
+
+    @staticmethod
+    def _changed_prices(old_price, old_lot, old_freq, new_price, new_lot, new_freq) -> list:
+        """Harga yang level-nya muncul, hilang, atau berubah lot/freq"""
+        old_levels = set(zip(old_price.tolist(), old_lot.tolist(), old_freq.tolist()))
+        new_levels = set(zip(new_price.tolist(), new_lot.tolist(), new_freq.tolist()))
+        return sorted({level[0] for level in old_levels ^ new_levels})
+
+    def reset_cycle(self) -> Dict:
+        """Ambil counter siklus ini lalu reset"""
+        stats = {"processed": self.processed, "skipped": self.skipped}
+        self.processed = 0
+        self.skipped = 0
+        return stats
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from apis.stockbit import StockbitClient
+
+
+class RateLimiter:
+    """
+    Token bucket async: rata-rata `rate` request per detik, burst maksimal `burst`.
+    Sisa token bertahan lintas event loop; hanya lock-nya yang dibuat per loop.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # asyncio.Lock terikat ke satu loop, sedangkan run() membuat loop baru tiap siklus
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class OrderBookFetcher:
+    """Ambil order book banyak saham secara concurrent dengan batas concurrency dan rate per host"""
+
+    def __init__(self, client: Optional[StockbitClient] = None, max_concurrency: int = 10,
+                 rate_per_host: float = 5.0, burst: Optional[int] = None, raw: bool = False):
+        self.client = client or StockbitClient(pool_size=max_concurrency)
+        self.raw = raw  # True: data berupa bytes untuk decoder fast path
+        self.max_concurrency = max_concurrency
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self._host = urlparse(self.client.base_url).netloc
+        self._limiters: Dict[str, RateLimiter] = {self._host: RateLimiter(rate_per_host, burst)}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def limiter_for(self, host: str) -> RateLimiter:
+        if host not in self._limiters:
+            self._limiters[host] = RateLimiter(self.rate_per_host, self.burst)
+        return self._limiters[host]
+
+    async def fetch(self, symbol: str, semaphore: asyncio.Semaphore) -> Dict:
+        """Ambil satu order book; error dikembalikan, tidak di-raise"""
+        async with semaphore:
+            await self.limiter_for(self._host).acquire()
+            loop = asyncio.get_running_loop()
+            started = time.monotonic()
+            get = self.client.get_orderbook_companies_raw if self.raw else self.client.get_orderbook_companies
+            try:
+                data = await loop.run_in_executor(self._executor, get, symbol)
+                error = None
+            except Exception as e:
+                data, error = None, e
+        return {
+            "symbol": symbol,
+            "data": data,
+            "error": error,
+            "latency": time.monotonic() - started
+        }
+
+    async def fetch_all(self, symbols: List[str],
+                        on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Ambil semua symbol; on_result dipanggil begitu tiap hasil tiba"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.create_task(self.fetch(symbol, semaphore)) for symbol in symbols]
+
+        results = []
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            if on_result is not None:
+                on_result(result)
+            results.append(result)
+        return results
+
+    def run(self, symbols: List[str], on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Versi sinkron dari fetch_all"""
+        return asyncio.run(self.fetch_all(symbols, on_result))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.client.close()
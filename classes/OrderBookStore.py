@@ -0,0 +1,221 @@
+import time
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models import OrderBook, OrderBookArrays, Order
+
+
+LEVEL_COLUMNS = ("bid_price", "bid_lot", "bid_freq", "ask_price", "ask_lot", "ask_freq")
+SNAPSHOT_COLUMNS = (("bid_count", np.int32), ("ask_count", np.int32), ("timestamp", np.float64),
+                    ("last_price", np.int64), ("volume", np.int64),
+                    ("bid_lot_total", np.int64), ("ask_lot_total", np.int64),
+                    ("bid_value_total", np.int64), ("ask_value_total", np.int64))
+
+# Baris awal yang dialokasikan; digandakan sampai capacity saat history bertambah
+INITIAL_ROWS = 64
+
+
+class OrderBookStore:
+    """Ring buffer kolumnar untuk history order book (ukuran memori tetap)"""
+
+    def __init__(self, capacity: int = 5000, depth: int = 20, grow_depth: bool = True):
+        """
+        capacity: jumlah snapshot maksimum (memori dialokasikan bertahap sampai batas ini).
+        depth: jumlah level awal per side; snapshot yang lebih lebar memperbesar depth
+        (grow_depth=True) atau ditolak dengan ValueError, tidak pernah dipotong diam-diam.
+        """
+        if capacity <= 0 or depth <= 0:
+            raise ValueError("capacity dan depth harus lebih dari 0")
+
+        self.capacity = capacity
+        self.depth = 0
+        self.grow_depth = grow_depth
+        self._rows = 0   # baris yang sudah dialokasikan (<= capacity)
+        self._allocate(min(capacity, INITIAL_ROWS), depth)
+
+        self._head = 0   # slot berikutnya yang akan ditulis
+        self._size = 0
+        self.seq = 0     # jumlah snapshot yang pernah di-append
+
+    def _allocate(self, rows: int, depth: int):
+        """
+        Alokasi ulang kolom ke (rows, depth), isi lama disalin ke posisi slot yang sama.
+        Baris hanya ditambah sebelum ring buffer pernah berputar, jadi slot tetap valid.
+        """
+        old_rows, old_depth = self._rows, self.depth
+
+        # Level per side: (snapshot, level)
+        for name in LEVEL_COLUMNS:
+            column = np.zeros((rows, depth), dtype=np.int64)
+            if old_rows:
+                column[:old_rows, :old_depth] = getattr(self, name)
+            setattr(self, name, column)
+
+        # Kolom per snapshot; total per side dihitung sekali saat append (nilai = lot * price)
+        for name, dtype in SNAPSHOT_COLUMNS:
+            column = np.zeros(rows, dtype=dtype)
+            if old_rows:
+                column[:old_rows] = getattr(self, name)
+            setattr(self, name, column)
+
+        self._rows = rows
+        self.depth = depth
+
+    @classmethod
+    def from_list(cls, history: List[OrderBook], capacity: Optional[int] = None,
+                  depth: Optional[int] = None) -> "OrderBookStore":
+        """Bangun store dari list OrderBook"""
+        if depth is None:
+            depth = max([max(len(ob.bid), len(ob.ask)) for ob in history] + [20])
+        if capacity is None:
+            capacity = max(len(history), 5000)
+
+        store = cls(capacity=capacity, depth=depth)
+        for ob in history:
+            store.append(ob)
+        return store
+
+    @staticmethod
+    def record_dtype(depth: int) -> np.dtype:
+        """Layout satu snapshot sebagai record fixed-width (dipakai juga untuk arsip di disk)"""
+        return np.dtype([(name, np.int64, (depth,)) for name in LEVEL_COLUMNS]
+                        + [(name, dtype) for name, dtype in SNAPSHOT_COLUMNS])
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "OrderBookStore":
+        """Bungkus array record (mis. slice memmap) tanpa copy; read-only jika sumbernya read-only"""
+        store = cls.__new__(cls)
+        store.capacity = len(records)
+        store._rows = len(records)
+        store.depth = records.dtype["bid_price"].shape[0]
+        store.grow_depth = False
+        for name in LEVEL_COLUMNS + tuple(name for name, _ in SNAPSHOT_COLUMNS):
+            setattr(store, name, records[name])
+        store._head = 0
+        store._size = len(records)
+        store.seq = len(records)
+        return store
+
+    def to_records(self, lookback: Optional[int] = None, depth: Optional[int] = None) -> np.ndarray:
+        """Salin n snapshot terakhir ke array record, urut dari yang terlama (opsional dipad ke `depth`)"""
+        depth = self.depth if depth is None else depth
+        if depth < self.depth:
+            raise ValueError(f"depth {depth} lebih kecil dari depth store {self.depth}")
+        slots = self.slots(lookback)
+        records = np.zeros(len(slots), dtype=self.record_dtype(depth))
+        for name in LEVEL_COLUMNS:
+            records[name][:, :self.depth] = getattr(self, name)[slots]
+        for name, _ in SNAPSHOT_COLUMNS:
+            records[name] = getattr(self, name)[slots]
+        return records
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _slot(self, index: int) -> int:
+        """Konversi index kronologis (boleh negatif) ke slot ring buffer"""
+        if index < 0:
+            index += self._size
+        if index < 0 or index >= self._size:
+            raise IndexError("OrderBookStore index out of range")
+        return (self._head - self._size + index) % self._rows
+
+    def slots(self, lookback: Optional[int] = None) -> np.ndarray:
+        """Slot untuk n snapshot terakhir, urut dari yang terlama"""
+        n = self._size if lookback is None else max(0, min(lookback, self._size))
+        return (self._head - n + np.arange(n)) % self._rows
+
+    def append(self, ob: Union[OrderBook, OrderBookArrays], timestamp: Optional[float] = None) -> int:
+        """Simpan snapshot (depth/baris bertambah bila perlu). Return slot yang ditulis"""
+        if not self.bid_price.flags.writeable:
+            raise ValueError("OrderBookStore read-only, tidak bisa append")
+
+        if isinstance(ob, OrderBookArrays):
+            bid = (ob.bid_price, ob.bid_lot, ob.bid_freq)
+            ask = (ob.ask_price, ob.ask_lot, ob.ask_freq)
+        else:
+            bid = self._levels(ob.bid)
+            ask = self._levels(ob.ask)
+
+        width = max(len(bid[0]), len(ask[0]))
+        if width > self.depth:
+            if not self.grow_depth:
+                raise ValueError(f"Snapshot {width} level melebihi depth store {self.depth}")
+            self._allocate(self._rows, width)
+        if self._size == self._rows and self._rows < self.capacity:
+            # Belum pernah berputar: isi ada di slot [0, size), lanjut tulis di slot size
+            self._allocate(min(self.capacity, self._rows * 2), self.depth)
+            self._head = self._size
+        slot = self._head
+
+        if timestamp is None:
+            timestamp = getattr(ob, "timestamp", None)
+        self.timestamp[slot] = time.time() if timestamp is None else timestamp
+        self.last_price[slot] = ob.last_price
+        self.volume[slot] = ob.volume
+
+        self.bid_count[slot] = self._write_side(
+            bid, self.bid_price[slot], self.bid_lot[slot], self.bid_freq[slot])
+        self.ask_count[slot] = self._write_side(
+            ask, self.ask_price[slot], self.ask_lot[slot], self.ask_freq[slot])
+
+        self.bid_lot_total[slot] = self.bid_lot[slot].sum()
+        self.ask_lot_total[slot] = self.ask_lot[slot].sum()
+        self.bid_value_total[slot] = np.dot(self.bid_lot[slot], self.bid_price[slot])
+        self.ask_value_total[slot] = np.dot(self.ask_lot[slot], self.ask_price[slot])
+
+        self._head = (self._head + 1) % self._rows
+        self._size = min(self._size + 1, self.capacity)
+        self.seq += 1
+        return slot
+
+    def _levels(self, orders: List[Order]) -> Tuple[List[int], List[int], List[int]]:
+        return [o.price for o in orders], [o.lot for o in orders], [o.freq for o in orders]
+
+    def _write_side(self, levels: Tuple, price: np.ndarray, lot: np.ndarray, freq: np.ndarray) -> int:
+        prices, lots, freqs = levels
+        n = len(prices)
+        price[:] = 0
+        lot[:] = 0
+        freq[:] = 0
+        if n:
+            price[:n] = prices[:n]
+            lot[:n] = lots[:n]
+            freq[:n] = freqs[:n]
+        return n
+
+    def side(self, slot: int, side: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Array (price, lot, freq) satu side untuk slot tertentu, tanpa padding"""
+        if side == "bid":
+            n = self.bid_count[slot]
+            return self.bid_price[slot, :n], self.bid_lot[slot, :n], self.bid_freq[slot, :n]
+        n = self.ask_count[slot]
+        return self.ask_price[slot, :n], self.ask_lot[slot, :n], self.ask_freq[slot, :n]
+
+    def to_orderbook(self, slot: int) -> OrderBook:
+        """Bangun objek OrderBook dari slot (hanya saat dibutuhkan)"""
+        bid = [Order(price=int(p), freq=int(f), lot=int(l))
+               for p, l, f in zip(*self.side(slot, "bid"))]
+        ask = [Order(price=int(p), freq=int(f), lot=int(l))
+               for p, l, f in zip(*self.side(slot, "ask"))]
+        return OrderBook(bid=bid, ask=ask,
+                         last_price=int(self.last_price[slot]),
+                         volume=int(self.volume[slot]),
+                         timestamp=float(self.timestamp[slot]))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[OrderBook, List[OrderBook]]:
+        if isinstance(index, slice):
+            return [self.to_orderbook(self._slot(i)) for i in range(*index.indices(self._size))]
+        return self.to_orderbook(self._slot(index))
+
+    def __iter__(self) -> Iterator[OrderBook]:
+        for slot in self.slots():
+            yield self.to_orderbook(int(slot))
+
+    def latest_slot(self) -> int:
+        return self._slot(-1)
+
+    def memory_bytes(self) -> int:
+        """Total memori array yang dialokasikan"""
+        return sum(v.nbytes for v in vars(self).values() if isinstance(v, np.ndarray))
@@ -0,0 +1,206 @@
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models import OrderBook, OrderBookArrays
+
+BID, ASK = 0, 1
+
+# Jenis event per level; MODIFIED = lot tetap, hanya freq berubah
+ADDED, INCREASED, DECREASED, REMOVED, MODIFIED = 0, 1, 2, 3, 4
+EVENT_KINDS = ('ADDED', 'INCREASED', 'DECREASED', 'REMOVED', 'MODIFIED')
+
+EVENT_DTYPE = np.dtype([
+    ('seq', 'i8'),
+    ('timestamp', 'f8'),
+    ('side', 'i1'),
+    ('kind', 'i1'),
+    ('price', 'i8'),
+    ('lot', 'i8'),          # lot setelah event (0 untuk REMOVED)
+    ('lot_delta', 'i8'),
+    ('freq', 'i8'),
+    ('freq_delta', 'i8'),
+])
+
+_EMPTY_SIDE = (np.zeros(0, dtype=np.int64),) * 3
+
+
+def _sorted_side(prices: np.ndarray, lots: np.ndarray, freqs: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Side terurut harga naik (level dengan harga ganda digabung)"""
+    prices = np.asarray(prices, dtype=np.int64)
+    lots = np.asarray(lots, dtype=np.int64)
+    freqs = np.asarray(freqs, dtype=np.int64)
+    if len(prices) > 1 and not np.all(np.diff(prices) > 0):
+        unique, inverse = np.unique(prices, return_inverse=True)
+        return (unique,
+                np.bincount(inverse, weights=lots, minlength=len(unique)).astype(np.int64),
+                np.bincount(inverse, weights=freqs, minlength=len(unique)).astype(np.int64))
+    return prices.copy(), lots.copy(), freqs.copy()
+
+
+def diff_side(previous: Tuple[np.ndarray, ...], current: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+    """
+    Sorted merge dua side (harga naik): (kind, price, lot, lot_delta, freq, freq_delta)
+    untuk level yang berubah, urut harga.
+    """
+    p0, l0, f0 = previous
+    p1, l1, f1 = current
+
+    common, i0, i1 = np.intersect1d(p0, p1, assume_unique=True, return_indices=True)
+    added = np.ones(len(p1), dtype=bool)
+    added[i1] = False
+    removed = np.ones(len(p0), dtype=bool)
+    removed[i0] = False
+
+    lot_delta = l1[i1] - l0[i0]
+    freq_delta = f1[i1] - f0[i0]
+    moved = (lot_delta != 0) | (freq_delta != 0)
+    i0, i1, lot_delta, freq_delta = i0[moved], i1[moved], lot_delta[moved], freq_delta[moved]
+
+    kind = np.concatenate([
+        np.full(int(added.sum()), ADDED),
+        np.select([lot_delta > 0, lot_delta < 0], [INCREASED, DECREASED], MODIFIED),
+        np.full(int(removed.sum()), REMOVED),
+    ]).astype(np.int8)
+    price = np.concatenate([p1[added], p1[i1], p0[removed]])
+    lot = np.concatenate([l1[added], l1[i1], np.zeros(int(removed.sum()), dtype=np.int64)])
+    lot_change = np.concatenate([l1[added], lot_delta, -l0[removed]])
+    freq = np.concatenate([f1[added], f1[i1], np.zeros(int(removed.sum()), dtype=np.int64)])
+    freq_change = np.concatenate([f1[added], freq_delta, -f0[removed]])
+
+    order = np.argsort(price, kind='stable')
+    return kind[order], price[order], lot[order], lot_change[order], freq[order], freq_change[order]
+
+
+class OrderFlowEngine:
+    """
+    Diff snapshot berurutan level per level menjadi stream event bertipe
+    (EVENT_DTYPE). Dihitung sekali per tick lalu dibagikan ke subscriber.
+    """
+
+    def __init__(self, keep: int = 1000):
+        self.seq = 0
+        self.last_price = 0
+        self._sides = [_EMPTY_SIDE, _EMPTY_SIDE]
+        self._subscribers: List[Tuple[Callable, Optional[int], Optional[Tuple[int, ...]]]] = []
+        self.recent = deque(maxlen=keep)  # array event per tick
+        self.last_events = np.zeros(0, dtype=EVENT_DTYPE)
+
+    def subscribe(self, callback: Callable[[np.ndarray], None], side: Optional[int] = None,
+                  kinds: Optional[Tuple[int, ...]] = None):
+        """callback(events) tiap tick yang punya event (opsional disaring side/jenis)"""
+        self._subscribers.append((callback, side, tuple(kinds) if kinds is not None else None))
+
+    def unsubscribe(self, callback: Callable):
+        self._subscribers = [s for s in self._subscribers if s[0] is not callback]
+
+    def reset(self, bid: Tuple[np.ndarray, ...], ask: Tuple[np.ndarray, ...], last_price: int = 0):
+        """Jadikan snapshot ini baseline tanpa menerbitkan event"""
+        self._sides = [_sorted_side(*bid), _sorted_side(*ask)]
+        self.last_price = int(last_price)
+
+    def push_levels(self, bid: Tuple[np.ndarray, ...], ask: Tuple[np.ndarray, ...],
+                    timestamp: float = 0.0, last_price: int = 0) -> np.ndarray:
+        """Proses satu snapshot (array price, lot, freq per side); return event tick ini"""
+        self.seq += 1
+        self.last_price = int(last_price)
+        parts = []
+        for side, levels in ((BID, bid), (ASK, ask)):
+            current = _sorted_side(*levels)
+            kind, price, lot, lot_delta, freq, freq_delta = diff_side(self._sides[side], current)
+            self._sides[side] = current
+            if len(kind):
+                events = np.zeros(len(kind), dtype=EVENT_DTYPE)
+                events['seq'] = self.seq
+                events['timestamp'] = timestamp
+                events['side'] = side
+                events['kind'] = kind
+                events['price'] = price
+                events['lot'] = lot
+                events['lot_delta'] = lot_delta
+                events['freq'] = freq
+                events['freq_delta'] = freq_delta
+                parts.append(events)
+
+        events = np.concatenate(parts) if parts else np.zeros(0, dtype=EVENT_DTYPE)
+        self.last_events = events
+        self.recent.append(events)
+        self._publish(events)
+        return events
+
+    def push(self, ob: Union[OrderBook, OrderBookArrays], timestamp: Optional[float] = None) -> np.ndarray:
+        if isinstance(ob, OrderBookArrays):
+            bid = (ob.bid_price, ob.bid_lot, ob.bid_freq)
+            ask = (ob.ask_price, ob.ask_lot, ob.ask_freq)
+        else:
+            bid = tuple(np.array([[o.price, o.lot, o.freq] for o in ob.bid], dtype=np.int64).reshape(-1, 3).T)
+            ask = tuple(np.array([[o.price, o.lot, o.freq] for o in ob.ask], dtype=np.int64).reshape(-1, 3).T)
+        if timestamp is None:
+            timestamp = ob.timestamp or 0.0
+        return self.push_levels(bid, ask, timestamp, ob.last_price)
+
+    def _publish(self, events: np.ndarray):
+        if not len(events):
+            return
+        for callback, side, kinds in self._subscribers:
+            selected = events
+            if side is not None:
+                selected = selected[selected['side'] == side]
+            if kinds is not None:
+                selected = selected[np.isin(selected['kind'], kinds)]
+            if len(selected):
+                callback(selected)
+
+    def window(self, ticks: int) -> np.ndarray:
+        """Event dari `ticks` tick terakhir"""
+        parts = list(self.recent)[-ticks:]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=EVENT_DTYPE)
+
+
+class CancellationMonitor:
+    """
+    Subscriber: lot bid/ask yang ditarik dalam `window` tick terakhir.
+    Penurunan di harga last price dianggap match (bukan cancel); selebihnya
+    (DECREASED/REMOVED di luar harga transaksi) dihitung sebagai cancel.
+    """
+
+    def __init__(self, engine: OrderFlowEngine, window: int = 15, min_order_value: int = 50000000,
+                 lot_size: int = 1):
+        self.window = window
+        self.min_order_value = min_order_value
+        self.lot_size = lot_size
+        self.engine = engine
+        self._ticks = deque()    # (seq, cancelled bid lot, cancelled ask lot, jumlah cancel besar)
+        self.cancelled = [0, 0]
+        self.large_cancels = 0
+        engine.subscribe(self.on_events, kinds=(DECREASED, REMOVED))
+
+    def on_events(self, events: np.ndarray):
+        cancels = events[events['price'] != self.engine.last_price]
+        lots = -cancels['lot_delta']
+        bid = int(lots[cancels['side'] == BID].sum())
+        ask = int(lots[cancels['side'] == ASK].sum())
+        large = int(np.count_nonzero(lots * self.lot_size * cancels['price'] >= self.min_order_value))
+
+        seq = int(events['seq'][0])
+        self._ticks.append((seq, bid, ask, large))
+        self.cancelled[BID] += bid
+        self.cancelled[ASK] += ask
+        self.large_cancels += large
+        self._expire(seq)
+
+    def _expire(self, seq: int):
+        while self._ticks and self._ticks[0][0] <= seq - self.window:
+            _, old_bid, old_ask, old_large = self._ticks.popleft()
+            self.cancelled[BID] -= old_bid
+            self.cancelled[ASK] -= old_ask
+            self.large_cancels -= old_large
+
+    def summary(self) -> Dict:
+        self._expire(self.engine.seq)
+        return {
+            "cancelled_bid_lot": self.cancelled[BID],
+            "cancelled_ask_lot": self.cancelled[ASK],
+            "large_cancels": self.large_cancels
+        }
@@ -0,0 +1,98 @@
+import heapq
+import time
+from typing import Dict, List, Optional
+
+
+class PollScheduler:
+    """Jadwal polling per symbol dengan interval adaptif dan budget request global"""
+
+    def __init__(self, symbols: List[str], base_interval: float = 60.0,
+                 min_interval: float = 5.0, max_interval: float = 600.0,
+                 requests_per_second: float = 5.0, hot_volume: int = 500_000,
+                 imbalance_change: float = 0.1):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.requests_per_second = requests_per_second
+        self.hot_volume = hot_volume
+        self.imbalance_change = imbalance_change
+
+        self.intervals: Dict[str, float] = {}
+        self.last_imbalance: Dict[str, float] = {}
+        self._queue = []
+        self._seq = 0
+
+        # Token bucket untuk budget request global
+        self._tokens = max(1.0, requests_per_second)
+        self._updated = time.monotonic()
+
+        now = time.monotonic()
+        for symbol in symbols:
+            self.add(symbol, now)
+
+    def add(self, symbol: str, due: Optional[float] = None):
+        """Daftarkan symbol, default langsung jatuh tempo"""
+        self.intervals.setdefault(symbol, self.base_interval)
+        self._push(symbol, time.monotonic() if due is None else due)
+
+    def _push(self, symbol: str, due: float):
+        heapq.heappush(self._queue, (due, self._seq, symbol))
+        self._seq += 1
+
+    def _refill(self, now: float):
+        capacity = max(1.0, self.requests_per_second)
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self.requests_per_second)
+        self._updated = now
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Symbol yang sudah jatuh tempo, dibatasi sisa budget request"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+
+        symbols = []
+        while self._queue and self._queue[0][0] <= now and self._tokens >= 1:
+            _, _, symbol = heapq.heappop(self._queue)
+            self._tokens -= 1
+            symbols.append(symbol)
+        return symbols
+
+    def next_wakeup(self, now: Optional[float] = None) -> float:
+        """Detik sampai ada symbol yang bisa dipoll lagi"""
+        if not self._queue:
+            return self.base_interval
+
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        wait_due = self._queue[0][0] - now
+        wait_budget = (1 - self._tokens) / self.requests_per_second if self._tokens < 1 else 0.0
+        return max(0.0, wait_due, wait_budget)
+
+    def is_hot(self, symbol: str, volume: int = 0, manipulation: bool = False,
+               imbalance: Optional[float] = None) -> bool:
+        """Symbol dianggap aktif jika volume besar, ada manipulasi, atau imbalance berubah tajam"""
+        hot = manipulation or volume >= self.hot_volume
+        if imbalance is not None:
+            previous = self.last_imbalance.get(symbol)
+            if previous is not None and abs(imbalance - previous) >= self.imbalance_change:
+                hot = True
+            self.last_imbalance[symbol] = imbalance
+        return hot
+
+    def report(self, symbol: str, volume: int = 0, manipulation: bool = False,
+               imbalance: Optional[float] = None, now: Optional[float] = None) -> float:
+        """Update interval symbol setelah dipoll lalu jadwalkan ulang. Return interval baru"""
+        interval = self.intervals.get(symbol, self.base_interval)
+        if self.is_hot(symbol, volume, manipulation, imbalance):
+            interval = max(self.min_interval, interval / 2)
+        else:
+            interval = min(self.max_interval, interval * 1.5)
+        self.intervals[symbol] = interval
+
+        now = time.monotonic() if now is None else now
+        self._push(symbol, now + interval)
+        return interval
+
+    def reschedule(self, symbol: str, now: Optional[float] = None):
+        """Jadwalkan ulang tanpa mengubah interval (mis. setelah error)"""
+        now = time.monotonic() if now is None else now
+        self._push(symbol, now + self.intervals.get(symbol, self.base_interval))
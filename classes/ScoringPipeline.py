@@ -0,0 +1,218 @@
+"""
+Pipeline skor bullish: tiap komponen adalah stage terdaftar (fungsi nilai mentah
+dari OrderBookAnalyzer) dengan ambang dan poin dari config.
+
+Poin stage = points[np.digitize(nilai, bins, right=True)], jadi ambang berlaku
+"bins[i-1] < nilai <= bins[i]" dan bisa dihitung sekaligus untuk banyak symbol.
+Nilai NaN (atau stage yang tidak dihitung untuk suatu symbol) mendapat `default`.
+
+Config JSON (stage yang tidak disebut memakai DEFAULT_STAGES):
+    {"stages": {"spread": {"weight": 1.5, "bins": [0.4, 0.8, 1.2], "points": [15, 10, 5, 0]}}}
+
+Stage di luar DEFAULT_STAGES (mis. large_cancels dari OrderFlowEngine) hanya aktif
+jika disebut di config beserta bins/points-nya:
+    {"stages": {"large_cancels": {"bins": [0, 2], "points": [10, 5, 0]}}}
+"""
+import json
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import RecordTable
+
+
+@dataclass
+class Stage:
+    name: str
+    value: Callable               # value(analyzer) -> float
+    expensive: bool = False       # butuh detector manipulasi (window history)
+
+
+@dataclass
+class StageConfig:
+    bins: List[float]
+    points: List[float]
+    weight: float = 1.0
+    default: float = 0
+
+    def __post_init__(self):
+        if len(self.points) != len(self.bins) + 1:
+            raise ValueError("points harus berisi len(bins) + 1 nilai")
+        self._points = np.asarray(self.points) * self.weight
+        # Salinan list untuk jalur skalar (bisect jauh lebih murah dari np.digitize per nilai)
+        self._bins_list = [float(b) for b in self.bins]
+        self._points_list = self._points.tolist()
+        self._default = self.default * self.weight
+        self.max_points = float(max(self._points.max(), self._default))
+
+    def score_value(self, value: float) -> float:
+        """Poin satu nilai; bisect_left = digitize(right=True)"""
+        value = float(value)
+        if math.isnan(value):
+            return self._default
+        return self._points_list[bisect_left(self._bins_list, value)]
+
+    def score(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        points = self._points[np.digitize(values, self.bins, right=True)]
+        return np.where(np.isnan(values), self.default * self.weight, points)
+
+
+STAGES: Dict[str, Stage] = {}
+
+
+def register_stage(name: str, expensive: bool = False):
+    """Decorator untuk mendaftarkan fungsi nilai stage"""
+    def decorator(func: Callable) -> Callable:
+        STAGES[name] = Stage(name, func, expensive)
+        return func
+    return decorator
+
+
+@register_stage("bid_strength")
+def _bid_strength(analyzer) -> float:
+    return analyzer.bid_strength()
+
+
+@register_stage("bid_ask_ratio")
+def _bid_ask_ratio(analyzer) -> float:
+    return analyzer.bid_ask_ratio()
+
+
+@register_stage("spread")
+def _spread(analyzer) -> float:
+    return analyzer.spread_percentage()
+
+
+@register_stage("volume")
+def _volume(analyzer) -> float:
+    return int(analyzer.history.volume[analyzer.history.latest_slot()])
+
+
+@register_stage("imbalance")
+def _imbalance(analyzer) -> float:
+    return analyzer.calculate_imbalance()["lot_imbalance"]
+
+
+# Nilai 1 jika terdeteksi, 0 jika bersih
+@register_stage("no_fake_bid", expensive=True)
+def _fake_bid(analyzer) -> float:
+    return float(analyzer.detect_fake_bid()["detected"])
+
+
+@register_stage("no_spoofing", expensive=True)
+def _spoofing(analyzer) -> float:
+    return float(analyzer.detect_spoofing()["detected"])
+
+
+# Jumlah cancel besar (CancellationMonitor) dalam 15 tick terakhir; engine order flow
+# baru dibuat saat stage ini dipakai, snapshot saat itu menjadi baseline
+@register_stage("large_cancels", expensive=True)
+def _large_cancels(analyzer) -> float:
+    return analyzer.cancellations()["large_cancels"]
+
+
+# Ambang bawaan = ladder if/elif lama di OrderBookAnalyzer.bullish_score (total 100 poin)
+DEFAULT_STAGES = {
+    "bid_strength": {"bins": [0.5, 0.6, 0.7], "points": [0, 15, 20, 25]},
+    "bid_ask_ratio": {"bins": [1.0, 1.5, 2.0], "points": [0, 10, 15, 20]},
+    "spread": {"bins": [0.5, 1.0, 1.5], "points": [15, 10, 5, 0]},
+    "volume": {"bins": [100_000, 500_000], "points": [0, 5, 10]},
+    "imbalance": {"bins": [0.1, 0.2], "points": [0, 5, 10]},
+    "no_fake_bid": {"bins": [0.5], "points": [10, 0]},
+    "no_spoofing": {"bins": [0.5], "points": [10, 0]},
+}
+
+CHEAP_STAGES = tuple(name for name in DEFAULT_STAGES if not STAGES[name].expensive)
+
+
+def _plain_number(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class ScoringPipeline:
+    """Skor bullish dari stage terdaftar; hanya stage yang diminta yang dihitung"""
+
+    def __init__(self, stages: Optional[Dict[str, Dict]] = None):
+        merged = {name: dict(params) for name, params in DEFAULT_STAGES.items()}
+        for name, params in (stages or {}).items():
+            if name not in STAGES:
+                raise KeyError(f"Stage tidak dikenal: {name}")
+            merged.setdefault(name, {}).update(params)
+        self.config: Dict[str, StageConfig] = {name: StageConfig(**params) for name, params in merged.items()}
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScoringPipeline":
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        return cls(payload.get("stages", payload))
+
+    def _stages(self, stages: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        if stages is None:
+            return tuple(self.config)
+        unknown = [name for name in stages if name not in self.config]
+        if unknown:
+            raise KeyError(f"Stage tidak dikenal: {', '.join(unknown)}")
+        return tuple(stages)
+
+    def values(self, analyzer, stages: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        """Nilai mentah per stage untuk satu analyzer"""
+        return {name: STAGES[name].value(analyzer) for name in self._stages(stages)}
+
+    def score(self, analyzer, stages: Optional[Sequence[str]] = None) -> Dict:
+        """Format sama dengan OrderBookAnalyzer.bullish_score"""
+        stages = self._stages(stages)
+        values = self.values(analyzer, stages)
+        components = {name: _plain_number(self.config[name].score_value(values[name])) for name in stages}
+        score = _plain_number(sum(components.values()))
+        max_score = sum(self.config[name].max_points for name in stages)
+
+        result = {
+            "score": score,
+            "percentage": (score / max_score) * 100 if max_score else 0.0,
+            "components": components
+        }
+        if "no_fake_bid" in values:
+            result["fake_bid_detected"] = bool(values["no_fake_bid"])
+        if "no_spoofing" in values:
+            result["spoofing_detected"] = bool(values["no_spoofing"])
+        return result
+
+    def score_values(self, values: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Poin per stage untuk array nilai (satu elemen per symbol), plus 'score'"""
+        points = {name: self.config[name].score(column) for name, column in values.items()}
+        points["score"] = sum(points.values()) if points else np.zeros(0)
+        return points
+
+    def score_many(self, analyzers: Dict[str, object], stages: Optional[Sequence[str]] = None) -> RecordTable:
+        """
+        Skor banyak symbol sekaligus: nilai dikumpulkan per stage lalu di-digitize
+        sebagai array. Hasil urut skor tertinggi.
+        """
+        stages = self._stages(stages)
+        symbols = list(analyzers)
+        values = {name: np.full(len(symbols), np.nan) for name in stages}
+        for i, symbol in enumerate(symbols):
+            analyzer = analyzers[symbol]
+            if not len(analyzer.history):
+                continue
+            for name, value in self.values(analyzer, stages).items():
+                values[name][i] = value
+        points = self.score_values(values)
+
+        dtype = [('symbol', 'U16'), ('score', 'f8'), ('percentage', 'f8')] + [(name, 'f8') for name in stages]
+        records = np.zeros(len(symbols), dtype=dtype)
+        records['symbol'] = symbols
+        records['score'] = points['score']
+        max_score = sum(self.config[name].max_points for name in stages)
+        records['percentage'] = points['score'] / max_score * 100 if max_score else 0.0
+        for name in stages:
+            records[name] = points[name]
+        return RecordTable(records).sort_desc('score')
+
+
+DEFAULT_PIPELINE = ScoringPipeline()
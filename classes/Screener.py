@@ -0,0 +1,99 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models import OrderBookArrays, RecordTable
+from classes.ScoringPipeline import DEFAULT_PIPELINE, ScoringPipeline
+
+# Stage ScoringPipeline yang cukup murah untuk seluruh universe
+SCREEN_STAGES = ('imbalance', 'spread', 'volume')
+
+SCREEN_DTYPE = np.dtype([
+    ('symbol', 'U16'),
+    ('score', 'f8'),
+    ('imbalance', 'f8'),
+    ('spread', 'f8'),
+    ('volume', 'f8'),
+])
+
+
+def snapshot_metrics(snapshot: OrderBookArrays) -> Tuple[float, float, float]:
+    """(lot imbalance, spread %, volume) satu snapshot; NaN jika side kosong"""
+    bid_lot = int(snapshot.bid_lot.sum())
+    ask_lot = int(snapshot.ask_lot.sum())
+    total = bid_lot + ask_lot
+    imbalance = (bid_lot - ask_lot) / total if total > 0 else float('nan')
+
+    spread = float('nan')
+    if len(snapshot.bid_price) and len(snapshot.ask_price):
+        best_bid = int(snapshot.bid_price.max())
+        best_ask = int(snapshot.ask_price.min())
+        if best_bid > 0:
+            spread = (best_ask - best_bid) / best_bid * 100
+    return imbalance, spread, float(snapshot.volume)
+
+
+class Screener:
+    """
+    Prefilter murah untuk seluruh universe: imbalance dan spread % dari snapshot
+    order book terakhir, volume dari market mover/trending (fallback volume
+    snapshot). Skor memakai ambang stage yang sama dengan bullish_score, dihitung
+    sebagai array untuk semua symbol sekaligus.
+    """
+
+    def __init__(self, shortlist: int = 10, scoring: Optional[ScoringPipeline] = None):
+        self.shortlist = shortlist
+        self.scoring = scoring or DEFAULT_PIPELINE
+        self.book: Dict[str, Tuple[float, float, float]] = {}
+        self.market_volume: Dict[str, float] = {}
+        self.last_table: Optional[RecordTable] = None
+
+    def update_snapshot(self, symbol: str, snapshot: OrderBookArrays):
+        self.book[symbol] = snapshot_metrics(snapshot)
+
+    def update_market(self, volumes: Dict[str, float]):
+        """Volume per symbol hasil apis.market_parser.parse_market_volumes"""
+        self.market_volume.update(volumes)
+
+    def table(self, symbols: Iterable[str]) -> RecordTable:
+        """Metrik dan skor prefilter, urut sesuai `symbols`"""
+        symbols = list(symbols)
+        nan = (np.nan, np.nan, np.nan)
+        metrics = np.array([self.book.get(symbol, nan) for symbol in symbols],
+                           dtype=np.float64).reshape(-1, 3)
+        market = np.array([self.market_volume.get(symbol, np.nan) for symbol in symbols], dtype=np.float64)
+        volume = np.where(np.isnan(market), metrics[:, 2], market)
+
+        points = self.scoring.score_values({
+            'imbalance': metrics[:, 0],
+            'spread': metrics[:, 1],
+            'volume': volume
+        })
+        records = np.zeros(len(symbols), dtype=SCREEN_DTYPE)
+        records['symbol'] = symbols
+        records['score'] = points['score']
+        records['imbalance'] = metrics[:, 0]
+        records['spread'] = metrics[:, 1]
+        records['volume'] = volume
+        return RecordTable(records)
+
+    def select(self, symbols: Iterable[str], n: Optional[int] = None) -> List[str]:
+        """
+        Symbol dengan skor prefilter top-n, urut skor. Skor yang sama dengan skor
+        ke-n ikut semua (seri tidak diputus urutan input), dan symbol tanpa data
+        screening (tanpa order book maupun volume market) selalu diteruskan.
+        Universe yang tidak lebih besar dari n dikembalikan apa adanya.
+        """
+        symbols = list(symbols)
+        n = self.shortlist if n is None else n
+        if len(symbols) <= n:
+            return symbols
+        table = self.last_table = self.table(symbols)
+        scores = table['score']
+        unscreened = np.isnan(table['imbalance']) & np.isnan(table['spread']) & np.isnan(table['volume'])
+        screened = np.flatnonzero(~unscreened)
+        if len(screened) > n:
+            threshold = np.partition(scores[screened], len(screened) - n)[len(screened) - n]
+            screened = screened[scores[screened] >= threshold]
+        ranked = screened[np.argsort(-scores[screened], kind='stable')]
+        return [symbols[i] for i in ranked] + [symbols[i] for i in np.flatnonzero(unscreened)]
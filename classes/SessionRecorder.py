@@ -0,0 +1,181 @@
+"""
+Format file sesi (append-only, little endian):
+    MAGIC
+    record symbol : b'S' | id u4 | panjang nama u2 | nama utf-8
+    record book   : b'B' | timestamp f8 | symbol u4 | last_price i8 | volume i8
+                    | n_bid u2 | n_ask u2 | level int32[n_bid + n_ask][price, lot, freq]
+                    (level di luar rentang int32 ditolak saat record)
+File <path>.idx berisi INDEX_DTYPE per record book untuk query symbol/waktu.
+"""
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models import OrderBook, OrderBookArrays
+
+MAGIC = b'OBSESS01'
+SYMBOL_HEADER = struct.Struct('<IH')
+BOOK_HEADER = struct.Struct('<dIqqHH')
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('timestamp', '<f8'), ('symbol', '<u4')])
+LEVEL_INFO = np.iinfo(np.int32)
+
+
+def _levels(ob: Union[OrderBook, OrderBookArrays]) -> Tuple[np.ndarray, np.ndarray]:
+    if isinstance(ob, OrderBookArrays):
+        bid = np.stack([ob.bid_price, ob.bid_lot, ob.bid_freq], axis=1) if len(ob.bid_price) else None
+        ask = np.stack([ob.ask_price, ob.ask_lot, ob.ask_freq], axis=1) if len(ob.ask_price) else None
+    else:
+        bid = np.array([(o.price, o.lot, o.freq) for o in ob.bid]) if ob.bid else None
+        ask = np.array([(o.price, o.lot, o.freq) for o in ob.ask]) if ob.ask else None
+    empty = np.zeros((0, 3), dtype='<i4')
+    return empty if bid is None else _int32(bid), empty if ask is None else _int32(ask)
+
+
+def _int32(levels: np.ndarray) -> np.ndarray:
+    """Level ke int32 file; nilai di luar rentang ditolak, bukan wrap diam-diam"""
+    if levels.min() < LEVEL_INFO.min or levels.max() > LEVEL_INFO.max:
+        raise ValueError(f"Nilai level di luar rentang int32 format sesi: "
+                         f"[{levels.min()}, {levels.max()}]")
+    return levels.astype('<i4')
+
+
+class SessionRecorder:
+    """Rekam snapshot order book ke file biner append-only, satu file per sesi"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._symbols: Dict[str, int] = {}
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            # Lanjutkan sesi yang sudah ada
+            reader = SessionReader(path)
+            self._symbols = dict(reader.symbol_ids)
+            reader.close()
+        self._file = open(path, 'ab')
+        self._index = open(f"{path}.idx", 'ab')
+        if not exists:
+            self._file.write(MAGIC)
+
+    def _symbol_id(self, symbol: str) -> int:
+        if symbol not in self._symbols:
+            symbol_id = len(self._symbols)
+            name = symbol.encode('utf-8')
+            self._file.write(b'S' + SYMBOL_HEADER.pack(symbol_id, len(name)) + name)
+            self._symbols[symbol] = symbol_id
+        return self._symbols[symbol]
+
+    def record(self, symbol: str, ob: Union[OrderBook, OrderBookArrays],
+               timestamp: Optional[float] = None):
+        """Tulis satu snapshot"""
+        if timestamp is None:
+            timestamp = ob.timestamp if ob.timestamp is not None else time.time()
+        bid, ask = _levels(ob)
+        symbol_id = self._symbol_id(symbol)
+
+        offset = self._file.tell()
+        self._file.write(b'B' + BOOK_HEADER.pack(timestamp, symbol_id, int(ob.last_price),
+                                                 int(ob.volume), len(bid), len(ask)))
+        self._file.write(bid.tobytes())
+        self._file.write(ask.tobytes())
+
+        entry = np.array([(offset, timestamp, symbol_id)], dtype=INDEX_DTYPE)
+        self._index.write(entry.tobytes())
+
+    def flush(self):
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SessionReader:
+    """Baca file sesi via mmap; query per symbol dan rentang waktu lewat index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} bukan file sesi order book")
+
+        self.symbol_ids: Dict[str, int] = {}
+        index_path = f"{path}.idx"
+        if os.path.exists(index_path):
+            self.index = np.fromfile(index_path, dtype=INDEX_DTYPE)
+            self._scan(symbols_only=True)
+        else:
+            self.index = self._scan()
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.symbol_ids)
+
+    def _scan(self, symbols_only: bool = False) -> np.ndarray:
+        """Telusuri file dari awal; bangun tabel symbol (dan index jika tidak ada)"""
+        entries = []
+        pos = len(MAGIC)
+        size = len(self._data)
+        while pos < size:
+            kind = self._data[pos:pos + 1]
+            if kind == b'S':
+                symbol_id, length = SYMBOL_HEADER.unpack_from(self._data, pos + 1)
+                start = pos + 1 + SYMBOL_HEADER.size
+                self.symbol_ids[self._data[start:start + length].decode('utf-8')] = symbol_id
+                pos = start + length
+            elif kind == b'B':
+                timestamp, symbol_id, _, _, n_bid, n_ask = BOOK_HEADER.unpack_from(self._data, pos + 1)
+                if not symbols_only:
+                    entries.append((pos, timestamp, symbol_id))
+                pos += 1 + BOOK_HEADER.size + (n_bid + n_ask) * 12
+            else:
+                raise ValueError(f"Record tidak dikenal di offset {pos}")
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    def read(self, offset: int) -> Tuple[int, OrderBookArrays]:
+        """(symbol_id, snapshot) di offset tertentu"""
+        timestamp, symbol_id, last_price, volume, n_bid, n_ask = BOOK_HEADER.unpack_from(self._data, offset + 1)
+        levels = np.frombuffer(self._data, dtype='<i4', count=(n_bid + n_ask) * 3,
+                               offset=offset + 1 + BOOK_HEADER.size).reshape(-1, 3).astype(np.int64)
+        bid, ask = levels[:n_bid], levels[n_bid:]
+        return symbol_id, OrderBookArrays(
+            bid_price=bid[:, 0], bid_lot=bid[:, 1], bid_freq=bid[:, 2],
+            ask_price=ask[:, 0], ask_lot=ask[:, 1], ask_freq=ask[:, 2],
+            last_price=last_price, volume=volume, timestamp=timestamp
+        )
+
+    def select(self, symbols: Optional[List[str]] = None, start: Optional[float] = None,
+               end: Optional[float] = None) -> np.ndarray:
+        """Entri index yang cocok, urut waktu"""
+        mask = np.ones(len(self.index), dtype=bool)
+        if symbols is not None:
+            ids = [self.symbol_ids[s] for s in symbols if s in self.symbol_ids]
+            mask &= np.isin(self.index['symbol'], ids)
+        if start is not None:
+            mask &= self.index['timestamp'] >= start
+        if end is not None:
+            mask &= self.index['timestamp'] < end
+        selected = self.index[mask]
+        return selected[np.argsort(selected['timestamp'], kind='stable')]
+
+    def iter(self, symbols: Optional[List[str]] = None, start: Optional[float] = None,
+             end: Optional[float] = None) -> Iterator[Tuple[str, OrderBookArrays]]:
+        names = {symbol_id: name for name, symbol_id in self.symbol_ids.items()}
+        for entry in self.select(symbols, start, end):
+            symbol_id, snapshot = self.read(int(entry['offset']))
+            yield names[symbol_id], snapshot
+
+    def close(self):
+        self._data.close()
@@ -0,0 +1,244 @@
+import multiprocessing as mp
+import os
+import random
+import time
+import zlib
+from multiprocessing.connection import Connection, wait
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models import OrderBookArrays
+
+# Interval cek timeout saat menunggu hasil worker (detik)
+POLL_INTERVAL = 0.5
+
+# Hasil analisis ringkas yang dikirim worker ke koordinator (bukan dict/DataFrame)
+RESULT_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('symbol', 'U12'),
+    ('signal', 'U12'),
+    ('total_score', 'f4'),
+    ('foreign_accumulation', 'f4'),
+    ('broker_imbalance', 'f4'),
+    ('orderbook_strength', 'f4'),
+    ('fake_order_penalty', 'f4'),
+    ('foreign_net', 'i8'),
+    ('local_net', 'i8'),
+    ('orderbook_imbalance', 'f4'),
+    ('current_price', 'i8'),
+    ('suspicious_level', 'i1'),
+    ('fake_bid', '?'),
+    ('fake_ask', '?'),
+    # Dari OrderBookAnalyzer live milik worker (0/False jika belum ada snapshot)
+    ('volume', 'i8'),
+    ('manipulation', '?'),
+    ('lot_imbalance', 'f4'),
+    ('error', '?'),
+])
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """Shard tetap per symbol (stabil antar proses, tidak seperti hash())"""
+    return zlib.crc32(symbol.encode('utf-8')) % shards
+
+
+def _record(symbol: str, result: Optional[Dict], analyzer) -> np.ndarray:
+    row = np.zeros((), dtype=RESULT_DTYPE)
+    row['symbol'] = symbol
+    if result is None:
+        row['error'] = True
+        return row
+
+    components = result['score_components']
+    recommendation = result['recommendation']
+    fake_signals = result['fake_signals']
+    row['timestamp'] = result['timestamp'].timestamp()
+    row['signal'] = recommendation['signal']
+    for name in ('total_score', 'foreign_accumulation', 'broker_imbalance',
+                 'orderbook_strength', 'fake_order_penalty'):
+        row[name] = components[name]
+    row['foreign_net'] = result['foreign_net']
+    row['local_net'] = result['local_net']
+    row['orderbook_imbalance'] = result['orderbook_imbalance']
+    row['current_price'] = recommendation['current_price']
+    row['suspicious_level'] = fake_signals['suspicious_level']
+    row['fake_bid'] = fake_signals['fake_bid']
+    row['fake_ask'] = fake_signals['fake_ask']
+
+    if analyzer is not None and len(analyzer.history):
+        score = analyzer.bullish_score()
+        row['volume'] = analyzer.history.volume[analyzer.history.latest_slot()]
+        row['manipulation'] = score['fake_bid_detected'] or score['spoofing_detected']
+        row['lot_imbalance'] = analyzer.calculate_imbalance()['lot_imbalance']
+    return row
+
+
+def _worker(conn: Connection, shard: int, broker_flow=None, scoring=None):
+    """
+    Loop worker: state analyzer per symbol bertahan selama proses hidup.
+    Balasan per siklus: (cycle, shard, records, [(symbol, pesan error)]).
+    """
+    from classes.StockPotentialAnalyzer import StockPotentialAnalyzer
+    from OrderBookAnalyzer import OrderBookAnalyzer
+
+    random.seed()  # Proses hasil fork mewarisi state random yang sama
+    analyzer = StockPotentialAnalyzer(broker_flow)
+    orderbooks: Dict[str, OrderBookAnalyzer] = {}
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        cycle, tasks = message
+
+        records = np.zeros(len(tasks), dtype=RESULT_DTYPE)
+        errors = []
+        for i, (symbol, snapshot) in enumerate(tasks):
+            try:
+                if snapshot is not None:
+                    if symbol not in orderbooks:
+                        orderbooks[symbol] = OrderBookAnalyzer([], scoring=scoring, copy_results=False)
+                    orderbooks[symbol].append(snapshot)
+                result = analyzer.analyze_stock(symbol, quiet=True, orderbook=orderbooks.get(symbol))
+            except Exception as e:
+                result = None
+                errors.append((symbol, f"{type(e).__name__}: {e}"))
+            records[i] = _record(symbol, result, orderbooks.get(symbol))
+        conn.send((cycle, shard, records, errors))
+
+
+class ShardedAnalyzer:
+    """
+    Bagi universe symbol ke beberapa proses worker. Tiap symbol selalu ke shard
+    yang sama sehingga OrderBookAnalyzer-nya tetap hidup di worker tersebut.
+    broker_flow (BrokerFlowEngine) dan scoring (ScoringPipeline) disalin ke tiap
+    worker saat start, sama dengan analisis inline di StockMonitor.
+
+    Tiap worker punya pipe sendiri (bukan satu queue bersama): worker yang mati
+    tidak meninggalkan lock queue yang terkunci. Worker mati diganti sekali per
+    siklus (state order book-nya hilang); tanpa balasan dalam `timeout` detik
+    analyze() raise TimeoutError.
+    """
+
+    def __init__(self, workers: Optional[int] = None, broker_flow=None, scoring=None,
+                 timeout: float = 60.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.broker_flow = broker_flow
+        self.scoring = scoring
+        self.timeout = timeout
+        self._conns: List[Connection] = []
+        self._processes: List[mp.Process] = []
+        self._cycle = 0
+        # Pesan error per symbol dari siklus terakhir
+        self.errors: Dict[str, str] = {}
+
+    def start(self):
+        if self._processes:
+            return
+        for shard in range(self.workers):
+            conn, process = self._spawn(shard)
+            self._conns.append(conn)
+            self._processes.append(process)
+
+    def _spawn(self, shard: int):
+        conn, child_conn = mp.Pipe()
+        process = mp.Process(target=_worker, daemon=True,
+                             args=(child_conn, shard, self.broker_flow, self.scoring))
+        process.start()
+        child_conn.close()
+        return conn, process
+
+    def _send(self, shard: int, tasks: List, respawned: set):
+        """Kirim tugas siklus ini; worker yang sudah mati diganti dulu (sekali per siklus)"""
+        if not self._processes[shard].is_alive():
+            process = self._processes[shard]
+            if shard in respawned:
+                raise RuntimeError(f"Worker shard {shard} mati lagi (exitcode {process.exitcode})")
+            respawned.add(shard)
+            self._conns[shard].close()
+            self._conns[shard], self._processes[shard] = self._spawn(shard)
+        try:
+            self._conns[shard].send((self._cycle, tasks))
+        except (BrokenPipeError, ConnectionResetError):
+            # Mati tepat setelah cek is_alive
+            self._processes[shard].join(timeout=1)
+            self._send(shard, tasks, respawned)
+
+    def analyze(self, symbols: List[str],
+                snapshots: Optional[Dict[str, OrderBookArrays]] = None) -> np.ndarray:
+        """
+        Analisis semua symbol secara paralel. `snapshots` berisi order book baru
+        per symbol (opsional). Hasil: record RESULT_DTYPE, urut skor tertinggi.
+        """
+        self.start()
+        snapshots = snapshots or {}
+        self._cycle += 1
+
+        tasks: List[List] = [[] for _ in range(self.workers)]
+        for symbol in symbols:
+            tasks[shard_of(symbol, self.workers)].append((symbol, snapshots.get(symbol)))
+
+        respawned: set = set()
+        pending: Dict[int, List] = {}
+        for shard, shard_tasks in enumerate(tasks):
+            if shard_tasks:
+                self._send(shard, shard_tasks, respawned)
+                pending[shard] = shard_tasks
+
+        parts = []
+        self.errors = {}
+        deadline = time.monotonic() + self.timeout
+        while pending:
+            ready = wait([self._conns[shard] for shard in pending], timeout=POLL_INTERVAL)
+            for conn in ready:
+                shard = self._conns.index(conn)
+                try:
+                    cycle, _, records, errors = conn.recv()
+                except (EOFError, ConnectionResetError):
+                    # Worker mati di tengah siklus: ganti dan kirim ulang tugasnya
+                    self._processes[shard].join(timeout=1)
+                    self._send(shard, pending[shard], respawned)
+                    continue
+                # Balasan terlambat dari siklus sebelumnya (mis. setelah timeout)
+                if cycle != self._cycle:
+                    continue
+                parts.append(records)
+                self.errors.update(errors)
+                del pending[shard]
+            if pending and not ready and time.monotonic() > deadline:
+                raise TimeoutError(f"Worker shard {sorted(pending)} tidak membalas dalam {self.timeout}s")
+
+        records = np.concatenate(parts) if parts else np.zeros(0, dtype=RESULT_DTYPE)
+        return self.rank(records)
+
+    @staticmethod
+    def rank(records: np.ndarray, top_n: Optional[int] = None) -> np.ndarray:
+        """Urutkan record berdasarkan total_score (error di paling bawah)"""
+        order = np.lexsort((-records['total_score'], records['error']))
+        return records[order[:top_n]] if top_n is not None else records[order]
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,113 @@
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from models import OrderBook, OrderBookArrays
+from classes.OrderBookStore import OrderBookStore
+
+
+class SnapshotArchive:
+    """
+    Arsip snapshot order book di disk: <root>/<SYMBOL>/<YYYY-MM-DD>.obk,
+    berisi record fixed-width OrderBookStore.record_dtype(depth) urut waktu.
+    """
+
+    def __init__(self, root: str, depth: int = 20):
+        self.root = root
+        self.depth = depth
+        self.dtype = OrderBookStore.record_dtype(depth)
+        # Format file fixed-width: snapshot lebih lebar dari depth arsip ditolak (ValueError)
+        self._scratch = OrderBookStore(capacity=1, depth=depth, grow_depth=False)
+        self._files: Dict[str, object] = {}
+
+    @staticmethod
+    def day_of(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+    def path(self, symbol: str, day: str) -> str:
+        return os.path.join(self.root, symbol, f"{day}.obk")
+
+    def days(self, symbol: str) -> List[str]:
+        directory = os.path.join(self.root, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.obk'))
+
+    def _write(self, symbol: str, records: np.ndarray):
+        days = np.array([self.day_of(ts) for ts in records['timestamp']])
+        for day in np.unique(days):
+            path = self.path(symbol, day)
+            if path not in self._files:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._files[path] = open(path, 'ab')
+            self._files[path].write(records[days == day].tobytes())
+
+    def append(self, symbol: str, ob: Union[OrderBook, OrderBookArrays], timestamp: Optional[float] = None):
+        """Tambah satu snapshot ke file hari yang sesuai (snapshot harus urut waktu)"""
+        self._scratch.append(ob, timestamp)
+        self._write(symbol, self._scratch.to_records(1))
+
+    def write_store(self, symbol: str, store: OrderBookStore):
+        """Tulis seluruh isi OrderBookStore (mis. history satu sesi)"""
+        if store.depth > self.depth:
+            raise ValueError(f"Depth store {store.depth} melebihi depth arsip {self.depth}")
+        self._write(symbol, store.to_records(depth=self.depth))
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def open_day(self, symbol: str, day: str) -> np.ndarray:
+        """Memmap read-only satu file hari"""
+        path = self.path(symbol, day)
+        if path in self._files:
+            self._files[path].flush()
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(path, dtype=self.dtype, mode='r')
+
+    def query(self, symbol: str, start: Optional[float] = None,
+              end: Optional[float] = None) -> List[np.ndarray]:
+        """Slice memmap (tanpa copy) per hari untuk rentang [start, end)"""
+        days = self.days(symbol)
+        if start is not None:
+            days = [d for d in days if d >= self.day_of(start)]
+        if end is not None:
+            last_day = self.day_of(end)
+            days = [d for d in days if d <= last_day]
+
+        slices = []
+        for day in days:
+            records = self.open_day(symbol, day)
+            timestamps = records['timestamp']
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+            hi = len(records) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+            if hi > lo:
+                slices.append(records[lo:hi])
+        return slices
+
+    def load(self, symbol: str, start: Optional[float] = None,
+             end: Optional[float] = None) -> OrderBookStore:
+        """
+        History siap pakai untuk OrderBookAnalyzer. Zero-copy jika rentang ada
+        dalam satu hari; lintas hari digabung (copy).
+        """
+        slices = self.query(symbol, start, end)
+        if not slices:
+            return OrderBookStore.from_records(np.zeros(0, dtype=self.dtype))
+        if len(slices) == 1:
+            return OrderBookStore.from_records(slices[0])
+        return OrderBookStore.from_records(np.concatenate(slices))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
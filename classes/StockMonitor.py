@@ -1,71 +1,345 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
-import random
-from typing import Dict, List, Tuple, Optional
-import matplotlib.pyplot as plt
-from collections import defaultdict
+from typing import Dict, List, Optional
+import sys
 import warnings
 
 from classes.StockPotentialAnalyzer import StockPotentialAnalyzer
+from classes.OrderBookDeltaFilter import OrderBookDeltaFilter
+from classes.PollScheduler import PollScheduler
+from classes.AnalysisHistory import AnalysisHistory
+from classes.SessionRecorder import SessionRecorder
+from classes.ShardedAnalyzer import ShardedAnalyzer
+from classes.AnalysisRenderer import AnalysisRenderer
+from classes.ScoringPipeline import ScoringPipeline
+from classes.Screener import Screener
+from classes.Leaderboard import Leaderboard
+from apis.orderbook_parser import decode_orderbook_arrays
+from models import OrderBookArrays
+from metrics import METRICS
+from OrderBookAnalyzer import OrderBookAnalyzer as LiveOrderBookAnalyzer
 
 warnings.filterwarnings('ignore')
 
 class StockMonitor:
     """Monitor Saham secara berkala"""
     
-    def __init__(self, symbols: List[str]):
+    def __init__(self, symbols: List[str], live_orderbook: bool = False,
+                 max_concurrency: int = 10, rate_per_host: float = 5.0,
+                 history_capacity: int = 10000, history_spill_path: Optional[str] = None,
+                 record_path: Optional[str] = None, workers: int = 0,
+                 output: str = 'full', jsonl_path: Optional[str] = None,
+                 broker_flow=None, scoring_config: Optional[str] = None,
+                 shortlist: int = 0, metrics_path: Optional[str] = None):
         self.symbols = symbols
-        self.analyzer = StockPotentialAnalyzer()
-        self.history = []
+        self.analyzer = StockPotentialAnalyzer(broker_flow)
+        self.history = AnalysisHistory(history_capacity, history_spill_path)
         
-    def run_single_analysis(self):
-        """Run analysis for all symbols"""
-        results = []
+        # Order book live dari Stockbit (opsional)
+        self.live_orderbook = live_orderbook
+        self.max_concurrency = max_concurrency
+        self.rate_per_host = rate_per_host
+        self.fetcher = None  # OrderBookFetcher, dibuat saat live order book pertama dipakai
+        self.orderbook_analyzers: Dict[str, LiveOrderBookAnalyzer] = {}
+        # Bobot/ambang bullish score dari file JSON (None: ambang bawaan)
+        self.scoring = ScoringPipeline.from_file(scoring_config) if scoring_config else None
         
-        for symbol in self.symbols:
+        # shortlist > 0: prefilter murah untuk semua symbol, analisis lengkap hanya top-N
+        self.screener = Screener(shortlist, self.scoring) if shortlist > 0 else None
+        
+        # Hanya symbol yang order book-nya berubah yang dianalisis ulang
+        self.delta_filter = OrderBookDeltaFilter()
+        self.changed_levels: Dict[str, Dict] = {}
+        self.cycle_stats: Dict[str, int] = {}
+        self.latest_results: Dict[str, Dict] = {}
+        
+        # Rekam snapshot yang berubah untuk replay/backtest offline
+        self.recorder = SessionRecorder(record_path) if record_path else None
+        
+        # workers > 0: analisis dibagi ke proses worker, state order book tinggal di worker
+        self.sharded = (ShardedAnalyzer(workers, broker_flow=broker_flow, scoring=self.scoring)
+                        if workers > 0 else None)
+        self.pending_snapshots: Dict[str, OrderBookArrays] = {}
+        self.latest_records: Dict[str, np.void] = {}
+        
+        # Ranking live semua symbol, diperbarui per symbol yang dianalisis ulang
+        self.leaderboard = Leaderboard()
+        
+        # metrics_path: aktifkan timer/counter, dump tiap akhir siklus (.prom: Prometheus text, selain itu JSON)
+        self.metrics_path = metrics_path
+        if metrics_path:
+            METRICS.enable()
+        
+        # output: 'full' (print detail per symbol), 'summary' (satu write per siklus), 'none'
+        # (tanpa output sama sekali, termasuk status dan error; error tetap tercatat di self.errors)
+        self.output = output
+        self.errors: Dict[str, str] = {}
+        self.renderer = None
+        if output == 'summary' or jsonl_path:
+            self.renderer = AnalysisRenderer(sys.stdout if output == 'summary' else None, jsonl_path)
+    
+    def _log(self, message: str):
+        """Pesan status/ranking monitor, mengikuti setting output"""
+        if self.output != 'none':
+            print(message)
+    
+    def _error(self, symbol: str, message: str):
+        """Catat error siklus ini per symbol lalu tampilkan lewat _log"""
+        self.errors[symbol] = message
+        self._log(message)
+    
+    def fetch_orderbooks(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        """Ambil order book semua symbol secara concurrent"""
+        if self.fetcher is None:
+            # Import di sini: requests/asyncio tidak perlu dimuat untuk mode non-live
+            from classes.OrderBookFetcher import OrderBookFetcher
+            self.fetcher = OrderBookFetcher(max_concurrency=self.max_concurrency,
+                                            rate_per_host=self.rate_per_host, raw=True)
+        
+        self.changed_levels = {}
+        results = self.fetcher.run(symbols or self.symbols, self.on_orderbook)
+        self.cycle_stats = self.delta_filter.reset_cycle()
+        if self.recorder is not None:
+            self.recorder.flush()
+        self._log(f"Order book: {self.cycle_stats['processed']} changed, "
+                  f"{self.cycle_stats['skipped']} unchanged (skipped)")
+        return results
+    
+    def on_orderbook(self, result: Dict):
+        """Dipanggil begitu order book satu symbol tiba"""
+        if result['error'] is not None:
+            self._error(result['symbol'], f"Error fetching {result['symbol']}: {result['error']}")
+            return
+        if METRICS.enabled and result.get('latency') is not None:
+            METRICS.observe('fetch', result['latency'])
+        
+        symbol = result['symbol']
+        if self.delta_filter.unchanged_raw(symbol, result['data']):
+            METRICS.incr('orderbook_unchanged')
+            return
+        
+        try:
+            with METRICS.timer('parse'):
+                snapshot = decode_orderbook_arrays(result['data'])
+        except Exception as e:
+            self._error(symbol, f"Error parsing order book {symbol}: {e}")
+            return
+        
+        delta = self.delta_filter.diff(symbol, snapshot)
+        if delta is None:
+            return
+        self.changed_levels[symbol] = delta
+        if self.screener is not None:
+            self.screener.update_snapshot(symbol, snapshot)
+        
+        if self.recorder is not None:
+            self.recorder.record(symbol, snapshot)
+        
+        if self.sharded is not None:
+            self.pending_snapshots[symbol] = snapshot
+            return
+        
+        if symbol not in self.orderbook_analyzers:
+            # Konsumen internal hanya membaca hasil: tanpa salinan per panggilan
+            self.orderbook_analyzers[symbol] = LiveOrderBookAnalyzer([], scoring=self.scoring, copy_results=False)
+        self.orderbook_analyzers[symbol].append(snapshot)
+    
+    def run_single_analysis(self, symbols: Optional[List[str]] = None):
+        """
+        Run analysis for all symbols; hasil urut skor tertinggi (urutan leaderboard).
+        Tanpa `symbols` (run sekali untuk seluruh universe) leaderboard dibatasi ke
+        symbol yang dianalisis siklus ini, jadi sisa run sebelumnya tidak ikut di-ranking.
+        """
+        results = {}
+        self.errors = {}
+        one_shot = symbols is None
+        symbols = self.symbols if one_shot else symbols
+        started = time.perf_counter()
+        
+        if self.live_orderbook:
+            self.fetch_orderbooks(symbols)
+        
+        if self.screener is not None:
+            symbols = self.screen(symbols)
+        if one_shot:
+            self.leaderboard.retain(symbols)
+        
+        if self.sharded is not None:
+            records = self.run_sharded_analysis(symbols)
+            self._finish_cycle(started)
+            return records
+        
+        for symbol in symbols:
+            # Order book tidak berubah: pakai hasil analisis sebelumnya
+            if (self.live_orderbook and symbol not in self.changed_levels
+                    and symbol in self.latest_results):
+                results[symbol] = self.latest_results[symbol]
+                continue
+            
             try:
-                result = self.analyzer.analyze_stock(symbol)
-                results.append(result)
+                result = self.analyzer.analyze_stock(symbol, quiet=self.output != 'full',
+                                                     orderbook=self.orderbook_analyzers.get(symbol))
+                if self.renderer is not None:
+                    self.renderer.add(result)
+                results[symbol] = result
                 self.history.append(result)
-                
-                # Delay antara analisis saham
-                time.sleep(1)
+                self.latest_results[symbol] = result
+                self.leaderboard.update(symbol, result['score_components']['total_score'],
+                                        result['recommendation']['signal'])
                 
             except Exception as e:
-                print(f"Error analyzing {symbol}: {e}")
+                self._error(symbol, f"Error analyzing {symbol}: {e}")
         
-        # Sort by potential score
-        results.sort(key=lambda x: x['score_components']['total_score'], reverse=True)
+        if self.renderer is not None:
+            with METRICS.timer('render'):
+                self.renderer.flush()
         
-        # Display ranking
-        print(f"\n{'='*60}")
-        print("STOCK RANKING BY POTENTIAL:")
-        print(f"{'='*60}")
+        self.print_ranking()
+        self._finish_cycle(started)
+        # Hanya hasil siklus ini yang diurutkan; tampilan leaderboard cukup top-n
+        return [results[symbol] for symbol in self.leaderboard.order(results)]
+    
+    def _finish_cycle(self, started: float):
+        """Catat durasi siklus dan tulis dump metrics (jika diaktifkan)"""
+        if not METRICS.enabled:
+            return
+        METRICS.observe('cycle', time.perf_counter() - started)
+        METRICS.incr('cycles')
+        if self.metrics_path:
+            METRICS.dump(self.metrics_path)
+    
+    def print_ranking(self, n: int = 5):
+        """Top-n leaderboard beserta perubahan rank sejak siklus sebelumnya"""
+        self._log(f"\n{'='*60}")
+        self._log("STOCK RANKING BY POTENTIAL:")
+        self._log(f"{'='*60}")
         
-        for i, result in enumerate(results[:5], 1):
-            score = result['score_components']['total_score']
-            signal = result['recommendation']['signal']
-            print(f"{i}. {result['symbol']}: {score:.1f} - {signal}")
+        for row in self.leaderboard.end_cycle(n):
+            self._log(f"{row['rank']}. {row['symbol']}: {row['score']:.1f} - {row['label']}"
+                      f"{Leaderboard.format_change(row)}")
+    
+    def refresh_market_data(self):
+        """Volume seluruh market dari market mover + trending (dua request per siklus)"""
+        from apis.stockbit import get_client
+        from apis.market_parser import parse_market_volumes
         
-        return results
+        client = get_client()
+        payloads = []
+        for fetch in (client.get_market_mover, client.get_emitten_trending):
+            try:
+                payloads.append(fetch())
+            except Exception as e:
+                self._log(f"Error fetching market data: {e}")
+        self.screener.update_market(parse_market_volumes(payloads))
     
-    def run_continuous_monitoring(self, interval_minutes: int = 5):
-        """Run continuous monitoring"""
-        print(f"\nStarting continuous monitoring (interval: {interval_minutes} minutes)")
-        print("Press Ctrl+C to stop\n")
+    def screen(self, symbols: List[str]) -> List[str]:
+        """Prefilter (imbalance, spread %, volume) lalu ambil shortlist untuk analisis lengkap"""
+        if self.live_orderbook:
+            self.refresh_market_data()
+        
+        with METRICS.timer('screen'):
+            shortlist = self.screener.select(symbols)
+        if len(shortlist) < len(symbols):
+            self._log(f"Screening: {len(shortlist)} dari {len(symbols)} symbol lanjut ke analisis lengkap")
+        return shortlist
+    
+    def run_sharded_analysis(self, symbols: List[str]) -> np.ndarray:
+        """Analisis paralel lewat ShardedAnalyzer; hasil berupa record ringkas"""
+        if self.live_orderbook:
+            # Symbol yang order book-nya tidak berubah tidak dikirim ke worker
+            symbols = [s for s in symbols
+                       if s in self.changed_levels or s not in self.latest_records]
+        
+        with METRICS.timer('sharded_analyze'):
+            records = self.sharded.analyze(symbols, self.pending_snapshots)
+        self.pending_snapshots = {}
+        for symbol, message in self.sharded.errors.items():
+            self._error(symbol, f"Error analyzing {symbol}: {message}")
+        for record in records:
+            if not record['error']:
+                self.history.append_record(record)
+                self.latest_records[str(record['symbol'])] = record
+                self.leaderboard.update(str(record['symbol']), record['total_score'], str(record['signal']))
+                if self.renderer is not None:
+                    self.renderer.add_record(record)
+        if self.renderer is not None:
+            with METRICS.timer('render'):
+                self.renderer.flush()
+        
+        self.print_ranking()
+        return records
+    
+    def volume_panel(self) -> Dict[str, Dict]:
+        """VWAP/volume-at-price live semua symbol dengan order book (O(1) per symbol)"""
+        return {symbol: analyzer.volume_panel() for symbol, analyzer in self.orderbook_analyzers.items()}
+    
+    def symbol_activity(self, symbol: str) -> Dict:
+        """Indikator aktivitas symbol untuk menentukan interval polling berikutnya"""
+        record = self.latest_records.get(symbol)
+        if record is not None:
+            if record['volume']:
+                return {
+                    'volume': int(record['volume']),
+                    'manipulation': bool(record['manipulation']),
+                    'imbalance': float(record['lot_imbalance'])
+                }
+            return {
+                'manipulation': bool(record['suspicious_level'] > 0),
+                'imbalance': float(record['orderbook_imbalance'])
+            }
+        
+        analyzer = self.orderbook_analyzers.get(symbol)
+        if analyzer is not None and len(analyzer.history):
+            score = analyzer.bullish_score()
+            return {
+                'volume': int(analyzer.history.volume[analyzer.history.latest_slot()]),
+                'manipulation': score['fake_bid_detected'] or score['spoofing_detected'],
+                'imbalance': analyzer.calculate_imbalance()['lot_imbalance']
+            }
+        
+        result = self.latest_results.get(symbol)
+        if result is None:
+            return {}
+        return {
+            'manipulation': result['fake_signals']['suspicious_level'] > 0,
+            'imbalance': result['orderbook_imbalance']
+        }
+    
+    def run_continuous_monitoring(self, interval_minutes: int = 5, min_interval_seconds: float = 15,
+                                  requests_per_second: float = 5.0):
+        """Run continuous monitoring, tiap symbol dipoll sesuai intervalnya sendiri"""
+        self._log(f"\nStarting continuous monitoring (base interval: {interval_minutes} minutes)")
+        self._log("Press Ctrl+C to stop\n")
+        
+        scheduler = PollScheduler(
+            self.symbols,
+            base_interval=interval_minutes * 60,
+            min_interval=min_interval_seconds,
+            max_interval=interval_minutes * 60 * 4,
+            requests_per_second=requests_per_second
+        )
         
         try:
             while True:
-                print(f"\n{'='*60}")
-                print(f"MONITORING CYCLE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                print(f"{'='*60}")
+                due = scheduler.due()
+                if due:
+                    self._log(f"\n{'='*60}")
+                    self._log(f"MONITORING CYCLE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ({len(due)} symbols)")
+                    self._log(f"{'='*60}")
+                
+                    self.run_single_analysis(due)
                 
-                self.run_single_analysis()
+                    for symbol in due:
+                        scheduler.report(symbol, **self.symbol_activity(symbol))
                 
-                print(f"\nNext update in {interval_minutes} minutes...")
-                time.sleep(interval_minutes * 60)
+                wait = scheduler.next_wakeup()
+                if due:
+                    self._log(f"\nNext update in {wait:.0f} seconds...")
+                time.sleep(wait)
                 
         except KeyboardInterrupt:
-            print("\nMonitoring stopped by user")
+            self._log("\nMonitoring stopped by user")
+        finally:
+            if self.sharded is not None:
+                self.sharded.close()
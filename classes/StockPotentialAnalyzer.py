@@ -1,23 +1,21 @@
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import time
+from datetime import datetime
 import random
-from typing import Dict, List, Tuple, Optional
-import matplotlib.pyplot as plt
-from collections import defaultdict
+from typing import Dict
 import warnings
 
 from classes.StockbitBandarDetector import StockbitBandarDetector
 from classes.OrderBookAnalyzer import OrderBookAnalyzer
+from classes.AnalysisRenderer import AnalysisRenderer
+from metrics import METRICS, timed
 
 warnings.filterwarnings('ignore')
 
 class StockPotentialAnalyzer:
     """Analisis Potensi Saham"""
     
-    def __init__(self):
-        self.bandar_detector = StockbitBandarDetector()
+    def __init__(self, broker_flow=None):
+        # broker_flow: BrokerFlowEngine berisi data broker nyata (opsional)
+        self.bandar_detector = StockbitBandarDetector(broker_flow)
         self.orderbook_analyzer = OrderBookAnalyzer()
         self.thresholds = {
             'min_foreign_net': 500,
@@ -26,97 +24,67 @@ class StockPotentialAnalyzer:
             'min_broker_strength': 0.2
         }
     
-    def analyze_stock(self, symbol: str) -> Dict:
-        """Analisis lengkap untuk satu saham"""
-        
-        print(f"\n{'='*60}")
-        print(f"ANALISIS SAHAM: {symbol}")
-        print(f"{'='*60}")
+    @timed()
+    def analyze_stock(self, symbol: str, quiet: bool = False, orderbook=None) -> Dict:
+        """
+        Analisis lengkap untuk satu saham. quiet=True: tanpa output sama sekali,
+        hanya mengembalikan record hasil (format/print lewat AnalysisRenderer).
+        orderbook: OrderBookAnalyzer live berisi order book nyata; imbalance dan
+        deteksi fake order diambil dari sana, bukan dari order book dummy.
+        """
         
         # 1. Data Top Broker Asing
-        print("\n1. TOP BROKER ASING:")
-        top_foreign = self.bandar_detector.get_top_foreign_brokers()
-        print(top_foreign.head(5).to_string())
+        top_foreign = self.bandar_detector.get_top_foreign_brokers(symbol)
         
-        foreign_net_total = top_foreign['net_buy_lots'].sum()
-        foreign_strength = foreign_net_total / len(top_foreign)
+        # Kekuatan asing dari seluruh broker asing; top_foreign hanya untuk tampilan
+        foreign_strength = self.bandar_detector.get_foreign_strength(symbol)
         
         # 2. Data Broker Summary
-        print("\n2. BROKER SUMMARY:")
-        broker_summary = self.bandar_detector.get_broker_summary()
-        print(broker_summary.head(10).to_string())
-        
-        # Pisahkan foreign vs local
-        foreign_brokers = broker_summary[broker_summary['broker_type'] == 'FOREIGN']
-        local_brokers = broker_summary[broker_summary['broker_type'] == 'LOCAL']
+        broker_summary = self.bandar_detector.get_broker_summary(symbol)
         
-        foreign_net = foreign_brokers['net_lots'].sum()
-        local_net = local_brokers['net_lots'].sum()
+        # Split foreign vs local sudah dihitung di broker summary
+        foreign_net = broker_summary.foreign_net
+        local_net = broker_summary.local_net
         
         # 3. Order Book Analysis
-        print("\n3. ORDER BOOK ANALYSIS:")
-        order_book = self.orderbook_analyzer.generate_order_book(symbol)
-        
-        print("Top 5 Bids:")
-        print(order_book[order_book['type'] == 'BID'].head(5).to_string())
-        print("\nTop 5 Asks:")
-        print(order_book[order_book['type'] == 'ASK'].head(5).to_string())
-        
-        # Hitung imbalance
-        imbalance = self.orderbook_analyzer.calculate_order_book_imbalance(order_book)
-        print(f"\nOrder Book Imbalance: {imbalance:.2%}")
-        
-        # 4. Fake Order Detection
-        fake_signals = self.orderbook_analyzer.detect_fake_orders(order_book)
-        print("\n4. FAKE ORDER DETECTION:")
-        print(f"Fake Bid Detected: {fake_signals['fake_bid']}")
-        print(f"Fake Ask Detected: {fake_signals['fake_ask']}")
-        print(f"Suspicious Level: {fake_signals['suspicious_level']}/2")
-        if fake_signals['details']:
-            for detail in fake_signals['details']:
-                print(f"  - {detail}")
+        if orderbook is not None and len(orderbook.history):
+            order_book = self.orderbook_analyzer.live_order_book(orderbook)
+            imbalance = orderbook.calculate_imbalance()['lot_imbalance']
+            fake_signals = self.orderbook_analyzer.detect_live_fake_orders(orderbook)
+        else:
+            order_book = self.orderbook_analyzer.generate_order_book(symbol)
         
-        # 5. Hitung Skor Potensi
-        print(f"\n{'='*60}")
-        print("POTENTIAL SCORE CALCULATION:")
-        print(f"{'='*60}")
+            # Hitung imbalance
+            imbalance = self.orderbook_analyzer.calculate_order_book_imbalance(order_book)
+        
+            # 4. Fake Order Detection
+            fake_signals = self.orderbook_analyzer.detect_fake_orders(order_book)
         
-        # Komponen skor
+        # 5. Hitung Skor Potensi
         score_components = {}
         
         # 1. Foreign Accumulation (40%)
         foreign_score = min(foreign_strength / 500, 1.0) * 40
         score_components['foreign_accumulation'] = foreign_score
-        print(f"Foreign Accumulation Score: {foreign_score:.1f}/40")
         
         # 2. Broker Imbalance (30%)
         broker_ratio = (foreign_net - local_net) / (abs(foreign_net) + abs(local_net) + 1)
         broker_score = (broker_ratio + 1) / 2 * 30
         score_components['broker_imbalance'] = broker_score
-        print(f"Broker Imbalance Score: {broker_score:.1f}/30")
         
         # 3. Order Book Strength (20%)
         orderbook_score = max(imbalance, 0) * 20
         score_components['orderbook_strength'] = orderbook_score
-        print(f"Order Book Strength Score: {orderbook_score:.1f}/20")
         
         # 4. Fake Order Penalty (-10 max)
         fake_penalty = fake_signals['suspicious_level'] * -5
         score_components['fake_order_penalty'] = fake_penalty
-        print(f"Fake Order Penalty: {fake_penalty:.1f}")
         
         # Total Score
         total_score = sum(score_components.values())
         score_components['total_score'] = total_score
         
-        print(f"\n{'='*60}")
-        print(f"TOTAL POTENTIAL SCORE: {total_score:.1f}/100")
-        
         # 6. Tentukan Signal dan Area Trading
-        print(f"\n{'='*60}")
-        print("TRADING RECOMMENDATION:")
-        print(f"{'='*60}")
-        
         recommendation = self.generate_recommendation(
             total_score, 
             foreign_net, 
@@ -124,11 +92,6 @@ class StockPotentialAnalyzer:
             fake_signals
         )
         
-        # Tampilkan rekomendasi
-        for key, value in recommendation.items():
-            if key != 'score_components':
-                print(f"{key.upper()}: {value}")
-        
         # Simpan hasil analisis
         analysis_result = {
             'symbol': symbol,
@@ -141,6 +104,10 @@ class StockPotentialAnalyzer:
             'recommendation': recommendation
         }
         
+        if not quiet:
+            with METRICS.timer('render'):
+                print(AnalysisRenderer.format(analysis_result, top_foreign, broker_summary, order_book), end='')
+        
         return analysis_result
     
     def generate_recommendation(self, total_score: float, foreign_net: float, 
@@ -1,54 +1,106 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import time
 import random
-from typing import Dict, List, Tuple, Optional
-import matplotlib.pyplot as plt
-from collections import defaultdict
+from typing import Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from models import RecordTable, BrokerSummary
+from metrics import timed
+
+FOREIGN_BROKER_DTYPE = np.dtype([
+    ('broker', 'U16'),
+    ('net_buy_lots', 'i8'),
+    ('total_value', 'i8'),
+    ('frequency', 'i8'),
+    ('trend', 'U12'),
+])
+
+BROKER_SUMMARY_DTYPE = np.dtype([
+    ('broker', 'U16'),
+    ('buy_lots', 'i8'),
+    ('sell_lots', 'i8'),
+    ('net_lots', 'i8'),
+    ('avg_price', 'i8'),
+    ('broker_type', 'U7'),
+    ('net_ratio', 'f8'),
+])
+
 
 class StockbitBandarDetector:
-    """Simulasi Bandar Detector dari Stockbit"""
+    """
+    Bandar Detector ala Stockbit. Tanpa `flow` data broker disimulasikan secara
+    acak; dengan BrokerFlowEngine data diambil dari flow yang sudah diakumulasi.
+    """
     
-    def __init__(self):
+    def __init__(self, flow=None):
+        self.flow = flow
         self.top_brokers = ['MACQUARIE', 'CITI', 'GOLDMAN', 'UBS', 'JPMORGAN', 'DEUTSCHE', 'HSBC', 'CREDIT SUISSE']
         self.local_brokers = ['MIRA', 'BRI', 'MANDIRI', 'BCA', 'BNI', 'CIMB', 'PANIN', 'DAWAH']
         
-    def get_top_foreign_brokers(self) -> pd.DataFrame:
-        """Data Top Broker Asing"""
-        data = []
-        for broker in self.top_brokers:
-            data.append({
-                'broker': broker,
-                'net_buy_lots': random.randint(100, 1000),
-                'total_value': random.randint(1e9, 1e10),
-                'frequency': random.randint(10, 100),
-                'trend': random.choice(['ACCUMULATION', 'DISTRIBUTION', 'NEUTRAL'])
-            })
-        return pd.DataFrame(data).sort_values('net_buy_lots', ascending=False)
+    @timed()
+    def get_top_foreign_brokers(self, symbol: Optional[str] = None, n: int = 5) -> RecordTable:
+        """Data Top Broker Asing, n teratas urut net_buy_lots terbesar"""
+        if self.flow is not None and symbol is not None:
+            return self.flow.top_foreign_table(symbol, n)
+        return self._simulated_foreign().head(n)
+        
+    @timed()
+    def get_foreign_strength(self, symbol: Optional[str] = None) -> float:
+        """
+        Rata-rata net buy lot per broker asing atas seluruh broker asing, bukan
+        hanya top-n. Dengan flow diambil dari agregat asing BrokerFlowEngine.
+        """
+        if self.flow is not None and symbol is not None:
+            return self.flow.foreign_strength(symbol)
+        return float(self._simulated_foreign()['net_buy_lots'].mean())
     
-    def get_broker_summary(self) -> pd.DataFrame:
-        """Data Broker Summary"""
-        data = []
+    def _simulated_foreign(self) -> RecordTable:
+        """Semua broker asing dengan data acak, urut net_buy_lots terbesar"""
+        records = np.zeros(len(self.top_brokers), dtype=FOREIGN_BROKER_DTYPE)
+        for i, broker in enumerate(self.top_brokers):
+            records[i] = (
+                broker,
+                random.randint(100, 1000),
+                random.randint(1e9, 1e10),
+                random.randint(10, 100),
+                random.choice(['ACCUMULATION', 'DISTRIBUTION', 'NEUTRAL'])
+            )
+        return RecordTable(records).sort_desc('net_buy_lots')
+    
+    @timed()
+    def get_broker_summary(self, symbol: Optional[str] = None) -> BrokerSummary:
+        """Data Broker Summary, beserta split foreign/local"""
+        if self.flow is not None and symbol is not None:
+            return self.flow.summary(symbol)
+        
         all_brokers = self.top_brokers + self.local_brokers
+        records = np.zeros(len(all_brokers), dtype=BROKER_SUMMARY_DTYPE)
         
-        for broker in all_brokers:
+        for i, broker in enumerate(all_brokers):
             buy_lots = random.randint(50, 800)
             sell_lots = random.randint(50, 800)
             net = buy_lots - sell_lots
             
-            data.append({
-                'broker': broker,
-                'buy_lots': buy_lots,
-                'sell_lots': sell_lots,
-                'net_lots': net,
-                'avg_price': random.randint(1000, 5000),
-                'broker_type': 'FOREIGN' if broker in self.top_brokers else 'LOCAL'
-            })
+            records[i] = (
+                broker,
+                buy_lots,
+                sell_lots,
+                net,
+                random.randint(1000, 5000),
+                'FOREIGN' if broker in self.top_brokers else 'LOCAL',
+                0
+            )
+        
+        records['net_ratio'] = records['net_lots'] / (records['buy_lots'] + records['sell_lots'] + 1)
+        table = RecordTable(records).sort_desc('net_lots')
         
-        df = pd.DataFrame(data)
-        df['net_ratio'] = df['net_lots'] / (df['buy_lots'] + df['sell_lots'] + 1)
-        return df.sort_values('net_lots', ascending=False)
\ No newline at end of file
+        is_foreign = table['broker_type'] == 'FOREIGN'
+        foreign = table.take(is_foreign)
+        local = table.take(~is_foreign)
+        return BrokerSummary(
+            table=table,
+            foreign=foreign,
+            local=local,
+            foreign_net=foreign['net_lots'].sum(),
+            local_net=local['net_lots'].sum()
+        )
@@ -0,0 +1,103 @@
+import random
+from typing import Iterator, List, Optional
+
+from models import Order, OrderBook
+
+
+class SyntheticOrderBookGenerator:
+    """Generate stream order book ala IDX (fraksi harga, spoofing dan fake bid sintetis)"""
+
+    def __init__(self, seed: Optional[int] = None, depth: int = 10,
+                 base_price: Optional[int] = None, spoof_rate: float = 0.05,
+                 fake_bid_rate: float = 0.05, tick_interval: float = 1.0,
+                 start_time: float = 0.0):
+        self.rng = random.Random(seed)
+        self.depth = depth
+        self.spoof_rate = spoof_rate
+        self.fake_bid_rate = fake_bid_rate
+        self.tick_interval = tick_interval
+        self.timestamp = start_time
+        self.volume = 0
+
+        price = base_price or self.rng.choice([150, 450, 1500, 3500, 9000])
+        self.price = self.round_to_tick(price)
+
+        # Spoofing aktif: (harga, sisa tick sampai muncul lagi, periode)
+        self._spoof_price: Optional[int] = None
+        self._spoof_period = 3
+        self._spoof_countdown = 0
+
+    @staticmethod
+    def tick_size(price: int) -> int:
+        """Fraksi harga BEI"""
+        if price < 200:
+            return 1
+        if price < 500:
+            return 2
+        if price < 2000:
+            return 5
+        if price < 5000:
+            return 10
+        return 25
+
+    def round_to_tick(self, price: int) -> int:
+        tick = self.tick_size(price)
+        return max(tick, int(price) // tick * tick)
+
+    def _ladder(self, start: int, direction: int) -> List[int]:
+        prices = []
+        price = start
+        for _ in range(self.depth):
+            if price <= 0:
+                break
+            prices.append(price)
+            price = self.round_to_tick(price + direction * self.tick_size(price))
+            if direction < 0 and price == prices[-1]:
+                break
+        return prices
+
+    def _order(self, price: int) -> Order:
+        lot = max(1, int(self.rng.lognormvariate(5, 1)))
+        return Order(price=price, freq=max(1, int(self.rng.expovariate(1 / 8))), lot=lot)
+
+    def next(self) -> OrderBook:
+        """Snapshot berikutnya"""
+        # Random walk harga per tick
+        step = self.rng.choice([-1, 0, 0, 0, 1])
+        self.price = self.round_to_tick(self.price + step * self.tick_size(self.price))
+
+        best_bid = self.price
+        best_ask = self.round_to_tick(self.price + self.tick_size(self.price))
+        bid = [self._order(p) for p in self._ladder(best_bid, -1)]
+        ask = [self._order(p) for p in self._ladder(best_ask, 1)]
+
+        # Fake bid: order besar freq rendah yang muncul sesaat
+        if bid and self.rng.random() < self.fake_bid_rate:
+            level = self.rng.randrange(len(bid))
+            bid[level] = Order(price=bid[level].price, freq=1, lot=self.rng.randint(500, 5000))
+
+        # Spoofing: order besar yang muncul berulang dengan jarak teratur
+        if self._spoof_price is None and bid and self.rng.random() < self.spoof_rate:
+            self._spoof_price = bid[min(len(bid) - 1, 2)].price
+            self._spoof_period = self.rng.randint(2, 4)
+            self._spoof_countdown = 0
+        if self._spoof_price is not None:
+            if self._spoof_countdown == 0:
+                lot = max(1000, 60_000_000 // max(1, self._spoof_price) + 1)
+                for i, order in enumerate(bid):
+                    if order.price == self._spoof_price:
+                        bid[i] = Order(price=order.price, freq=order.freq, lot=lot)
+                self._spoof_countdown = self._spoof_period
+            self._spoof_countdown -= 1
+            if self.rng.random() < 0.05:
+                self._spoof_price = None
+
+        self.volume += int(self.rng.expovariate(1 / 20000))
+        self.timestamp += self.tick_interval
+
+        return OrderBook(bid=bid, ask=ask, last_price=self.price,
+                         volume=self.volume, timestamp=self.timestamp)
+
+    def stream(self, n: int) -> Iterator[OrderBook]:
+        for _ in range(n):
+            yield self.next()
@@ -0,0 +1,118 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from classes.LazyHeap import LazyHeap
+
+# Di bawah ini full sort numpy lebih murah dari argpartition/heap (diukur ~640 level)
+DEEP_BOOK_LEVELS = 640
+
+
+def strength_scores(lots: np.ndarray, freqs: np.ndarray) -> np.ndarray:
+    """OrderBookAnalyzer.strength_score untuk satu array level"""
+    return lots * freqs * np.where(lots >= 100, 1.0, 0.5)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Index k skor terbesar, hasil identik dengan np.argsort(-scores, kind="stable")[:k]
+    (skor sama: index kecil dulu) tanpa sort penuh.
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.zeros(0, dtype=np.intp)
+    if k >= n or n <= DEEP_BOOK_LEVELS:
+        return np.argsort(-scores, kind="stable")[:k]
+
+    # Skor ke-k terbesar sebagai ambang; yang sama dengan ambang diambil urut index
+    threshold = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    candidates = np.sort(np.concatenate([above, ties]))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class TopLevelTracker:
+    """
+    Top-K level satu side yang diperbarui per tick: hanya level yang berubah
+    (harga baru/hilang, lot atau freq berubah) yang masuk LazyHeap dengan key
+    harga. Urutan seri mengikuti posisi level di side yang terurut harga
+    (bid: harga tinggi dulu, ask: harga rendah dulu).
+    """
+
+    def __init__(self, side: str):
+        self.side = side
+        self._sign = -1 if side == "bid" else 1
+        self.prices = np.zeros(0, dtype=np.int64)
+        self.lots = np.zeros(0, dtype=np.int64)
+        self.freqs = np.zeros(0, dtype=np.int64)
+        # Key harga, seri sign * harga, data (lot, freq)
+        self.heap = LazyHeap()
+        self.sorted = True
+        # False: terlalu banyak level berubah, heap tidak dipelihara (pakai top_k)
+        self.incremental = True
+
+    def _push(self, price: int, lot: int, freq: int):
+        score = lot * freq * (1 if lot >= 100 else 0.5)
+        self.heap.push(price, score, self._sign * price, (lot, freq))
+
+    def update(self, prices: np.ndarray, lots: np.ndarray, freqs: np.ndarray):
+        """Ganti isi side dengan snapshot baru; kerja heap sebanding jumlah level yang berubah"""
+        # Copy: input biasanya view ke slot ring buffer yang nanti ditimpa
+        prices = np.array(prices, dtype=np.int64)
+        lots = np.array(lots, dtype=np.int64)
+        freqs = np.array(freqs, dtype=np.int64)
+        removed = None
+
+        if len(prices) == len(self.prices) and np.array_equal(prices, self.prices):
+            # Tangga harga sama (kasus umum antar tick): cukup bandingkan lot/freq
+            changed = (lots != self.lots) | (freqs != self.freqs)
+        else:
+            was_sorted = self.sorted
+            self.sorted = bool(np.all(self._sign * np.diff(prices) > 0))
+            if not was_sorted:
+                # Snapshot sebelumnya bisa punya harga ganda: mulai ulang dari nol
+                self.prices = self.prices[:0]
+                self.heap.clear()
+
+            # Cocokkan harga baru dengan harga sebelumnya
+            changed = np.ones(len(prices), dtype=bool)
+            if len(self.prices):
+                order = np.argsort(self.prices)
+                old_prices = self.prices[order]
+                pos = np.minimum(np.searchsorted(old_prices, prices), len(old_prices) - 1)
+                old_index = order[pos]
+                changed = ((old_prices[pos] != prices) | (self.lots[old_index] != lots)
+                           | (self.freqs[old_index] != freqs))
+                removed = self.prices[~np.isin(self.prices, prices)]
+
+        changed_index = np.flatnonzero(changed)
+        dense = len(changed_index) * 4 > len(prices)
+        if dense or not self.incremental:
+            # Hampir semua level berubah: selection langsung lebih murah dari update heap
+            self.prices, self.lots, self.freqs = prices, lots, freqs
+            self.incremental = not dense
+            if self.incremental:
+                self._compact()
+            return
+
+        if removed is not None:
+            for price in removed.tolist():
+                self.heap.discard(price)
+        for i in changed_index.tolist():
+            self._push(int(prices[i]), int(lots[i]), int(freqs[i]))
+
+        self.prices, self.lots, self.freqs = prices, lots, freqs
+
+    def _compact(self):
+        """Bangun ulang heap dari isi side saat ini"""
+        scores = strength_scores(self.lots, self.freqs)
+        self.heap.rebuild(zip(scores.tolist(), (self._sign * self.prices).tolist(), self.prices.tolist(),
+                              zip(self.lots.tolist(), self.freqs.tolist())))
+
+    def top(self, k: int) -> List[Tuple[int, int, int]]:
+        """(price, lot, freq) k level terkuat"""
+        if not self.incremental:
+            return [(int(self.prices[i]), int(self.lots[i]), int(self.freqs[i]))
+                    for i in top_k(strength_scores(self.lots, self.freqs), k)]
+        return [(price, lot, freq) for price, _, (lot, freq) in self.heap.top(k)]
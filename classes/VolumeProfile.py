@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class StreamingVolumeProfile:
+    """
+    Volume profile streaming: rata-rata bergulir atas `window` snapshot terakhir
+    (opsional juga dibatasi umur `max_age` detik) dan histogram volume per harga
+    untuk satu sesi. Semua query O(1) kecuali yang mengembalikan isi window.
+
+    Volume snapshot dianggap kumulatif per sesi; selisih antar snapshot dicatat
+    pada last price. Volume yang turun berarti sesi baru (histogram di-reset).
+    """
+
+    def __init__(self, window: int = 20, max_age: Optional[float] = None):
+        self.window = window
+        self.max_age = max_age
+
+        self.timestamp = np.zeros(window, dtype=np.float64)
+        self.volume = np.zeros(window, dtype=np.int64)
+        self.bid_strength = np.zeros(window, dtype=np.float64)
+        self.imbalance = np.zeros(window, dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._sum_volume = 0
+        self._sum_strength = 0.0
+        self._sum_imbalance = 0.0
+
+        self.histogram: Dict[int, int] = {}
+        self.poc: Optional[int] = None
+        self._last_volume: Optional[int] = None
+        self._traded = 0
+        self._traded_value = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    # Window bergulir
+
+    def _evict_oldest(self):
+        tail = (self._head - self._size) % self.window
+        self._sum_volume -= int(self.volume[tail])
+        self._sum_strength -= float(self.bid_strength[tail])
+        self._sum_imbalance -= float(self.imbalance[tail])
+        self._size -= 1
+
+    def _expire(self, now: float):
+        if self.max_age is None:
+            return
+        while self._size and self.timestamp[(self._head - self._size) % self.window] < now - self.max_age:
+            self._evict_oldest()
+
+    def _push_window(self, timestamp: float, volume: int, bid_strength: float, imbalance: float):
+        if self._size == self.window:
+            self._evict_oldest()
+        head = self._head
+        self.timestamp[head] = timestamp
+        self.volume[head] = volume
+        self.bid_strength[head] = bid_strength
+        self.imbalance[head] = imbalance
+        self._sum_volume += int(volume)
+        self._sum_strength += float(bid_strength)
+        self._sum_imbalance += float(imbalance)
+        self._head = (head + 1) % self.window
+        self._size += 1
+        self._expire(timestamp)
+
+    # Histogram volume per harga
+
+    def reset_session(self):
+        self.histogram = {}
+        self.poc = None
+        self._traded = 0
+        self._traded_value = 0
+
+    def _add_at_price(self, price: int, lots: int):
+        if lots <= 0:
+            return
+        total = self.histogram.get(price, 0) + lots
+        self.histogram[price] = total
+        self._traded += lots
+        self._traded_value += lots * price
+        if self.poc is None or total > self.histogram[self.poc]:
+            self.poc = price
+
+    def push(self, timestamp: float, volume: int, last_price: int, bid_lot: int, ask_lot: int):
+        """Update O(1) untuk satu snapshot baru"""
+        volume = int(volume)
+        total = bid_lot + ask_lot
+        strength = bid_lot / total if total > 0 else 0.0
+        imbalance = (bid_lot - ask_lot) / total if total > 0 else 0.0
+        self._push_window(timestamp, volume, strength, imbalance)
+
+        if self._last_volume is not None:
+            delta = volume - self._last_volume
+            if delta < 0:
+                self.reset_session()
+                delta = volume
+            self._add_at_price(int(last_price), delta)
+        self._last_volume = volume
+
+    def extend(self, timestamp: np.ndarray, volume: np.ndarray, last_price: np.ndarray,
+               bid_lot: np.ndarray, ask_lot: np.ndarray):
+        """Update bulk (mis. saat analyzer dibuat dari history panjang)"""
+        n = len(volume)
+        if n == 0:
+            return
+        volume = np.asarray(volume, dtype=np.int64)
+        last_price = np.asarray(last_price, dtype=np.int64)
+
+        # Histogram: selisih volume kumulatif, mulai dari reset sesi terakhir
+        previous = np.empty(n, dtype=np.int64)
+        previous[1:] = volume[:-1]
+        previous[0] = volume[0] if self._last_volume is None else self._last_volume
+        delta = volume - previous
+        resets = np.flatnonzero(delta < 0)
+        start = 0
+        if len(resets):
+            start = int(resets[-1])
+            self.reset_session()
+            delta[start] = volume[start]
+        prices, inverse = np.unique(last_price[start:], return_inverse=True)
+        lots = np.bincount(inverse, weights=delta[start:], minlength=len(prices)).astype(np.int64)
+        for price, lot in zip(prices.tolist(), lots.tolist()):
+            self._add_at_price(price, lot)
+        self._last_volume = int(volume[-1])
+
+        # Window: cukup snapshot terakhir yang masih muat
+        keep = slice(max(0, n - self.window), n)
+        bid_lot = np.asarray(bid_lot[keep], dtype=np.int64)
+        ask_lot = np.asarray(ask_lot[keep], dtype=np.int64)
+        total = bid_lot + ask_lot
+        safe_total = np.where(total > 0, total, 1)
+        strength = np.where(total > 0, bid_lot / safe_total, 0.0)
+        imbalance = np.where(total > 0, (bid_lot - ask_lot) / safe_total, 0.0)
+        for ts, vol, bs, imb in zip(timestamp[keep].tolist(), volume[keep].tolist(),
+                                    strength.tolist(), imbalance.tolist()):
+            self._push_window(ts, vol, bs, imb)
+
+    # Query
+
+    def _order(self) -> np.ndarray:
+        return (self._head - self._size + np.arange(self._size)) % self.window
+
+    def avg_volume(self) -> float:
+        return self._sum_volume / self._size if self._size else 0.0
+
+    def avg_bid_strength(self) -> float:
+        return self._sum_strength / self._size if self._size else 0.0
+
+    def avg_imbalance(self) -> float:
+        return self._sum_imbalance / self._size if self._size else 0.0
+
+    def volume_trend(self) -> str:
+        if not self._size:
+            return "decreasing"
+        first = self.volume[(self._head - self._size) % self.window]
+        last = self.volume[(self._head - 1) % self.window]
+        return "increasing" if last > first else "decreasing"
+
+    def vwap(self) -> Optional[float]:
+        """VWAP sesi dari histogram"""
+        return self._traded_value / self._traded if self._traded else None
+
+    def volume_at(self, price: int) -> int:
+        return self.histogram.get(price, 0)
+
+    def traded_volume(self) -> int:
+        return self._traded
+
+    def rows(self) -> List[Dict]:
+        """Isi window, urut dari yang terlama"""
+        order = self._order()
+        return [
+            {
+                "timestamp": float(ts),
+                "volume": int(vol),
+                "bid_strength": float(bs),
+                "imbalance": float(imb)
+            } for ts, vol, bs, imb in zip(self.timestamp[order], self.volume[order],
+                                          self.bid_strength[order], self.imbalance[order])
+        ]
+
+    def price_levels(self) -> Dict[int, int]:
+        """Histogram volume per harga, urut harga"""
+        return dict(sorted(self.histogram.items()))
+
+    def panel(self) -> Dict:
+        """Ringkasan untuk tampilan live (VWAP, POC, rata-rata window)"""
+        return {
+            "vwap": self.vwap(),
+            "poc": self.poc,
+            "poc_volume": self.histogram.get(self.poc, 0) if self.poc is not None else 0,
+            "traded_volume": self._traded,
+            "avg_volume": self.avg_volume(),
+            "avg_bid_strength": self.avg_bid_strength(),
+            "avg_imbalance": self.avg_imbalance(),
+            "volume_trend": self.volume_trend()
+        }
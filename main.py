@@ -1,11 +1,3 @@
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import time
-import random
-from typing import Dict, List, Tuple, Optional
-import matplotlib.pyplot as plt
-from collections import defaultdict
 import warnings
 
 from classes.StockMonitor import StockMonitor
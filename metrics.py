@@ -0,0 +1,159 @@
+"""
+Timer dan counter per stage untuk hot path (HTTP, parse, analisis, render).
+
+Mati secara default; saat mati tiap titik ukur hanya satu cek atribut.
+Aktifkan dengan METRICS.enable() atau env STOCKMONITOR_METRICS=1, lalu baca
+lewat METRICS.snapshot() atau dump ke JSON / Prometheus text (METRICS.dump).
+"""
+import json
+import os
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """Registry counter dan timer (count, total, max detik) per nama stage"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters: Dict[str, int] = {}
+        self.timers: Dict[str, List[float]] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.timers = {}
+            self.started = time.time()
+
+    def incr(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds > stats[2]:
+                    stats[2] = seconds
+
+    def timer(self, name: str):
+        """Context manager: `with METRICS.timer("parse"): ...`"""
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def snapshot(self) -> Dict:
+        """Salinan nilai saat ini; rate = counter per detik sejak enable/reset"""
+        with self._lock:
+            elapsed = max(time.time() - self.started, 1e-9)
+            counters = dict(self.counters)
+            timers = {
+                name: {
+                    "count": int(count),
+                    "total_s": total,
+                    "mean_s": total / count,
+                    "max_s": peak
+                } for name, (count, total, peak) in self.timers.items()
+            }
+        return {
+            "uptime_s": elapsed,
+            "counters": counters,
+            "rates": {name: value / elapsed for name, value in counters.items()},
+            "timers": timers
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def to_prometheus(self, prefix: str = 'stockmonitor') -> str:
+        """Format teks Prometheus (counter per nama, timer sebagai summary per stage)"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        if snapshot["timers"]:
+            metric = f"{prefix}_stage_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for name, stats in sorted(snapshot["timers"].items()):
+                lines.append(f'{metric}_count{{stage="{name}"}} {stats["count"]}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {stats["total_s"]:.9f}')
+            lines.append(f"# TYPE {metric}_max gauge")
+            for name, stats in sorted(snapshot["timers"].items()):
+                lines.append(f'{metric}_max{{stage="{name}"}} {stats["max_s"]:.9f}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Tulis snapshot ke file: .prom/.txt sebagai Prometheus text, selain itu JSON"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json() + "\n"
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+
+def _metric_name(name: str) -> str:
+    return ''.join(c if c.isalnum() else '_' for c in name).strip('_').lower()
+
+
+METRICS = Metrics(enabled=os.environ.get('STOCKMONITOR_METRICS') == '1')
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator timer per panggilan; nama default <Class>.<method>"""
+    def decorator(func: Callable) -> Callable:
+        stage = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                METRICS.observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 
 @dataclass
@@ -15,3 +17,71 @@ class OrderBook:
     ask: List[Order]
     last_price: int
     volume: int
+    timestamp: Optional[float] = None
+
+
+@dataclass
+class OrderBookArrays:
+    """Snapshot order book dalam bentuk array per side, tanpa objek Order"""
+    bid_price: np.ndarray
+    bid_lot: np.ndarray
+    bid_freq: np.ndarray
+    ask_price: np.ndarray
+    ask_lot: np.ndarray
+    ask_freq: np.ndarray
+    last_price: int
+    volume: int
+    timestamp: Optional[float] = None
+
+
+@dataclass
+class RecordTable:
+    """
+    Tabel kecil berbasis structured array. DataFrame hanya dibuat lewat
+    to_frame() untuk tampilan; `index` menyimpan nomor baris asal.
+    """
+    records: np.ndarray
+    index: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        if self.index is None:
+            self.index = np.arange(len(self.records))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.records[column]
+
+    def take(self, rows) -> 'RecordTable':
+        return RecordTable(self.records[rows], self.index[rows])
+
+    def head(self, n: int = 5) -> 'RecordTable':
+        return self.take(slice(0, n))
+
+    def sort_desc(self, column: str) -> 'RecordTable':
+        # Urutan baris sama dengan DataFrame.sort_values(column, ascending=False)
+        reverse = np.arange(len(self.records))[::-1]
+        order = reverse[self.records[column][::-1].argsort(kind='quicksort')][::-1]
+        return self.take(order)
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.records, index=self.index)
+
+
+@dataclass
+class BrokerSummary:
+    """Broker summary dengan split foreign/local yang sudah dihitung"""
+    table: RecordTable
+    foreign: RecordTable
+    local: RecordTable
+    foreign_net: int
+    local_net: int
+
+
+@dataclass
+class DummyOrderBook:
+    """Order book dummy per side (kolom price, volume)"""
+    bid: RecordTable
+    ask: RecordTable
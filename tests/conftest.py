@@ -0,0 +1,88 @@
+import os
+import sys
+
+# Modul repo di-import dari root (models, OrderBookAnalyzer, classes.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import numpy as np
+import pytest
+
+from classes.SyntheticOrderBookGenerator import SyntheticOrderBookGenerator
+from models import OrderBook, OrderBookArrays
+
+# Method OrderBookAnalyzer yang dibandingkan antar cara membangun history
+METHODS = ['detect_fake_bid', 'detect_spoofing', 'bullish_score', 'signal',
+           'strongest_demand', 'strongest_supply', 'calculate_imbalance', 'volume_profile']
+
+
+def synthetic_books(seed: int, n: int, depth: int = 20):
+    """Stream order book sintetis yang deterministik per seed"""
+    return list(SyntheticOrderBookGenerator(seed=seed, depth=depth).stream(n))
+
+
+def to_arrays(ob: OrderBook) -> OrderBookArrays:
+    """OrderBook dalam bentuk hasil decode_orderbook_arrays"""
+    bid = np.array([(o.price, o.lot, o.freq) for o in ob.bid], dtype=np.int64).reshape(-1, 3)
+    ask = np.array([(o.price, o.lot, o.freq) for o in ob.ask], dtype=np.int64).reshape(-1, 3)
+    return OrderBookArrays(bid_price=bid[:, 0], bid_lot=bid[:, 1], bid_freq=bid[:, 2],
+                           ask_price=ask[:, 0], ask_lot=ask[:, 1], ask_freq=ask[:, 2],
+                           last_price=ob.last_price, volume=ob.volume, timestamp=ob.timestamp)
+
+
+class StubServer:
+    """
+    API lokal untuk test client HTTP: `routes` {path: payload JSON}, `failures`
+    {path: jumlah response 503 sebelum sukses}. Tiap request dicatat di `requests`.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.failures = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                stub.requests.append({'path': self.path, 'client': self.client_address,
+                                      'headers': dict(self.headers)})
+                if stub.failures.get(path, 0) > 0:
+                    stub.failures[path] -= 1
+                    status, payload = 503, {'error': 'unavailable'}
+                elif path in stub.routes:
+                    status, payload = 200, stub.routes[path]
+                else:
+                    status, payload = 404, {'error': 'not found'}
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05},
+                                       daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
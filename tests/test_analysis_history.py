@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import numpy as np
+
+from classes.AnalysisHistory import AnalysisHistory
+from classes.ShardedAnalyzer import RESULT_DTYPE
+
+SYMBOLS = ['BBCA', 'BBRI', 'TLKM']
+
+
+def _result(i: int) -> dict:
+    return {
+        'timestamp': datetime.fromtimestamp(1.7e9 + i),
+        'symbol': SYMBOLS[i % len(SYMBOLS)],
+        'score_components': {'total_score': float(i), 'foreign_accumulation': 1.0, 'broker_imbalance': 2.0,
+                             'orderbook_strength': 3.0, 'fake_order_penalty': -4.0},
+        'recommendation': {'signal': 'BUY' if i % 2 else 'HOLD', 'current_price': 1000 + i},
+        'foreign_net': i * 10,
+        'local_net': -i,
+        'orderbook_imbalance': 0.5,
+        'fake_signals': {'suspicious_level': i % 3, 'fake_bid': bool(i % 2), 'fake_ask': False},
+    }
+
+
+def test_ring_spills_oldest_records_in_batches(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    history = AnalysisHistory(capacity=10, spill_path=path, spill_batch=4)
+    for i in range(25):
+        history.append(_result(i))
+
+    spilled, records = history.spilled(), history.records()
+    assert len(spilled) % 4 == 0 and len(history) <= 10
+    assert len(spilled) + len(records) == 25
+    # Disk + memori = seluruh history, urut dari yang terlama
+    scores = np.concatenate([spilled['total_score'], records['total_score']])
+    assert scores.tolist() == list(range(25))
+
+    bbri = history.symbol_records('BBRI', include_spilled=True)
+    assert bbri['total_score'].tolist() == list(range(1, 25, 3))
+    assert len(history.symbol_records('BBRI')) < len(bbri)
+    assert len(history.symbol_records('UNKNOWN')) == 0
+
+
+def test_reload_after_flush_restores_strings(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    history = AnalysisHistory(capacity=8, spill_path=path)
+    for i in range(20):
+        history.append(_result(i))
+    history.flush()
+    assert len(history) == 0
+
+    reloaded = AnalysisHistory(capacity=8, spill_path=path)
+    spilled = reloaded.spilled()
+    assert len(spilled) == 20
+    rows = [reloaded.to_dict(record) for record in spilled]
+    assert [row['symbol'] for row in rows] == [_result(i)['symbol'] for i in range(20)]
+    assert rows[3] == {
+        'timestamp': 1.7e9 + 3, 'symbol': 'BBCA', 'signal': 'BUY', 'total_score': 3.0,
+        'foreign_accumulation': 1.0, 'broker_imbalance': 2.0, 'orderbook_strength': 3.0,
+        'fake_order_penalty': -4.0, 'foreign_net': 30, 'local_net': -3, 'orderbook_imbalance': 0.5,
+        'current_price': 1003, 'suspicious_level': 0, 'fake_bid': True, 'fake_ask': False
+    }
+
+    # Symbol yang sudah ada tidak ditulis ulang ke tabel string
+    reloaded.append(_result(1))
+    assert reloaded.symbol_records('BBRI', include_spilled=True)['total_score'].tolist()[-1] == 1.0
+    with open(f"{path}.strings", encoding='utf-8') as f:
+        assert sorted(f.read().split()) == sorted(SYMBOLS + ['BUY', 'HOLD'])
+
+
+def test_append_record_from_worker():
+    history = AnalysisHistory(capacity=4)
+    row = np.zeros((), dtype=RESULT_DTYPE)
+    row['symbol'], row['signal'], row['total_score'], row['current_price'] = 'ASII', 'STRONG BUY', 81.5, 5200
+    history.append_record(row)
+    history.append_record(row)
+
+    assert list(history)[-1]['symbol'] == 'ASII'
+    assert list(history)[-1]['signal'] == 'STRONG BUY'
+    assert history.symbol_records('ASII')['current_price'].tolist() == [5200, 5200]
+    # Tanpa spill_path record terlama dibuang
+    for _ in range(5):
+        history.append_record(row)
+    assert len(history) <= 4 and history.spilled().size == 0
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.BatchOrderBookAnalyzer import BatchOrderBookAnalyzer
+from classes.ScoringPipeline import ScoringPipeline
+from conftest import synthetic_books
+
+
+def _universe(seed: int, symbols: int = 40):
+    """Snapshot terakhir per symbol, tiap symbol dengan generator sendiri"""
+    return [synthetic_books(seed * 1000 + i, 5)[-1] for i in range(symbols)]
+
+
+def _assert_matches_per_symbol(books, scoring=None):
+    batch = BatchOrderBookAnalyzer(scoring)
+    result = batch.analyze(*batch.stack(books))
+    for i, ob in enumerate(books):
+        single = OrderBookAnalyzer([ob], scoring=scoring)
+        expected = single.bullish_score()
+        assert result["score"][i] == expected["score"], i
+        assert result["percentage"][i] == pytest.approx(expected["percentage"]), i
+        for name, points in expected["components"].items():
+            assert result["components"][name][i] == points, (i, name)
+        signal = single.signal()
+        assert result["signal"][i] == signal["signal"], i
+        assert result["confidence"][i] == signal["confidence"], i
+
+
+def test_custom_pipeline_applies_to_batch():
+    books = _universe(0)
+    scoring = ScoringPipeline({
+        "spread": {"bins": [0.2, 0.4, 0.8], "points": [30, 20, 10, 0]},
+        "bid_strength": {"weight": 2.0}
+    })
+    _assert_matches_per_symbol(books, scoring)
+
+    batch = BatchOrderBookAnalyzer(scoring)
+    default = BatchOrderBookAnalyzer()
+    custom_score = batch.analyze(*batch.stack(books))["score"]
+    default_score = default.analyze(*default.stack(books))["score"]
+    assert not np.array_equal(custom_score, default_score)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_batch_matches_per_symbol_analyzers(seed):
+    books = _universe(seed)
+    _assert_matches_per_symbol(books)
+
+    batch = BatchOrderBookAnalyzer()
+    result = batch.analyze(*batch.stack(books))
+    for i, ob in enumerate(books):
+        single = OrderBookAnalyzer([ob])
+        assert result["bid_strength"][i] == pytest.approx(single.bid_strength())
+        assert result["bid_ask_ratio"][i] == pytest.approx(single.bid_ask_ratio())
+        assert result["bid_value_ratio"][i] == pytest.approx(single.bid_value_ratio())
+        assert result["spread"][i] == single.spread()
+        assert result["spread_percentage"][i] == pytest.approx(single.spread_percentage())
+        imbalance = single.calculate_imbalance()
+        assert result["lot_imbalance"][i] == pytest.approx(imbalance["lot_imbalance"])
+        assert result["value_imbalance"][i] == pytest.approx(imbalance["value_imbalance"])
+
+
+def test_batch_uses_manipulation_flags_from_history():
+    streams = [synthetic_books(700 + i, 30) for i in range(30)]
+    analyzers = [OrderBookAnalyzer(stream) for stream in streams]
+    fake_bid = np.array([a.detect_fake_bid()["detected"] for a in analyzers])
+    spoofing = np.array([a.detect_spoofing()["detected"] for a in analyzers])
+
+    batch = BatchOrderBookAnalyzer()
+    result = batch.analyze(*batch.stack([stream[-1] for stream in streams]), fake_bid, spoofing)
+    for i, analyzer in enumerate(analyzers):
+        assert result["score"][i] == analyzer.bullish_score()["score"], i
+        assert result["signal"][i] == analyzer.signal()["signal"], i
@@ -0,0 +1,135 @@
+import json
+import random
+from collections import defaultdict
+
+import pytest
+
+from apis.stockbit import StockbitClient
+from classes.BrokerFlowEngine import SHARES_PER_LOT, BrokerFlowEngine
+from classes.StockPotentialAnalyzer import StockPotentialAnalyzer
+from classes.StockbitBandarDetector import StockbitBandarDetector
+
+FOREIGN = ['CITI', 'UBS', 'JPMORGAN', 'HSBC', 'DEUTSCHE', 'GOLDMAN', 'MORGAN']
+LOCAL = ['MIRA', 'BRI', 'MANDIRI', 'BNI', 'CIMB']
+SYMBOLS = ['BBCA', 'BBRI', 'TLKM']
+
+
+def _records(seed: int, n: int):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        broker = rng.choice(FOREIGN + LOCAL)
+        record = {'symbol': rng.choice(SYMBOLS), 'broker': broker}
+        if rng.random() < 0.3:
+            record['broker_type'] = 'F' if broker in FOREIGN else 'D'
+        if rng.random() < 0.7:
+            record.update(side=rng.choice(['BUY', 'SELL', 'B', 'S']), lot=rng.randint(1, 500),
+                          price=rng.randint(900, 1100))
+        else:
+            record.update(buy_lot=rng.randint(0, 800), sell_lot=rng.randint(0, 800),
+                          buy_value=rng.randint(0, 10 ** 8), sell_value=rng.randint(0, 10 ** 8))
+        records.append(record)
+    return records
+
+
+def _brute_force(records):
+    """{symbol: {broker: [buy_lot, sell_lot, buy_value, sell_value]}}"""
+    flows = defaultdict(lambda: defaultdict(lambda: [0, 0, 0, 0]))
+    for r in records:
+        flow = flows[r['symbol']][r['broker']]
+        if 'side' in r:
+            value = r['lot'] * r['price'] * SHARES_PER_LOT
+            if r['side'] in ('BUY', 'B'):
+                flow[0] += r['lot']
+                flow[2] += value
+            else:
+                flow[1] += r['lot']
+                flow[3] += value
+        else:
+            for i, key in enumerate(('buy_lot', 'sell_lot', 'buy_value', 'sell_value')):
+                flow[i] += r[key]
+    return flows
+
+
+def _assert_matches(engine, records):
+    expected = _brute_force(records)
+    for symbol in SYMBOLS:
+        brokers = expected[symbol]
+        nets = {b: f[0] - f[1] for b, f in brokers.items()}
+        foreign = sorted((nets[b] for b in brokers if b in FOREIGN), reverse=True)
+
+        assert engine.net(symbol) == (sum(nets[b] for b in brokers if b in FOREIGN),
+                                      sum(nets[b] for b in brokers if b in LOCAL))
+        top = engine.top_foreign(symbol, 3)
+        assert [net for _, net in top] == foreign[:3]
+        assert engine.foreign_strength(symbol) == pytest.approx(sum(foreign) / len(foreign) if foreign else 0)
+        assert all(broker in FOREIGN and nets[broker] == net for broker, net in top)
+
+        table = engine.summary(symbol).table
+        active = {b: f for b, f in brokers.items() if f[0] + f[1] > 0}
+        assert sorted(table['broker'].tolist()) == sorted(active)
+        assert table['net_lots'].tolist() == sorted(table['net_lots'].tolist(), reverse=True)
+        for row in range(len(table)):
+            buy, sell, buy_value, sell_value = active[str(table['broker'][row])]
+            assert (table['buy_lots'][row], table['sell_lots'][row]) == (buy, sell)
+            assert table['avg_price'][row] == (buy_value + sell_value) // max((buy + sell) * SHARES_PER_LOT, 1)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_flow_matches_brute_force(seed):
+    records = _records(seed, 2000)
+    engine = BrokerFlowEngine(FOREIGN)
+    for i, record in enumerate(records, 1):
+        engine.ingest(record)
+        if i % 250 == 0:
+            _assert_matches(engine, records[:i])
+
+
+@pytest.mark.parametrize('layout', ['list', 'data', 'lines'])
+def test_load_json_layouts(tmp_path, layout):
+    records = _records(10, 300)
+    path = tmp_path / 'flow.json'
+    if layout == 'list':
+        path.write_text(json.dumps(records))
+    elif layout == 'data':
+        path.write_text(json.dumps({'data': records}))
+    else:
+        path.write_text('\n'.join(json.dumps(r) for r in records) + '\n')
+
+    engine = BrokerFlowEngine(FOREIGN)
+    engine.load_json(str(path))
+    assert engine.records == len(records)
+    _assert_matches(engine, records)
+
+
+def test_fetch_from_stub_api(stub_server):
+    records = _records(11, 300)
+    stub_server.routes['/broker-flow'] = {'data': records}
+    client = StockbitClient(token='test-token', base_url=stub_server.url, backoff_factor=0)
+    engine = BrokerFlowEngine(FOREIGN)
+    try:
+        engine.fetch(client, '/broker-flow', {'date': '2026-01-02'})
+    finally:
+        client.close()
+
+    assert stub_server.requests[0]['path'] == '/broker-flow?date=2026-01-02'
+    _assert_matches(engine, records)
+
+
+def test_foreign_strength_uses_all_foreign_brokers():
+    # 7 broker asing: top-5 saja akan memberi rata-rata (900+...+500)/5 = 700
+    nets = [900, 800, 700, 600, 500, -2000, -3000]
+    engine = BrokerFlowEngine(FOREIGN)
+    engine.ingest_many({'symbol': 'BBCA', 'broker': broker, 'side': 'BUY' if net > 0 else 'SELL',
+                        'lot': abs(net), 'price': 1000} for broker, net in zip(FOREIGN, nets))
+
+    result = StockPotentialAnalyzer(engine).analyze_stock('BBCA', quiet=True)
+    assert engine.foreign_strength('BBCA') == sum(nets) / len(nets)
+    assert result['score_components']['foreign_accumulation'] == pytest.approx(sum(nets) / len(nets) / 500 * 40)
+
+
+def test_simulated_top_foreign_honors_n():
+    detector = StockbitBandarDetector()
+    top = detector.get_top_foreign_brokers(n=3)
+    assert len(top) == 3
+    assert top['net_buy_lots'].tolist() == sorted(top['net_buy_lots'].tolist(), reverse=True)
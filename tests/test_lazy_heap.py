@@ -0,0 +1,34 @@
+import random
+
+from classes.LazyHeap import LazyHeap
+
+
+def test_top_matches_sorted_latest_scores():
+    rng = random.Random(5)
+    heap = LazyHeap()
+    latest = {}
+    for _ in range(5000):
+        key = rng.randrange(100)
+        if rng.random() < 0.1:
+            heap.discard(key)
+            latest.pop(key, None)
+        else:
+            score = rng.randrange(30)
+            heap.push(key, score)
+            latest[key] = (score, heap.updates)
+
+    expected = sorted(latest, key=lambda k: (-latest[k][0], latest[k][1]))[:10]
+    assert [key for key, _, _ in heap.top(10)] == expected
+    # Entri basi dipangkas: heap tidak tumbuh sebanding jumlah push
+    assert len(heap.heap) <= 4 * len(heap) + 65
+
+
+def test_tie_and_rebuild():
+    heap = LazyHeap()
+    heap.rebuild([(5, 2, 'b', 'data-b'), (5, 1, 'a', 'data-a'), (7, 9, 'c', None)])
+    assert heap.top(3) == [('c', 7, None), ('a', 5, 'data-a'), ('b', 5, 'data-b')]
+
+    heap.discard('c')
+    heap.push('c', 1)
+    assert heap.top(1) == [('a', 5, 'data-a')]
+    assert len(heap) == 3
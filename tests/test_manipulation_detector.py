@@ -0,0 +1,78 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from models import Order, OrderBook
+
+LOTS = [50, 200, 600, 1200, 20000, 100000]
+
+
+def _stream(seed: int, n: int):
+    """Book acak dengan level besar ber-freq rendah yang muncul dan hilang"""
+    rng = random.Random(seed)
+    base = rng.choice([500, 1000, 2000, 5000])
+    books = []
+    for _ in range(n):
+        bid = [Order(price=base - i * 5 - rng.choice([0, 0, 5]), freq=rng.choice([1, 2, 3, 10]),
+                     lot=rng.choice(LOTS)) for i in range(rng.randint(0, 12))]
+        ask = [Order(price=base + (i + 1) * 5, freq=rng.choice([1, 2, 3, 10]),
+                     lot=rng.choice(LOTS[:5])) for i in range(rng.randint(0, 12))]
+        books.append(OrderBook(bid=bid, ask=ask, last_price=base, volume=rng.choice([0, 200000, 600000])))
+    return books
+
+
+def _brute_fake_bid(history, lookback):
+    persistence = defaultdict(list)
+    for i, ob in enumerate(history[-lookback:]):
+        for bid in ob.bid:
+            if bid.lot >= 500 and bid.freq <= 2:
+                persistence[bid.price].append(i)
+    fake_prices = [price for price, appearances in persistence.items() if len(appearances) <= 2]
+    return {"detected": len(fake_prices) > 0, "fake_prices": fake_prices, "count": len(fake_prices)}
+
+
+def _brute_spoofing(history, lookback, min_order_value=50000000):
+    timeline = defaultdict(list)
+    for i, ob in enumerate(history[-lookback:]):
+        for bid in ob.bid:
+            if bid.lot >= 1000 and bid.lot * bid.price >= min_order_value:
+                timeline[bid.price].append(i)
+    patterns = []
+    for price, appearances in timeline.items():
+        gaps = [b - a for a, b in zip(appearances, appearances[1:])]
+        if len(appearances) >= 3 and len(gaps) >= 2 and max(gaps) - min(gaps) <= 2:
+            patterns.append({"price": price, "appearances": appearances, "pattern": "regular_cancellation"})
+    return {"detected": len(patterns) > 0, "patterns": patterns, "count": len(patterns)}
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_incremental_detector_matches_brute_force(seed):
+    books = _stream(seed, 60)
+    analyzer = OrderBookAnalyzer([])
+    detected = 0
+    for n, ob in enumerate(books, 1):
+        analyzer.append(ob)
+        history = books[:n]
+        # Window bawaan lewat detector incremental, window lain lewat jalur vectorized
+        for lookback in (10, 4):
+            assert analyzer.detect_fake_bid(lookback) == _brute_fake_bid(history, min(lookback, n)), (n, lookback)
+        for lookback in (15, 6):
+            assert analyzer.detect_spoofing(lookback) == _brute_spoofing(history, min(lookback, n)), (n, lookback)
+        detected += analyzer.detect_fake_bid()["detected"] + analyzer.detect_spoofing()["detected"]
+    assert detected > 0
+
+
+@pytest.mark.parametrize('capacity', [20, 12, 5])
+def test_detector_after_ring_wrap_matches_brute_force(capacity):
+    # capacity < window detector: hanya snapshot yang masih ada di store yang dihitung
+    books = _stream(99, 80)
+    analyzer = OrderBookAnalyzer([], capacity=capacity)
+    for n, ob in enumerate(books, 1):
+        analyzer.append(ob)
+        history = books[max(0, n - capacity):n]
+        for lookback in (10, 4):
+            assert analyzer.detect_fake_bid(lookback) == _brute_fake_bid(history, min(lookback, len(history))), n
+        for lookback in (15, 6):
+            assert analyzer.detect_spoofing(lookback) == _brute_spoofing(history, min(lookback, len(history))), n
@@ -0,0 +1,92 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+from classes.StockbitBandarDetector import StockbitBandarDetector
+from classes.StockMonitor import StockMonitor
+from metrics import METRICS, Metrics, timed
+
+
+@pytest.fixture
+def global_metrics():
+    """METRICS global dinyalakan untuk satu test, state semula dipulihkan"""
+    enabled = METRICS.enabled
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.enable(enabled)
+    METRICS.reset()
+
+
+def test_disabled_registry_records_nothing():
+    metrics = Metrics()
+    metrics.incr('fetch')
+    metrics.observe('parse', 0.5)
+    with metrics.timer('render'):
+        pass
+    snapshot = metrics.snapshot()
+    assert snapshot['counters'] == {} and snapshot['timers'] == {}
+
+
+def test_counters_and_timer_stats():
+    metrics = Metrics(enabled=True)
+    metrics.incr('cycles')
+    metrics.incr('cycles', 4)
+    for seconds in (0.25, 1.0, 0.5):
+        metrics.observe('parse', seconds)
+    with metrics.timer('render'):
+        pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot['counters'] == {'cycles': 5}
+    assert snapshot['rates']['cycles'] == pytest.approx(5 / snapshot['uptime_s'])
+    assert snapshot['timers']['parse'] == {'count': 3, 'total_s': 1.75, 'mean_s': 1.75 / 3, 'max_s': 1.0}
+    assert snapshot['timers']['render']['count'] == 1
+
+    metrics.reset()
+    assert metrics.snapshot()['counters'] == {} and metrics.snapshot()['timers'] == {}
+
+
+def test_dump_json_and_prometheus(tmp_path):
+    metrics = Metrics(enabled=True)
+    metrics.incr('orderbook_unchanged', 2)
+    metrics.observe('Stockbit.get-foreign', 0.5)
+
+    metrics.dump(str(tmp_path / 'metrics.json'))
+    payload = json.loads((tmp_path / 'metrics.json').read_text(encoding='utf-8'))
+    assert payload['counters'] == {'orderbook_unchanged': 2}
+    assert payload['timers']['Stockbit.get-foreign']['max_s'] == 0.5
+
+    metrics.dump(str(tmp_path / 'metrics.prom'))
+    lines = (tmp_path / 'metrics.prom').read_text(encoding='utf-8').splitlines()
+    assert 'stockmonitor_orderbook_unchanged_total 2' in lines
+    assert 'stockmonitor_stage_seconds_count{stage="Stockbit.get-foreign"} 1' in lines
+    assert 'stockmonitor_stage_seconds_max{stage="Stockbit.get-foreign"} 0.500000000' in lines
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_timed_uses_qualname_and_records_on_error(global_metrics):
+    @timed('custom')
+    def fail():
+        raise ValueError('gagal')
+
+    with pytest.raises(ValueError):
+        fail()
+    StockbitBandarDetector().get_foreign_strength('BBCA')
+
+    timers = global_metrics.snapshot()['timers']
+    assert timers['custom']['count'] == 1
+    assert timers['StockbitBandarDetector.get_foreign_strength']['count'] == 1
+
+
+def test_monitor_dumps_metrics_per_cycle(tmp_path, global_metrics):
+    path = tmp_path / 'metrics.json'
+    monitor = StockMonitor(['AAAA', 'BBBB'], output='none', metrics_path=str(path))
+    with contextlib.redirect_stdout(io.StringIO()):
+        monitor.run_single_analysis()
+        monitor.run_single_analysis()
+    payload = json.loads(path.read_text(encoding='utf-8'))
+    assert payload['counters']['cycles'] == 2
+    assert payload['timers']['cycle']['count'] == 2
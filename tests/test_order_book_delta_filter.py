@@ -0,0 +1,51 @@
+from dataclasses import replace
+
+from classes.OrderBookDeltaFilter import OrderBookDeltaFilter
+from conftest import synthetic_books, to_arrays
+
+
+def _brute_changed(previous, current, side):
+    old = {(o.price, o.lot, o.freq) for o in getattr(previous, side)}
+    new = {(o.price, o.lot, o.freq) for o in getattr(current, side)}
+    return sorted({level[0] for level in old ^ new})
+
+
+def test_diff_reports_changed_levels():
+    books = synthetic_books(4, 60, depth=10)
+    delta_filter = OrderBookDeltaFilter()
+    first = delta_filter.diff('AAAA', to_arrays(books[0]))
+    assert first == {'bid': [o.price for o in books[0].bid], 'ask': [o.price for o in books[0].ask],
+                     'last_price': True, 'volume': True}
+
+    for previous, current in zip(books, books[1:]):
+        delta = delta_filter.diff('AAAA', to_arrays(current))
+        assert delta['bid'] == _brute_changed(previous, current, 'bid')
+        assert delta['ask'] == _brute_changed(previous, current, 'ask')
+        assert delta['last_price'] == (previous.last_price != current.last_price)
+        assert delta['volume'] == (previous.volume != current.volume)
+    assert delta_filter.reset_cycle() == {'processed': 60, 'skipped': 0}
+
+
+def test_unchanged_snapshot_is_skipped_ignoring_timestamp():
+    snapshot = to_arrays(synthetic_books(5, 1)[0])
+    delta_filter = OrderBookDeltaFilter()
+    assert delta_filter.diff('AAAA', snapshot) is not None
+    assert delta_filter.diff('AAAA', replace(snapshot, timestamp=snapshot.timestamp + 60)) is None
+    # Symbol lain punya state sendiri
+    assert delta_filter.diff('BBBB', snapshot) is not None
+
+    bid_lot = snapshot.bid_lot.copy()
+    bid_lot[0] += 1
+    delta = delta_filter.diff('AAAA', replace(snapshot, bid_lot=bid_lot))
+    assert delta['bid'] == [int(snapshot.bid_price[0])] and delta['ask'] == []
+    assert delta_filter.reset_cycle() == {'processed': 3, 'skipped': 1}
+    assert delta_filter.reset_cycle() == {'processed': 0, 'skipped': 0}
+
+
+def test_unchanged_raw_compares_bytes_per_symbol():
+    delta_filter = OrderBookDeltaFilter()
+    assert not delta_filter.unchanged_raw('AAAA', b'{"data": 1}')
+    assert delta_filter.unchanged_raw('AAAA', b'{"data": 1}')
+    assert not delta_filter.unchanged_raw('BBBB', b'{"data": 1}')
+    assert not delta_filter.unchanged_raw('AAAA', b'{"data": 2}')
+    assert delta_filter.reset_cycle() == {'processed': 0, 'skipped': 1}
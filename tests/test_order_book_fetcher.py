@@ -0,0 +1,34 @@
+import time
+
+from classes.OrderBookFetcher import OrderBookFetcher
+
+
+class _Client:
+    base_url = 'https://example.invalid/api'
+
+    def get_orderbook_companies(self, symbol):
+        return {"symbol": symbol}
+
+    def close(self):
+        pass
+
+
+def test_limiter_state_persists_across_runs():
+    fetcher = OrderBookFetcher(_Client(), max_concurrency=4, rate_per_host=20.0, burst=4)
+    limiter = fetcher.limiter_for('example.invalid')
+    try:
+        started = time.monotonic()
+        first = fetcher.run(['A', 'B', 'C', 'D'])
+        burst = time.monotonic() - started
+
+        started = time.monotonic()
+        second = fetcher.run(['E', 'F', 'G', 'H'])
+        throttled = time.monotonic() - started
+    finally:
+        fetcher.close()
+
+    assert fetcher.limiter_for('example.invalid') is limiter
+    assert all(r["error"] is None for r in first + second)
+    # Burst habis di siklus pertama; siklus kedua menunggu refill ~4/20 detik
+    assert burst < 0.1
+    assert throttled >= 0.15
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.OrderBookStore import INITIAL_ROWS, OrderBookStore
+from conftest import METHODS, synthetic_books
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_appended_matches_list_built_for_deep_books(seed):
+    books = synthetic_books(seed, 40, depth=25)
+    appended = OrderBookAnalyzer([])
+    for ob in books:
+        appended.append(ob)
+    built = OrderBookAnalyzer(books)
+
+    assert appended.history.depth == 25
+    for method in METHODS:
+        assert repr(getattr(appended, method)()) == repr(getattr(built, method)()), method
+
+
+def test_empty_store_allocates_lazily():
+    store = OrderBookStore()
+    assert store.bid_price.shape == (INITIAL_ROWS, 20)
+
+    for ob in synthetic_books(0, INITIAL_ROWS * 3, depth=10):
+        store.append(ob)
+    assert len(store) == INITIAL_ROWS * 3
+    assert store.bid_price.shape[0] < store.capacity
+
+
+def test_ring_wraps_after_growth():
+    books = synthetic_books(1, 250, depth=10)
+    store = OrderBookStore(capacity=100, depth=10)
+    for ob in books:
+        store.append(ob)
+
+    assert len(store) == 100
+    assert [ob.volume for ob in store] == [ob.volume for ob in books[-100:]]
+    assert store[-1].bid == books[-1].bid
+
+
+def test_depth_grows_and_keeps_older_snapshots():
+    narrow = synthetic_books(2, 5, depth=5)
+    wide = synthetic_books(3, 5, depth=30)
+    store = OrderBookStore(capacity=20, depth=5)
+    for ob in narrow + wide:
+        store.append(ob)
+
+    assert store.depth == 30
+    assert [ob.bid for ob in store] == [ob.bid for ob in narrow + wide]
+    assert np.all(store.bid_price[store.slots()[:5]][:, 5:] == 0)
+
+
+def test_fixed_depth_rejects_wider_books():
+    store = OrderBookStore(capacity=4, depth=5, grow_depth=False)
+    with pytest.raises(ValueError):
+        store.append(synthetic_books(4, 1, depth=8)[0])
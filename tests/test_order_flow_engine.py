@@ -0,0 +1,105 @@
+import random
+
+import numpy as np
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.OrderFlowEngine import (ADDED, BID, DECREASED, INCREASED, MODIFIED, REMOVED,
+                                     CancellationMonitor, OrderFlowEngine, diff_side)
+from classes.ScoringPipeline import ScoringPipeline
+from conftest import synthetic_books
+from models import Order, OrderBook
+
+
+def _side(*levels):
+    return tuple(np.array(column, dtype=np.int64) for column in zip(*levels))
+
+
+def test_diff_side_kinds():
+    previous = _side((100, 10, 1), (101, 10, 1), (102, 10, 1), (103, 10, 1))
+    current = _side((101, 15, 1), (102, 5, 1), (103, 10, 4), (104, 7, 2))
+    kind, price, lot, lot_delta, freq, freq_delta = diff_side(previous, current)
+
+    assert price.tolist() == [100, 101, 102, 103, 104]
+    assert kind.tolist() == [REMOVED, INCREASED, DECREASED, MODIFIED, ADDED]
+    assert lot_delta.tolist() == [-10, 5, -5, 0, 7]
+    assert freq_delta.tolist() == [-1, 0, 0, 3, 2]
+
+
+def _random_book(rng: random.Random) -> OrderBook:
+    bid = sorted(rng.sample(range(100, 130), rng.randint(0, 8)), reverse=True)
+    ask = sorted(rng.sample(range(125, 160), rng.randint(0, 8)))
+
+    def level(price: int) -> Order:
+        return Order(price=price, freq=rng.randint(1, 3), lot=rng.choice([100, 200, 1000]))
+    return OrderBook([level(p) for p in bid], [level(p) for p in ask], 120, 1000)
+
+
+def _brute_force_events(previous: OrderBook, current: OrderBook):
+    events = []
+    for side, (before, after) in enumerate(((previous.bid, current.bid), (previous.ask, current.ask))):
+        old = {o.price: (o.lot, o.freq) for o in before}
+        new = {o.price: (o.lot, o.freq) for o in after}
+        for price in sorted(set(old) | set(new)):
+            if price not in old:
+                events.append((side, ADDED, price, new[price][0], new[price][0], new[price][1], new[price][1]))
+            elif price not in new:
+                events.append((side, REMOVED, price, 0, -old[price][0], 0, -old[price][1]))
+            elif old[price] != new[price]:
+                lot_delta = new[price][0] - old[price][0]
+                kind = INCREASED if lot_delta > 0 else DECREASED if lot_delta < 0 else MODIFIED
+                events.append((side, kind, price, new[price][0], lot_delta,
+                               new[price][1], new[price][1] - old[price][1]))
+    return events
+
+
+def test_events_match_brute_force_diff():
+    rng = random.Random(1)
+    previous = _random_book(rng)
+    analyzer = OrderBookAnalyzer([previous], capacity=50)
+    received = []
+    analyzer.subscribe_order_flow(received.append)
+
+    for i in range(500):
+        book = _random_book(rng)
+        received.clear()
+        analyzer.append(book, timestamp=float(i))
+        events = received[0] if received else []
+        got = [tuple(int(e[k]) for k in ('side', 'kind', 'price', 'lot', 'lot_delta', 'freq', 'freq_delta'))
+               for e in events]
+        assert got == _brute_force_events(previous, book), i
+        previous = book
+
+
+def test_freq_only_change_is_not_a_cancel():
+    engine = OrderFlowEngine()
+    monitor = CancellationMonitor(engine, min_order_value=0)
+    ask = _side((200, 10, 1))
+    engine.reset(_side((100, 10, 1), (99, 10, 1)), ask)
+
+    engine.push_levels(_side((100, 10, 3), (99, 10, 1)), ask)
+    assert monitor.summary() == {"cancelled_bid_lot": 0, "cancelled_ask_lot": 0, "large_cancels": 0}
+
+    events = engine.push_levels(_side((100, 4, 3), (99, 10, 1)), ask)
+    assert events['kind'].tolist() == [DECREASED] and events['side'].tolist() == [BID]
+    assert monitor.summary()["cancelled_bid_lot"] == 6
+
+
+def test_large_cancels_stage_is_opt_in():
+    books = synthetic_books(5, 40)
+    default = OrderBookAnalyzer(books[:1])
+    for ob in books[1:]:
+        default.append(ob)
+    assert "large_cancels" not in default.bullish_score()["components"]
+    assert default.order_flow is None
+
+    scoring = ScoringPipeline({"large_cancels": {"bins": [0, 2], "points": [10, 5, 0]}})
+    analyzer = OrderBookAnalyzer(books[:1], scoring=scoring)
+    analyzer.bullish_score()
+    for ob in books[1:]:
+        analyzer.append(ob)
+    score = analyzer.bullish_score()
+    large = analyzer.cancellations()["large_cancels"]
+
+    assert analyzer.order_flow is not None
+    assert score["components"]["large_cancels"] == (10 if large == 0 else 5 if large <= 2 else 0)
+    assert score["score"] == sum(score["components"].values())
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from apis.orderbook_parser import decode_orderbook_arrays, parse_orderbook
+
+PAYLOAD = {"data": {"lastprice": 9000, "volume": 1234500,
+                    "bid": [{"price": "8975", "volume": "120000", "que_num": "35"},
+                            {"price": "8950", "volume": "1,000", "que_num": "2"}],
+                    "offer": [{"price": "9000", "volume": "80000", "que_num": "12"}]}}
+
+
+def test_decoders_agree():
+    raw = json.dumps(PAYLOAD).encode('utf-8')
+    arrays = decode_orderbook_arrays(raw, timestamp=1.0)
+    book = parse_orderbook(raw, timestamp=1.0)
+
+    assert arrays.bid_price.tolist() == [o.price for o in book.bid] == [8975, 8950]
+    assert arrays.bid_lot.tolist() == [o.lot for o in book.bid] == [1200, 10]
+    assert arrays.ask_freq.tolist() == [o.freq for o in book.ask] == [12]
+    assert arrays.last_price == book.last_price == 9000
+
+
+def test_empty_sides_are_valid():
+    arrays = decode_orderbook_arrays({"data": {"bid": [], "offer": []}}, timestamp=1.0)
+    assert len(arrays.bid_price) == 0 and len(arrays.ask_price) == 0
+
+
+@pytest.mark.parametrize('payload', [{"error": "not found"}, {"data": {"message": "rate limited"}},
+                                     {"data": None}, b'{"message": "Unauthorized"}'])
+def test_error_body_is_rejected(payload):
+    with pytest.raises(ValueError):
+        decode_orderbook_arrays(payload)
+    with pytest.raises(ValueError):
+        parse_orderbook(payload)
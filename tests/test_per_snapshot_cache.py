@@ -0,0 +1,46 @@
+import copy
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from conftest import synthetic_books
+
+
+def _analyzer(**kwargs):
+    return OrderBookAnalyzer(synthetic_books(3, 30), **kwargs)
+
+
+def test_mutating_result_does_not_corrupt_cache():
+    analyzer = _analyzer()
+    expected = {name: copy.deepcopy(getattr(analyzer, name)())
+                for name in ('detect_fake_bid', 'strongest_demand', 'signal', 'volume_profile')}
+
+    analyzer.detect_fake_bid()["fake_prices"].append(-1)
+    analyzer.strongest_demand()["orders"][0]["lot"] = -1
+    analyzer.signal()["market_depth"].clear()
+    analyzer.volume_profile()["data"].pop()
+
+    for name, value in expected.items():
+        assert getattr(analyzer, name)() == value, name
+    assert analyzer.get_summary()["trading_signal"] == expected["signal"]
+
+
+def test_repeated_calls_hit_cache():
+    analyzer = _analyzer()
+    first = analyzer.signal()
+    hits = analyzer.cache_hits
+    second = analyzer.signal()
+
+    assert second == first and second is not first
+    assert analyzer.cache_hits == hits + 1
+
+
+def test_copy_results_false_returns_cached_object():
+    analyzer = _analyzer(copy_results=False)
+    assert analyzer.signal() is analyzer.signal()
+
+
+def test_bullish_score_accepts_stage_list():
+    analyzer = _analyzer()
+    stages = ['imbalance', 'spread', 'volume']
+    first = analyzer.bullish_score(stages)
+    assert analyzer.bullish_score(stages=tuple(stages)) == first
+    assert set(first["components"]) == set(stages)
@@ -0,0 +1,127 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+from classes.Screener import SCREEN_STAGES, Screener, snapshot_metrics
+from classes.ScoringPipeline import ScoringPipeline
+from classes.StockMonitor import StockMonitor
+from models import OrderBookArrays
+
+
+def _snapshot(bid_lot: int, ask_lot: int, bid: int = 1000, ask: int = 1005, volume: int = 0):
+    one = np.array([1], dtype=np.int64)
+    return OrderBookArrays(bid_price=one * bid, bid_lot=one * bid_lot, bid_freq=one,
+                           ask_price=one * ask, ask_lot=one * ask_lot, ask_freq=one,
+                           last_price=bid, volume=volume, timestamp=1.0)
+
+
+def test_snapshot_metrics():
+    imbalance, spread, volume = snapshot_metrics(_snapshot(300, 100, volume=700))
+    assert imbalance == 0.5
+    assert spread == 0.5
+    assert volume == 700
+
+
+def _random_screener(seed: int, scoring=None):
+    """Universe acak: sebagian symbol tanpa data, sebagian hanya volume market"""
+    rng = random.Random(seed)
+    screener = Screener(shortlist=5, scoring=scoring)
+    symbols = [f'S{i:03d}' for i in range(60)]
+    for symbol in symbols:
+        kind = rng.random()
+        if kind < 0.6:
+            screener.update_snapshot(symbol, _snapshot(rng.randint(0, 900), rng.randint(0, 900),
+                                                       ask=rng.choice([1005, 1010, 1020]),
+                                                       volume=rng.choice([0, 200_000, 800_000])))
+        if 0.5 < kind < 0.8:
+            screener.update_market({symbol: float(rng.choice([50_000, 300_000, 900_000]))})
+    return screener, symbols
+
+
+def _brute_select(screener, symbols, n):
+    rows = {}
+    for symbol in symbols:
+        imbalance, spread, volume = screener.book.get(symbol, (np.nan,) * 3)
+        volume = screener.market_volume.get(symbol, volume)
+        values = {'imbalance': imbalance, 'spread': spread, 'volume': volume}
+        if not all(np.isnan(v) for v in values.values()):
+            rows[symbol] = sum(screener.scoring.config[name].score_value(values[name]) for name in SCREEN_STAGES)
+    unscreened = [symbol for symbol in symbols if symbol not in rows]
+    ranked = sorted(rows, key=lambda symbol: -rows[symbol])
+    if len(ranked) > n:
+        ranked = [symbol for symbol in ranked if rows[symbol] >= rows[ranked[n - 1]]]
+    return ranked + unscreened, rows
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_select_matches_brute_force(seed):
+    custom = ScoringPipeline({'imbalance': {'bins': [-0.5, 0.0, 0.5], 'points': [0, 10, 20, 40]}})
+    for scoring in (None, custom):
+        screener, symbols = _random_screener(seed, scoring)
+        for n in (None, 1, 12):
+            expected, rows = _brute_select(screener, symbols, screener.shortlist if n is None else n)
+            assert screener.select(symbols, n) == expected, (seed, n)
+            table = screener.last_table
+            assert table['symbol'].tolist() == symbols
+            assert [table['score'][i] for i, s in enumerate(symbols) if s in rows] == list(rows.values())
+
+
+def test_custom_scoring_changes_ranking():
+    screener = Screener(shortlist=1)
+    screener.update_snapshot('A', _snapshot(900, 100, ask=1020))  # imbalance tinggi, spread lebar
+    screener.update_snapshot('B', _snapshot(100, 100))            # seimbang, spread sempit
+    assert screener.select(['A', 'B']) == ['B']
+
+    screener.scoring = ScoringPipeline({'spread': {'bins': [1.0], 'points': [0, 0]}})
+    assert screener.select(['A', 'B']) == ['A']
+
+
+def test_table_keeps_input_order_and_nan_for_empty_sides():
+    screener = Screener()
+    empty = np.array([], dtype=np.int64)
+    screener.update_snapshot('A', OrderBookArrays(bid_price=empty, bid_lot=empty, bid_freq=empty,
+                                                  ask_price=empty, ask_lot=empty, ask_freq=empty,
+                                                  last_price=0, volume=0, timestamp=1.0))
+    screener.update_snapshot('B', _snapshot(300, 100, volume=700))
+    screener.update_market({'B': 1_000.0})
+    table = screener.table(['C', 'B', 'A'])
+    assert table['symbol'].tolist() == ['C', 'B', 'A']
+    assert np.isnan(table['imbalance'][[0, 2]]).all() and np.isnan(table['spread'][[0, 2]]).all()
+    assert table['volume'][1] == 1_000.0 and table['volume'][2] == 0.0
+    assert table['score'][1] == 10 + 15  # imbalance 0.5, spread 0.5 %, volume < 100k
+
+
+def test_symbols_without_data_pass_through():
+    screener = Screener(shortlist=2)
+    assert screener.select(list('ABCDEF')) == list('ABCDEF')
+
+    screener.update_snapshot('A', _snapshot(100, 300))
+    screener.update_snapshot('B', _snapshot(300, 100))
+    screener.update_snapshot('C', _snapshot(100, 100))
+    screener.update_snapshot('D', _snapshot(900, 100))
+    # E, F tanpa data: tetap diteruskan setelah top-2
+    assert screener.select(list('ABCDEF')) == ['B', 'D', 'E', 'F']
+
+
+def test_ties_are_kept_not_cut_by_input_order():
+    screener = Screener(shortlist=2)
+    for symbol in 'ABCD':
+        screener.update_snapshot(symbol, _snapshot(100, 100))
+    screener.update_snapshot('E', _snapshot(900, 100))
+    assert screener.select(list('ABCDE')) == ['E', 'A', 'B', 'C', 'D']
+
+
+def test_market_volume_counts_as_screening_data():
+    screener = Screener(shortlist=1)
+    screener.update_market({'B': 600_000.0, 'C': 50_000.0})
+    assert screener.select(list('ABC')) == ['B', 'A']
+
+
+def test_monitor_without_live_data_analyzes_every_symbol():
+    monitor = StockMonitor(list('ABCDEF'), output='none', shortlist=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = monitor.run_single_analysis()
+    assert sorted(r['symbol'] for r in results) == list('ABCDEF')
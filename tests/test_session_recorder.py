@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.SessionRecorder import SessionReader, SessionRecorder
+from classes.SessionReplayer import SessionReplayer
+from conftest import METHODS, synthetic_books
+from models import OrderBookArrays
+
+
+def test_replay_matches_list_built_analyzers(tmp_path):
+    path = str(tmp_path / 'session.bin')
+    books = {'AAAA': synthetic_books(1, 30), 'BBBB': synthetic_books(2, 30)}
+    with SessionRecorder(path) as recorder:
+        for a, b in zip(books['AAAA'], books['BBBB']):
+            recorder.record('AAAA', a)
+            recorder.record('BBBB', b)
+
+    replayer = SessionReplayer(path)
+    analyzers = replayer.run()
+    replayer.close()
+
+    assert replayer.replayed == 60
+    for symbol, symbol_books in books.items():
+        built = OrderBookAnalyzer(symbol_books)
+        for method in METHODS:
+            assert repr(getattr(analyzers[symbol], method)()) == repr(getattr(built, method)()), (symbol, method)
+
+
+def test_out_of_range_level_is_rejected(tmp_path):
+    path = str(tmp_path / 'session.bin')
+    big = np.array([2 ** 31], dtype=np.int64)
+    one = np.array([1], dtype=np.int64)
+    snapshot = OrderBookArrays(bid_price=one, bid_lot=big, bid_freq=one,
+                               ask_price=one + 1, ask_lot=one, ask_freq=one,
+                               last_price=1, volume=1, timestamp=1.0)
+    with SessionRecorder(path) as recorder:
+        recorder.record('AAAA', synthetic_books(1, 1)[0])
+        with pytest.raises(ValueError):
+            recorder.record('AAAA', snapshot)
+
+    # Record yang ditolak tidak meninggalkan data setengah jadi
+    reader = SessionReader(path)
+    assert len(reader.index) == 1
+    assert len(list(reader.iter())) == 1
+    reader.close()
@@ -0,0 +1,42 @@
+import os
+import signal
+
+from classes.BrokerFlowEngine import BrokerFlowEngine
+from classes.ShardedAnalyzer import ShardedAnalyzer
+
+
+def _flow() -> BrokerFlowEngine:
+    engine = BrokerFlowEngine(['AK', 'BK'])
+    engine.ingest_many([
+        {'symbol': 'AAAA', 'broker': 'AK', 'side': 'BUY', 'lot': 700, 'price': 1000},
+        {'symbol': 'AAAA', 'broker': 'BK', 'side': 'SELL', 'lot': 200, 'price': 1000},
+        {'symbol': 'AAAA', 'broker': 'YP', 'side': 'SELL', 'lot': 50, 'price': 1000},
+    ])
+    return engine
+
+
+def test_workers_use_broker_flow():
+    with ShardedAnalyzer(2, broker_flow=_flow()) as sharded:
+        records = sharded.analyze(['AAAA'])
+    assert not records['error'][0]
+    assert (records['foreign_net'][0], records['local_net'][0]) == (500, -50)
+
+
+def test_worker_errors_are_reported():
+    with ShardedAnalyzer(1) as sharded:
+        records = sharded.analyze(['AAAA', 'BBBB'], {'AAAA': 'bukan snapshot'})
+    by_symbol = {str(r['symbol']): bool(r['error']) for r in records}
+    assert by_symbol == {'AAAA': True, 'BBBB': False}
+    assert set(sharded.errors) == {'AAAA'}
+    assert sharded.errors['AAAA'].startswith('AttributeError')
+
+
+def test_dead_worker_is_replaced():
+    with ShardedAnalyzer(1, timeout=10) as sharded:
+        sharded.analyze(['AAAA'])
+        dead = sharded._processes[0]
+        os.kill(dead.pid, signal.SIGKILL)
+        dead.join()
+        records = sharded.analyze(['AAAA', 'BBBB'])
+        assert sharded._processes[0] is not dead
+    assert len(records) == 2 and not records['error'].any()
@@ -0,0 +1,60 @@
+import pytest
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.SnapshotArchive import SnapshotArchive
+from classes.SyntheticOrderBookGenerator import SyntheticOrderBookGenerator
+
+
+def _summary(analyzer):
+    summary = analyzer.get_summary()
+    summary.pop("timestamp")
+    return summary
+
+
+@pytest.fixture(scope='module')
+def books():
+    # Satu snapshot per menit, melewati beberapa pergantian hari
+    return list(SyntheticOrderBookGenerator(seed=1, depth=10, tick_interval=60, start_time=1.7e9).stream(3000))
+
+
+def test_query_and_load_match_list_built_analyzers(tmp_path, books):
+    with SnapshotArchive(str(tmp_path), depth=10) as archive:
+        for ob in books:
+            archive.append('BBCA', ob)
+
+    archive = SnapshotArchive(str(tmp_path), depth=10)
+    assert len(archive.days('BBCA')) >= 3
+
+    day_slices = archive.query('BBCA', books[100].timestamp, books[400].timestamp)
+    assert sum(len(s) for s in day_slices) == 300
+    from_archive = OrderBookAnalyzer(day_slices[0])
+    built = OrderBookAnalyzer(books[100:100 + len(day_slices[0])], depth=10)
+    assert _summary(from_archive) == _summary(built)
+
+    store = archive.load('BBCA', books[10].timestamp, books[2900].timestamp)
+    assert len(store) == 2890
+    assert _summary(OrderBookAnalyzer(store)) == _summary(OrderBookAnalyzer(books[10:2900], depth=10))
+
+    # Rentang dalam satu hari: memmap read-only tanpa copy
+    single_day = archive.load('BBCA', books[500].timestamp, books[600].timestamp)
+    with pytest.raises(ValueError):
+        single_day.append(books[0])
+
+
+def test_write_store_round_trip(tmp_path, books):
+    analyzer = OrderBookAnalyzer([])
+    for ob in books[:200]:
+        analyzer.append(ob)
+    with SnapshotArchive(str(tmp_path), depth=20) as archive:
+        archive.write_store('TLKM', analyzer.history)
+        loaded = archive.load('TLKM')
+
+    assert len(loaded) == 200
+    assert _summary(OrderBookAnalyzer(loaded)) == _summary(analyzer)
+
+
+def test_snapshot_wider_than_archive_is_rejected(tmp_path):
+    wide = SyntheticOrderBookGenerator(seed=2, depth=25).next()
+    with SnapshotArchive(str(tmp_path), depth=20) as archive:
+        with pytest.raises(ValueError):
+            archive.append('BBCA', wide)
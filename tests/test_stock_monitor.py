@@ -0,0 +1,73 @@
+import contextlib
+import io
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.StockMonitor import StockMonitor
+from conftest import synthetic_books
+
+
+def _live(seed: int) -> OrderBookAnalyzer:
+    return OrderBookAnalyzer(synthetic_books(seed, 30))
+
+
+def test_results_use_live_order_book_state():
+    monitor = StockMonitor(['AAAA', 'BBBB'], output='none')
+    live = {'AAAA': _live(1), 'BBBB': _live(2)}
+    monitor.orderbook_analyzers.update(live)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = monitor.run_single_analysis()
+
+    for result in results:
+        analyzer = live[result['symbol']]
+        fake_bid = analyzer.detect_fake_bid()['detected']
+        spoofing = analyzer.detect_spoofing()['detected']
+        assert result['orderbook_imbalance'] == analyzer.calculate_imbalance()['lot_imbalance']
+        assert result['fake_signals']['fake_bid'] == fake_bid
+        assert result['fake_signals']['suspicious_level'] == int(fake_bid) + int(spoofing)
+        assert result['score_components']['orderbook_strength'] == max(result['orderbook_imbalance'], 0) * 20
+
+
+def _scores(results):
+    return [result['score_components']['total_score'] for result in results]
+
+
+def test_single_analysis_returns_ranked_results_for_current_universe():
+    monitor = StockMonitor(['AAAA', 'BBBB', 'CCCC', 'DDDD'], output='none')
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = monitor.run_single_analysis()
+    assert _scores(first) == sorted(_scores(first), reverse=True)
+    assert {result['symbol'] for result in first} == {'AAAA', 'BBBB', 'CCCC', 'DDDD'}
+
+    monitor.symbols = ['EEEE', 'FFFF']
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        second = monitor.run_single_analysis()
+    assert [result['symbol'] for result in second] == [symbol for symbol, _ in monitor.leaderboard.top(2)]
+    assert set(monitor.leaderboard.scores) == {'EEEE', 'FFFF'}
+    assert 'AAAA' not in out.getvalue()
+
+
+def test_cycle_subset_keeps_live_leaderboard():
+    monitor = StockMonitor(['AAAA', 'BBBB', 'CCCC'], output='none')
+    with contextlib.redirect_stdout(io.StringIO()):
+        monitor.run_single_analysis()
+        subset = monitor.run_single_analysis(['BBBB'])
+    assert [result['symbol'] for result in subset] == ['BBBB']
+    assert len(monitor.leaderboard) == 3
+
+
+def test_output_none_is_silent_and_keeps_errors():
+    monitor = StockMonitor(['AAAA', 'BBBB', 'CCCC'], output='none', shortlist=2)
+    analyze_stock = monitor.analyzer.analyze_stock
+
+    def failing(symbol, **kwargs):
+        if symbol == 'BBBB':
+            raise RuntimeError('boom')
+        return analyze_stock(symbol, **kwargs)
+
+    monitor.analyzer.analyze_stock = failing
+    monitor.screener.select = lambda symbols: ['AAAA', 'BBBB']
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        results = monitor.run_single_analysis()
+    assert out.getvalue() == ''
+    assert [result['symbol'] for result in results] == ['AAAA']
+    assert monitor.errors == {'BBBB': 'Error analyzing BBBB: boom'}
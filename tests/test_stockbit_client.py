@@ -0,0 +1,67 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from apis.stockbit import MAIN_BOARD_FILTERS, StockbitClient
+
+ORDERBOOK_PATH = '/company-price-feed/v2/orderbook/companies/'
+
+
+def _client(stub_server, **kwargs):
+    return StockbitClient(token='test-token', base_url=stub_server.url + '/', backoff_factor=0, **kwargs)
+
+
+def test_requests_reuse_one_connection(stub_server):
+    for symbol in ('BBCA', 'BBRI', 'TLKM'):
+        stub_server.routes[ORDERBOOK_PATH + symbol] = {'data': {'symbol': symbol}}
+    client = _client(stub_server)
+    try:
+        payloads = [client.get_orderbook_companies(symbol) for symbol in ('BBCA', 'BBRI', 'TLKM')]
+    finally:
+        client.close()
+
+    assert [p['data']['symbol'] for p in payloads] == ['BBCA', 'BBRI', 'TLKM']
+    assert len({r['client'] for r in stub_server.requests}) == 1
+    assert all(r['headers']['Authorization'] == 'Bearer test-token' for r in stub_server.requests)
+
+
+def test_retries_on_503(stub_server):
+    stub_server.routes['/emitten/trending'] = {'data': []}
+    stub_server.failures['/emitten/trending'] = 2
+    client = _client(stub_server, retries=3)
+    try:
+        assert client.get_emitten_trending() == {'data': []}
+    finally:
+        client.close()
+    assert len(stub_server.requests) == 3
+
+
+def test_raw_orderbook_and_query_params(stub_server):
+    stub_server.routes[ORDERBOOK_PATH + 'BBCA'] = {'data': {'bid': []}}
+    stub_server.routes['/order-trade/market-mover'] = {'data': {'mover_list': []}}
+    client = _client(stub_server)
+    try:
+        raw = client.get_orderbook_companies_raw('BBCA')
+        client.set_token('rotated')
+        client.get_market_mover()
+    finally:
+        client.close()
+
+    assert raw == b'{"data": {"bid": []}}'
+    query = parse_qs(urlsplit(stub_server.requests[-1]['path']).query)
+    assert query['mover_type'] == ['MOVER_TYPE_TOP_GAINER']
+    assert query['filter_stocks'] == MAIN_BOARD_FILTERS
+    assert stub_server.requests[-1]['headers']['Authorization'] == 'Bearer rotated'
+
+
+def test_error_status_raises(stub_server):
+    stub_server.failures[ORDERBOOK_PATH + 'BBCA'] = 10
+    client = _client(stub_server, retries=1)
+    try:
+        with pytest.raises(requests.HTTPError):
+            client.get_orderbook_companies_raw('BBCA')
+        with pytest.raises(requests.HTTPError):
+            client.get_orderbook_companies_raw('MISSING')
+    finally:
+        client.close()
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.TopLevels import DEEP_BOOK_LEVELS, TopLevelTracker, strength_scores, top_k
+from models import Order, OrderBook
+
+
+def _expected(prices, lots, freqs, k):
+    return [(int(prices[i]), int(lots[i]), int(freqs[i]))
+            for i in np.argsort(-strength_scores(lots, freqs), kind='stable')[:k]]
+
+
+def test_top_k_matches_stable_argsort():
+    rng = np.random.default_rng(0)
+    for n in (0, 5, DEEP_BOOK_LEVELS + 1, 3000):
+        scores = rng.integers(0, 20, n).astype(float)  # banyak skor sama
+        for k in (0, 1, 7, n + 3):
+            assert np.array_equal(top_k(scores, k), np.argsort(-scores, kind='stable')[:k]), (n, k)
+
+
+@pytest.mark.parametrize('side', ['bid', 'ask'])
+def test_tracker_matches_full_sort_per_tick(side):
+    rng = np.random.default_rng(1)
+    prices = np.arange(1000, 1000 + 300 * 5, 5)
+    lots = rng.integers(1, 300, len(prices))
+    freqs = rng.integers(1, 10, len(prices))
+    tracker = TopLevelTracker(side)
+    for tick in range(400):
+        # Sebagian kecil level berubah, tangga harga kadang bergeser, sesekali hampir semua berubah
+        changed = rng.integers(0, len(prices), 150 if tick % 97 == 0 else 5)
+        lots[changed] = rng.integers(1, 300, len(changed))
+        freqs[changed] = rng.integers(1, 10, len(changed))
+        offset = int(rng.integers(0, 3))
+        p, l, f = prices[offset:offset + 250], lots[offset:offset + 250], freqs[offset:offset + 250]
+        if side == 'bid':
+            p, l, f = p[::-1], l[::-1], f[::-1]
+        tracker.update(p, l, f)
+        assert tracker.top(3) == _expected(p, l, f, 3), tick
+    # Entri basi dipangkas
+    assert len(tracker.heap.heap) <= 4 * len(tracker.heap) + 65
+
+
+def test_tracker_recovers_after_unsorted_snapshot():
+    tracker = TopLevelTracker('bid')
+    tracker.update(np.array([100, 105, 100]), np.array([500, 10, 900]), np.array([1, 1, 1]))
+    assert not tracker.sorted
+    prices, lots, freqs = np.array([110, 105, 100]), np.array([5, 700, 300]), np.array([2, 1, 1])
+    tracker.update(prices, lots, freqs)
+    assert tracker.sorted
+    assert tracker.top(2) == _expected(prices, lots, freqs, 2)
+
+
+def test_deep_book_strongest_levels_match_full_sort():
+    rng = np.random.default_rng(2)
+    levels = DEEP_BOOK_LEVELS + 200
+    analyzer = OrderBookAnalyzer([], depth=levels)
+    lots = rng.integers(1, 2000, levels)
+    for _ in range(5):
+        lots[rng.integers(0, levels, 10)] = rng.integers(1, 2000, 10)
+        bid = [Order(price=10000 - i, freq=1 + i % 4, lot=int(lot)) for i, lot in enumerate(lots)]
+        ask = [Order(price=10001 + i, freq=1 + i % 3, lot=int(lot)) for i, lot in enumerate(lots)]
+        analyzer.append(OrderBook(bid=bid, ask=ask, last_price=10000, volume=0))
+
+        for result, side in ((analyzer.strongest_demand(3), bid), (analyzer.strongest_supply(3), ask)):
+            prices = np.array([o.price for o in side])
+            side_lots = np.array([o.lot for o in side])
+            freqs = np.array([o.freq for o in side])
+            assert [(o['price'], o['lot'], o['freq']) for o in result['orders']] == \
+                _expected(prices, side_lots, freqs, 3)
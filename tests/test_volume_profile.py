@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pytest
+
+from OrderBookAnalyzer import OrderBookAnalyzer
+from classes.VolumeProfile import StreamingVolumeProfile
+from conftest import synthetic_books
+
+
+def _ticks(seed: int, n: int):
+    """(timestamp, volume kumulatif, last price, bid lot, ask lot) dengan reset sesi di tengah"""
+    rng = random.Random(seed)
+    ticks, volume = [], 0
+    for i in range(n):
+        volume = rng.randint(0, 50) if i == n // 2 else volume + rng.choice([0, 0, 100, 500])
+        ticks.append((1.7e9 + i, volume, rng.choice([995, 1000, 1005]), rng.randint(0, 900), rng.randint(0, 900)))
+    return ticks
+
+
+def _brute_histogram(ticks):
+    histogram, previous = {}, None
+    for _, volume, price, _, _ in ticks:
+        if previous is not None:
+            delta = volume - previous
+            if delta < 0:
+                histogram, delta = {}, volume
+            if delta > 0:
+                histogram[price] = histogram.get(price, 0) + delta
+        previous = volume
+    return histogram
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_push_and_extend_match_brute_force(seed):
+    ticks = _ticks(seed, 80)
+    pushed = StreamingVolumeProfile(window=20)
+    for tick in ticks:
+        pushed.push(*tick)
+    bulk = StreamingVolumeProfile(window=20)
+    bulk.extend(*(np.array(column) for column in zip(*ticks[:50])))
+    for tick in ticks[50:]:
+        bulk.push(*tick)
+
+    histogram = _brute_histogram(ticks)
+    window = ticks[-20:]
+    for profile in (pushed, bulk):
+        assert profile.price_levels() == dict(sorted(histogram.items()))
+        assert profile.vwap() == pytest.approx(sum(p * v for p, v in histogram.items()) / sum(histogram.values()))
+        assert profile.histogram[profile.poc] == max(histogram.values())
+        assert profile.avg_volume() == pytest.approx(np.mean([t[1] for t in window]))
+        assert [row['volume'] for row in profile.rows()] == [t[1] for t in window]
+    assert pushed.panel() == pytest.approx(bulk.panel())
+
+
+def test_max_age_expires_old_snapshots():
+    profile = StreamingVolumeProfile(window=10, max_age=5)
+    for i in range(8):
+        profile.push(100.0 + i, 1000 + i, 1000, 100, 100)
+    assert [row['timestamp'] for row in profile.rows()] == [102.0 + i for i in range(6)]
+    profile.push(200.0, 2000, 1000, 300, 100)
+    assert len(profile) == 1 and profile.avg_imbalance() == 0.5
+
+
+def test_analyzer_volume_profile_matches_history():
+    books = synthetic_books(8, 60, depth=10)
+    analyzer = OrderBookAnalyzer(books[:30])
+    for ob in books[30:]:
+        analyzer.append(ob)
+
+    for lookback in (20, 7):
+        window = books[-lookback:]
+        profile = analyzer.volume_profile(lookback)
+        assert profile['lookback_period'] == lookback
+        assert profile['avg_volume'] == pytest.approx(np.mean([ob.volume for ob in window]))
+        assert [row['volume'] for row in profile['data']] == [ob.volume for ob in window]
+        for row, ob in zip(profile['data'], window):
+            bid, ask = sum(o.lot for o in ob.bid), sum(o.lot for o in ob.ask)
+            assert row['imbalance'] == pytest.approx((bid - ask) / (bid + ask))